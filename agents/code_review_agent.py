@@ -64,19 +64,20 @@ class CodeReviewAgent:
     4. Provide comprehensive results
     """
 
-    def __init__(self, model_id: str = "gpt-4"):
+    def __init__(self, model_id: str = "gpt-4", llm=None):
         """
         Initialize the code review agent.
 
         Args:
             model_id: Default LLM model to use
+            llm: Optional pre-built chat model to use instead of creating one for model_id
         """
         self.model_id = model_id
         self.tools = AgentTools()
         self.model_registry = ModelRegistry()
 
         # Initialize the LLM
-        self.llm = self._create_llm(model_id)
+        self.llm = llm if llm is not None else self._create_llm(model_id)
 
         # Create the agent workflow
         self.workflow = self._create_workflow()
@@ -87,7 +88,7 @@ class CodeReviewAgent:
         """Create LLM instance based on model ID."""
         try:
             # Use the existing model registry
-            return self.model_registry.create_model(model_id)
+            return self.model_registry.get_or_create(model_id)
         except Exception as e:
             logger.warning(f"Failed to create model {model_id}, falling back to GPT-4: {str(e)}")
             return ChatOpenAI(
@@ -10,6 +10,7 @@ import asyncio
 import json
 import logging
 import os
+import threading
 from typing import Any, Dict, List, Optional
 
 from langchain.tools import Tool
@@ -24,13 +25,17 @@ logger = logging.getLogger(__name__)
 # Global instances for tool functions
 _rag_reviewer = None
 _traditional_reviewer = None
+# Tools may be invoked concurrently from executor threads (ainvoke); create each reviewer only once
+_reviewers_lock = threading.Lock()
 
 
 def get_rag_reviewer():
     """Get or create RAG reviewer instance."""
     global _rag_reviewer
     if _rag_reviewer is None:
-        _rag_reviewer = RAGCodeReviewer()
+        with _reviewers_lock:
+            if _rag_reviewer is None:
+                _rag_reviewer = RAGCodeReviewer()
     return _rag_reviewer
 
 
@@ -38,7 +43,9 @@ def get_traditional_reviewer():
     """Get or create traditional reviewer instance."""
     global _traditional_reviewer
     if _traditional_reviewer is None:
-        _traditional_reviewer = EnhancedCodeReviewer()
+        with _reviewers_lock:
+            if _traditional_reviewer is None:
+                _traditional_reviewer = EnhancedCodeReviewer()
     return _traditional_reviewer
 
 
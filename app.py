@@ -7,12 +7,14 @@ Provides REST API endpoints for code review functionality
 import asyncio
 import logging
 import os
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterator, List
 
 from dotenv import load_dotenv
 from flask import Flask, jsonify, request
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 from agents import CodeReviewAgent, CodeReviewRequest
@@ -20,6 +22,12 @@ from agents import CodeReviewAgent, CodeReviewRequest
 # Import from refactored modules
 from reviewers import EnhancedCodeReviewer, RAGCodeReviewer
 
+try:
+    # Optional faster JSON serializer for API responses
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
@@ -27,8 +35,34 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses with orjson.
+
+    Datetimes and dataclasses are passed through to Flask's default handler so responses keep
+    the same format; pretty-printed (debug) output and anything orjson rejects fall back to the
+    standard library.
+    """
+
+    _options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if not kwargs.get("indent"):
+            try:
+                option = self._options | (orjson.OPT_SORT_KEYS if kwargs.get("sort_keys", self.sort_keys) else 0)
+                return orjson.dumps(obj, default=self.default, option=option).decode()
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s: Any, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+
 # Create Flask app
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 CORS(app)  # Enable CORS for all routes
 
 # Initialize the code reviewers and agent
@@ -36,6 +70,18 @@ reviewer = EnhancedCodeReviewer()
 rag_reviewer = RAGCodeReviewer()
 code_agent = CodeReviewAgent()
 
+
+@contextmanager
+def _event_loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """A new event loop for one endpoint call, set as the thread's current loop and closed afterwards"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        yield loop
+    finally:
+        loop.close()
+
+
 # Configuration
 EXAMPLES_DIR = "examples"
 DEFAULT_TECHNIQUE = "zero_shot"
@@ -71,7 +117,7 @@ def format_review_result(result) -> Dict[str, Any]:
         "rating": result.rating,
         "model_used": result.model_used,
         "provider": result.provider,
-        "technique": result.technique,
+        "technique": result.technique_used,
         "execution_time": round(result.execution_time, 2),
         "timestamp": datetime.now().isoformat(),
         "issues": result.issues,
@@ -229,12 +275,8 @@ def review_file(filename: str):
             )
 
         # Run the review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(reviewer.review_code_async(code_content, language, technique, model_id))
-        finally:
-            loop.close()
 
         response_data = format_review_result(result)
         response_data.update(
@@ -314,12 +356,8 @@ def review_all_files():
                 code_content = read_file_content(filename)
 
                 # Run the review
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                try:
+                with _event_loop() as loop:
                     result = loop.run_until_complete(reviewer.review_code_async(code_content, language, technique, model_id))
-                finally:
-                    loop.close()
 
                 file_result = format_review_result(result)
                 file_result.update(
@@ -411,12 +449,8 @@ def review_custom_code():
             )
 
         # Run the review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(reviewer.review_code_async(code_content, language, technique, model_id))
-        finally:
-            loop.close()
 
         response_data = format_review_result(result)
         response_data.update(
@@ -465,14 +499,10 @@ def rag_review_file(filename: str):
         code_content = read_file_content(filename)
 
         # Run RAG review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(
                 rag_reviewer.review_code_with_rag(code_content, language, model_id, num_guidelines)
             )
-        finally:
-            loop.close()
 
         response_data = {
             "success": True,
@@ -517,14 +547,10 @@ def rag_review_custom():
         num_guidelines = data.get("guidelines", 3)
 
         # Run RAG review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(
                 rag_reviewer.review_code_with_rag(code_content, language, model_id, num_guidelines)
             )
-        finally:
-            loop.close()
 
         response_data = {
             "success": True,
@@ -566,12 +592,8 @@ def compare_rag_vs_traditional():
         language = data.get("language", DEFAULT_LANGUAGE)
 
         # Run comparison
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             comparison = loop.run_until_complete(rag_reviewer.compare_rag_vs_traditional(code_content, language, model_id))
-        finally:
-            loop.close()
 
         return jsonify(
             {
@@ -602,12 +624,8 @@ def search_guidelines():
         k = data.get("limit", 5)
 
         # Run search
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             results = loop.run_until_complete(rag_reviewer.search_guidelines(query, category, k))
-        finally:
-            loop.close()
 
         return jsonify(
             {
@@ -640,12 +658,8 @@ def get_knowledge_base_stats():
 def refresh_knowledge_base():
     """Refresh the knowledge base"""
     try:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
+        with _event_loop() as loop:
             success = loop.run_until_complete(rag_reviewer.refresh_knowledge_base())
-        finally:
-            loop.close()
 
         if success:
             return jsonify(
@@ -708,10 +722,7 @@ def agent_review_custom():
         )
 
         # Run async agent review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(code_agent.review_code(review_request))
 
             return jsonify(
@@ -726,8 +737,6 @@ def agent_review_custom():
                     },
                 }
             )
-        finally:
-            loop.close()
 
     except Exception as e:
         logger.error(f"Error in agent review: {e}")
@@ -775,10 +784,7 @@ def agent_review_file(filename: str):
         )
 
         # Run async agent review
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-
-        try:
+        with _event_loop() as loop:
             result = loop.run_until_complete(code_agent.review_code(review_request))
 
             return jsonify(
@@ -793,8 +799,6 @@ def agent_review_file(filename: str):
                     },
                 }
             )
-        finally:
-            loop.close()
 
     except FileNotFoundError as e:
         return jsonify({"success": False, "error": str(e)}), 404
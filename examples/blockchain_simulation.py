@@ -15,7 +15,7 @@ import uuid
 from collections import defaultdict
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 # ISSUE: Weak cryptographic configuration
 HASH_ALGORITHM = "sha256"  # ISSUE: Algorithm should be configurable
@@ -77,14 +77,33 @@ class Block:
         block_string = f"{self.index}{self.timestamp}{self.merkle_root}{self.previous_hash}{self.nonce}"
         return hashlib.sha256(block_string.encode()).hexdigest()
 
+    def _compile_hash_closure(self) -> Callable[[int], bytes]:
+        """Specialize calculate_hash for a sealed block - only the nonce varies"""
+        self.merkle_root = self.calculate_merkle_root()
+        # SHA-256 state over the constant header prefix, copied for every attempt
+        midstate = hashlib.sha256(f"{self.index}{self.timestamp}{self.merkle_root}{self.previous_hash}".encode())
+
+        def step(nonce: int) -> bytes:
+            attempt = midstate.copy()
+            attempt.update(str(nonce).encode())
+            return attempt.digest()
+
+        return step
+
     def mine_block(self, difficulty: int):
         """Mine block with proof of work - ISSUE: CPU-intensive on main thread"""
-        target = "0" * difficulty
+        # "difficulty" leading zero hex digits == top 4*difficulty bits clear,
+        # so a single integer compare replaces the per-nonce string prefix test
+        limit = 1 << (256 - 4 * difficulty)
+        step = self._compile_hash_closure()
 
         # ISSUE: No mining progress indicators
-        while not self.hash or not self.hash.startswith(target):
+        while True:
             self.nonce += 1
-            self.hash = self.calculate_hash()
+            digest = step(self.nonce)
+            if int.from_bytes(digest, "big") < limit:
+                self.hash = digest.hex()
+                break
 
             # ISSUE: No upper limit on mining attempts
             if self.nonce % 1000000 == 0:
@@ -114,8 +133,17 @@ class Wallet:
         signature_hash = hashlib.sha256((message + self.private_key).encode()).hexdigest()
         return signature_hash
 
-    def create_transaction(self, receiver: str, amount: float, fee: float = 0.1) -> Optional[Transaction]:
-        """Create new transaction"""
+    def sign_transactions(self, transactions: List[Transaction]) -> List[str]:
+        """Sign a batch of transactions in one pass - same scheme as sign_transaction"""
+        sha256 = hashlib.sha256
+        private_key = self.private_key
+        signatures = [sha256(f"{tx.sender}{tx.receiver}{tx.amount}{private_key}".encode()).hexdigest() for tx in transactions]
+        for transaction, signature in zip(transactions, signatures):
+            transaction.signature = signature
+        return signatures
+
+    def create_transaction(self, receiver: str, amount: float, fee: float = 0.1, sign: bool = True) -> Optional[Transaction]:
+        """Create new transaction - pass sign=False to defer signing to sign_transactions"""
 
         # ISSUE: No input validation
         if amount + fee > self.balance:
@@ -125,7 +153,8 @@ class Wallet:
         transaction = Transaction(sender=self.address, receiver=receiver, amount=amount, fee=fee)
 
         # ISSUE: Signature not properly validated
-        transaction.signature = self.sign_transaction(transaction)
+        if sign:
+            transaction.signature = self.sign_transaction(transaction)
         return transaction
 
 
@@ -467,7 +496,7 @@ class BlockchainSimulation:
 
         print(f"Network setup complete: {len(self.nodes)} nodes, {len(self.wallets)} wallets")
 
-    def generate_random_transaction(self) -> Optional[Transaction]:
+    def generate_random_transaction(self, sign: bool = True) -> Optional[Transaction]:
         """Generate random transaction for simulation"""
 
         if len(self.wallets) < 2:
@@ -485,7 +514,7 @@ class BlockchainSimulation:
         amount = random.uniform(0.1, max_amount)
         fee = amount * 0.01  # 1% fee
 
-        return sender_wallet.create_transaction(receiver_wallet.address, amount, fee)
+        return sender_wallet.create_transaction(receiver_wallet.address, amount, fee, sign=sign)
 
     def simulation_loop(self):
         """Main simulation loop - ISSUE: Blocking implementation"""
@@ -495,12 +524,22 @@ class BlockchainSimulation:
 
         while self.running and (time.time() - start_time) < self.config["simulation_duration"]:
             try:
-                # Generate random transactions
+                # Generate random transactions, then sign them per wallet in one batch
+                batch = []
                 for _ in range(self.config["transaction_frequency"]):
-                    transaction = self.generate_random_transaction()
+                    transaction = self.generate_random_transaction(sign=False)
                     if transaction:
-                        # ISSUE: Add to first node only
-                        self.nodes[0].broadcast_transaction(transaction)
+                        batch.append(transaction)
+
+                by_sender = defaultdict(list)
+                for transaction in batch:
+                    by_sender[transaction.sender].append(transaction)
+                for sender, transactions in by_sender.items():
+                    self.blockchain.wallets[sender].sign_transactions(transactions)
+
+                for transaction in batch:
+                    # ISSUE: Add to first node only
+                    self.nodes[0].broadcast_transaction(transaction)
 
                 # Mine blocks periodically
                 if random.random() < 0.1:  # 10% chance per iteration
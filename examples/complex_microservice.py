@@ -7,22 +7,37 @@ for comprehensive code review testing.
 import asyncio
 import json
 import logging
+import os
+import queue
 import sqlite3
 import threading
 import time
+import uuid
 from abc import ABC, abstractmethod
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import aiohttp
 import redis
-import requests
+
+try:
+    import orjson
+
+    _cache_dumps = orjson.dumps
+    _cache_loads = orjson.loads
+except ImportError:
+    _cache_dumps = json.dumps
+    _cache_loads = json.loads
 
 # ISSUE: Missing proper configuration management
 REDIS_URL = "redis://localhost:6379/0"
 DATABASE_URL = "sqlite:///app.db"
 API_TIMEOUT = 30
+ORDER_QUEUE_KEY = "order:queue:pending"
 MAX_RETRIES = 3
 
 
@@ -35,6 +50,9 @@ class OrderStatus(Enum):
 
 @dataclass
 class Order:
+    # No per-instance __dict__; field order matches the dataclass fields below
+    __slots__ = ("id", "customer_id", "items", "total_amount", "status", "created_at")
+
     id: str
     customer_id: str
     items: List[Dict[str, Any]]
@@ -64,43 +82,87 @@ class PaymentGateway(ABC):
 class StripePaymentGateway(PaymentGateway):
     def __init__(self, api_key: str):
         self.api_key = api_key
-        # ISSUE: No connection pooling for HTTP requests
+        # Shared keep-alive session, created lazily inside the running event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60),
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=aiohttp.ClientTimeout(total=API_TIMEOUT),
+            )
+        return self._session
 
     async def process_payment(self, amount: float, card_token: str) -> bool:
         try:
-            # ISSUE: Synchronous HTTP call in async function
-            response = requests.post(
+            session = await self._ensure_session()
+            async with session.post(
                 "https://api.stripe.com/v1/charges",
-                headers={"Authorization": f"Bearer {self.api_key}"},
                 data={
                     "amount": int(amount * 100),  # Convert to cents
                     "currency": "usd",
                     "source": card_token,
                 },
-                timeout=API_TIMEOUT,
-            )
-            return response.status_code == 200
+            ) as response:
+                return response.status == 200
         except Exception as e:
             # ISSUE: Generic exception handling
             logging.error(f"Payment processing failed: {e}")
             return False
 
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
 
 class DatabaseManager:
-    def __init__(self, db_url: str):
-        self.db_url = db_url
-        # ISSUE: No connection pooling
-        self._connection = None
+    """SQLite access with one shared writer connection and a pool of read-only readers"""
 
-    def connect(self):
-        # ISSUE: Potential race condition with threading
-        if self._connection is None:
-            self._connection = sqlite3.connect(self.db_url, check_same_thread=False)
-        return self._connection
+    def __init__(self, db_url: str, pool_size: int = 4):
+        self.db_url = db_url
+        self.db_path = db_url.removeprefix("sqlite:///")
+        self.pool_size = pool_size
+        self._rw_conn: Optional[sqlite3.Connection] = None
+        # LIFO so the most recently used (cache-warm) reader is handed out first
+        self._read_pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._writer_lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+
+    def connect(self) -> sqlite3.Connection:
+        """Open the writer (and reader pool) once; returns the writer connection"""
+        with self._connect_lock:
+            if self._rw_conn is None:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                self._rw_conn = conn
+
+                # Readers need the file to exist, so they are opened after the writer
+                for _ in range(self.pool_size):
+                    self._read_pool.put(sqlite3.connect(f"file:{self.db_path}?mode=ro", uri=True, check_same_thread=False))
+        return self._rw_conn
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool"""
+        self.connect()
+        conn = self._read_pool.get()
+        try:
+            yield conn
+        finally:
+            self._read_pool.put(conn)
+
+    def close_all(self):
+        with self._connect_lock:
+            while not self._read_pool.empty():
+                self._read_pool.get_nowait().close()
+            if self._rw_conn is not None:
+                self._rw_conn.close()
+                self._rw_conn = None
 
     def save_order(self, order: Order):
         conn = self.connect()
-        cursor = conn.cursor()
 
         # ISSUE: SQL injection potential if order data is not sanitized
         sql = """
@@ -109,29 +171,27 @@ class DatabaseManager:
         """
 
         try:
-            cursor.execute(
-                sql,
-                (
-                    order.id,
-                    order.customer_id,
-                    json.dumps(order.items),  # ISSUE: No validation of JSON serialization
-                    order.total_amount,
-                    order.status.value,
-                    order.created_at,
-                ),
-            )
-            conn.commit()
+            # Writer runs in autocommit mode; the lock serializes writes across threads
+            with self._writer_lock:
+                conn.execute(
+                    sql,
+                    (
+                        order.id,
+                        order.customer_id,
+                        json.dumps(order.items),  # ISSUE: No validation of JSON serialization
+                        order.total_amount,
+                        order.status.value,
+                        order.created_at,
+                    ),
+                )
         except Exception as e:
             # ISSUE: No proper transaction rollback
             logging.error(f"Failed to save order: {e}")
             raise
 
     def get_order(self, order_id: str) -> Optional[Order]:
-        conn = self.connect()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT * FROM orders WHERE id = ?", (order_id,))
-        row = cursor.fetchone()
+        with self.reader() as conn:
+            row = conn.execute("SELECT * FROM orders WHERE id = ?", (order_id,)).fetchone()
 
         if row:
             return Order(
@@ -153,20 +213,74 @@ class CacheManager:
     def set_cache(self, key: str, value: Any, ttl: int = 3600):
         try:
             # ISSUE: No serialization error handling
-            self.redis_client.setex(key, ttl, json.dumps(value))
+            self.redis_client.setex(key, ttl, _cache_dumps(value))
         except Exception as e:
             # ISSUE: Cache failures should not break the application
             logging.error(f"Cache set failed: {e}")
 
+    def mset_cache(self, pairs: Dict[str, Any], ttl: int = 3600):
+        """Set several keys in one round-trip"""
+        try:
+            pipe = self.redis_client.pipeline(transaction=False)
+            for key, value in pairs.items():
+                pipe.setex(key, ttl, _cache_dumps(value))
+            pipe.execute()
+        except Exception as e:
+            logging.error(f"Cache mset failed: {e}")
+
+    # Compare-and-delete so a caller never releases a lock that expired and was re-acquired
+    _RELEASE_LOCK_SCRIPT = """
+    if redis.call("get", KEYS[1]) == ARGV[1] then
+        return redis.call("del", KEYS[1])
+    end
+    return 0
+    """
+
+    def acquire_lock(self, key: str, token: str, ttl_ms: int = 30000) -> bool:
+        try:
+            return bool(self.redis_client.set(f"lock:{key}", token, nx=True, px=ttl_ms))
+        except Exception as e:
+            logging.error(f"Cache lock acquire failed: {e}")
+            return False
+
+    def release_lock(self, key: str, token: str):
+        try:
+            self.redis_client.eval(self._RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+        except Exception as e:
+            logging.error(f"Cache lock release failed: {e}")
+
     def get_cache(self, key: str) -> Optional[Any]:
         try:
             value = self.redis_client.get(key)
             if value:
-                return json.loads(value.decode("utf-8"))
+                return _cache_loads(value)
         except Exception as e:
             logging.error(f"Cache get failed: {e}")
         return None
 
+    def mget_cache(self, keys: List[str]) -> Dict[str, Any]:
+        """Get several keys in one round-trip; missing keys are omitted"""
+        try:
+            values = self.redis_client.mget(keys)
+            return {key: _cache_loads(value) for key, value in zip(keys, values) if value}
+        except Exception as e:
+            logging.error(f"Cache mget failed: {e}")
+        return {}
+
+    def push_queue(self, queue_key: str, payload: Dict[str, Any]):
+        try:
+            self.redis_client.rpush(queue_key, _cache_dumps(payload))
+        except Exception as e:
+            logging.error(f"Queue push failed: {e}")
+
+    def pop_queue(self, queue_key: str, timeout: int = 5) -> Optional[Dict[str, Any]]:
+        """Block until a payload arrives or timeout seconds pass (then None)"""
+        item = self.redis_client.blpop(queue_key, timeout=timeout)
+        if item is None:
+            return None
+        _, value = item
+        return _cache_loads(value)
+
 
 class OrderService:
     def __init__(
@@ -196,12 +310,14 @@ class OrderService:
         )
 
         try:
+            # Blocking DB/cache I/O runs on the default executor so the event loop stays free
             # ISSUE: No distributed locking for concurrent operations
-            self.db_manager.save_order(order)
+            await asyncio.to_thread(self.db_manager.save_order, order)
+            await asyncio.to_thread(self.cache_manager.push_queue, ORDER_QUEUE_KEY, {"order_id": order.id})
 
             # Process payment
             order.status = OrderStatus.PROCESSING
-            self.db_manager.save_order(order)
+            await asyncio.to_thread(self.db_manager.save_order, order)
 
             # ISSUE: No idempotency handling
             payment_success = await self.payment_gateway.process_payment(total_amount, card_token)
@@ -209,11 +325,11 @@ class OrderService:
             if payment_success:
                 order.status = OrderStatus.COMPLETED
                 # ISSUE: Cache invalidation strategy missing
-                self.cache_manager.set_cache(f"order:{order.id}", order.to_dict())
+                await asyncio.to_thread(self.cache_manager.set_cache, f"order:{order.id}", order.to_dict())
             else:
                 order.status = OrderStatus.FAILED
 
-            self.db_manager.save_order(order)
+            await asyncio.to_thread(self.db_manager.save_order, order)
             return order
 
         except Exception as e:
@@ -221,24 +337,47 @@ class OrderService:
             logging.error(f"Order creation failed: {e}")
             order.status = OrderStatus.FAILED
             try:
-                self.db_manager.save_order(order)
+                await asyncio.to_thread(self.db_manager.save_order, order)
             except Exception:
                 pass  # ISSUE: Silent failure
             return None
 
     def get_order_with_cache(self, order_id: str) -> Optional[Order]:
+        cache_key = f"order:{order_id}"
+
         # Try cache first
-        cached_order = self.cache_manager.get_cache(f"order:{order_id}")
+        cached_order = self.cache_manager.get_cache(cache_key)
         if cached_order:
             return Order(**cached_order)
 
+        # Single-flight: only the lock holder reads the database and refills the cache
+        token = uuid.uuid4().hex
+        if self.cache_manager.acquire_lock(cache_key, token):
+            try:
+                cached_order = self.cache_manager.get_cache(cache_key)
+                if cached_order:
+                    return Order(**cached_order)
+
+                order = self.db_manager.get_order(order_id)
+                if order:
+                    self.cache_manager.set_cache(cache_key, order.to_dict())
+                return order
+            finally:
+                self.cache_manager.release_lock(cache_key, token)
+
+        # Another caller is filling the cache - wait briefly for it
+        for _ in range(20):
+            time.sleep(0.05)
+            cached_order = self.cache_manager.get_cache(cache_key)
+            if cached_order:
+                return Order(**cached_order)
+
         # Fallback to database
-        order = self.db_manager.get_order(order_id)
-        if order:
-            # ISSUE: Cache stampede potential
-            self.cache_manager.set_cache(f"order:{order.id}", order.to_dict())
+        return self.db_manager.get_order(order_id)
 
-        return order
+    async def aget_order_with_cache(self, order_id: str) -> Optional[Order]:
+        """Async variant of get_order_with_cache - the whole lookup runs in one executor hop"""
+        return await asyncio.to_thread(self.get_order_with_cache, order_id)
 
 
 class OrderProcessorWorker:
@@ -247,46 +386,68 @@ class OrderProcessorWorker:
     def __init__(self, order_service: OrderService):
         self.order_service = order_service
         self.running = False
-        self.thread_pool = ThreadPoolExecutor(max_workers=5)  # ISSUE: Fixed thread count
+        # Order work is I/O-bound (payments, DB, Redis), so size well above the core count
+        max_workers = int(os.getenv("ORDER_WORKER_THREADS", str(min(64, (os.cpu_count() or 1) * 4))))
+        self.thread_pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="order-worker")
+
+        self._shutdown_event = threading.Event()
 
     def start(self):
         self.running = True
+        self._shutdown_event.clear()
         # ISSUE: No graceful shutdown mechanism
         threading.Thread(target=self._process_orders, daemon=True).start()
 
     def stop(self):
         self.running = False
+        # The consumer loop exits once its current BLPOP returns
+        self._shutdown_event.set()
         # ISSUE: No proper thread cleanup
 
     def _process_orders(self):
-        while self.running:
+        cache_manager = self.order_service.cache_manager
+        while not self._shutdown_event.is_set():
             try:
-                # ISSUE: Polling instead of event-driven processing
-                # In a real system, this would listen to a message queue
-                time.sleep(1)
-
-                # ISSUE: No proper work distribution among threads
-                # This is just a placeholder for demonstration
+                # Blocks on the Redis list instead of polling; wakes as soon as an order is queued
+                payload = cache_manager.pop_queue(ORDER_QUEUE_KEY, timeout=5)
+                if payload is not None:
+                    self.thread_pool.submit(self._handle_order, payload)
 
             except Exception as e:
                 # ISSUE: Worker threads can die silently
                 logging.error(f"Order processing error: {e}")
                 time.sleep(5)  # ISSUE: Fixed retry delay
 
+    def _handle_order(self, payload: Dict[str, Any]):
+        # This is just a placeholder for demonstration
+        # Read the database directly: caching this in-flight snapshot would outlive the order's final status
+        order = self.order_service.db_manager.get_order(payload["order_id"])
+        if order:
+            logging.info(f"Processing order {order.id} ({order.status})")
+
 
 # ISSUE: Global state management
-global_metrics = {
-    "orders_processed": 0,
-    "payments_failed": 0,
-    "cache_hits": 0,
-    "cache_misses": 0,
-}
+global_metrics = Counter(
+    {
+        "orders_processed": 0,
+        "payments_failed": 0,
+        "cache_hits": 0,
+        "cache_misses": 0,
+    }
+)
+_metrics_lock = threading.Lock()
 
 
 def update_metrics(metric_name: str, increment: int = 1):
-    # ISSUE: Not thread-safe
-    global global_metrics  # noqa: F824
-    global_metrics[metric_name] += increment
+    # The read-modify-write is not atomic under threads, so hold the lock for the single +=
+    with _metrics_lock:
+        global_metrics[metric_name] += increment
+
+
+def snapshot_metrics() -> Dict[str, int]:
+    """Consistent copy of all counters taken under the metrics lock"""
+    with _metrics_lock:
+        return dict(global_metrics)
 
 
 class MetricsCollector:
@@ -298,20 +459,21 @@ class MetricsCollector:
 
     def get_metrics(self) -> Dict[str, Any]:
         uptime = time.time() - self.start_time
+        metrics = snapshot_metrics()
 
         return {
             "uptime_seconds": uptime,
-            "orders_processed": global_metrics["orders_processed"],
-            "payments_failed": global_metrics["payments_failed"],
-            "cache_hit_ratio": self._calculate_cache_hit_ratio(),
+            "orders_processed": metrics["orders_processed"],
+            "payments_failed": metrics["payments_failed"],
+            "cache_hit_ratio": self._calculate_cache_hit_ratio(metrics),
             "memory_usage": self._get_memory_usage(),  # ISSUE: May not work on all systems
         }
 
-    def _calculate_cache_hit_ratio(self) -> float:
-        total_requests = global_metrics["cache_hits"] + global_metrics["cache_misses"]
+    def _calculate_cache_hit_ratio(self, metrics: Dict[str, int]) -> float:
+        total_requests = metrics["cache_hits"] + metrics["cache_misses"]
         if total_requests == 0:
             return 0.0
-        return global_metrics["cache_hits"] / total_requests
+        return metrics["cache_hits"] / total_requests
 
     def _get_memory_usage(self) -> Dict[str, Any]:
         # ISSUE: Platform-specific code without error handling
@@ -359,11 +521,18 @@ if __name__ == "__main__":
             print("Order creation failed")
             update_metrics("payments_failed")
 
+    async def run_example():
+        try:
+            await test_order_creation()
+        finally:
+            await payment_gateway.close()
+
     # ISSUE: Mixing sync and async code without proper handling
-    asyncio.run(test_order_creation())
+    asyncio.run(run_example())
 
     # Display metrics
     print("Current metrics:", metrics_collector.get_metrics())
 
     # ISSUE: No cleanup on exit
     worker.stop()
+    db_manager.close_all()
@@ -15,16 +15,28 @@ from typing import Any, Dict, List, Optional, Tuple
 import joblib
 import numpy as np
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+from sklearn.ensemble import HistGradientBoostingClassifier, RandomForestClassifier
 from sklearn.metrics import classification_report, confusion_matrix
 from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from sklearn.preprocessing import StandardScaler
+
+try:
+    import lz4  # noqa: F401
+
+    # LZ4 keeps tree ensembles several times smaller while decompressing near memcpy speed
+    MODEL_COMPRESSION = ("lz4", 3)
+except ImportError:
+    MODEL_COMPRESSION = ("zlib", 3)
 
 # ISSUE: Hardcoded configuration values
 MODEL_VERSION = "1.0.0"
 DATA_PATH = "/tmp/ml_data"
 MODEL_PATH = "/tmp/ml_models"
 RANDOM_SEED = 42  # ISSUE: Fixed seed may not be appropriate for all scenarios
+AGE_BINS = [0, 18, 35, 50, 65, 100]
+AGE_LABELS = ["young", "adult", "middle_age", "senior", "elderly"]
 
 
 @dataclass
@@ -41,8 +53,10 @@ class ModelMetadata:
 class DataLoader:
     """Data loading and basic preprocessing"""
 
-    def __init__(self, data_source: str):
+    def __init__(self, data_source: str, dtype: Optional[Dict[str, Any]] = None):
         self.data_source = data_source
+        # Known column types, e.g. {"plan_type": "category"}, applied at parse time
+        self.dtype = dtype
         # ISSUE: No validation of data source
 
     def load_data(self) -> pd.DataFrame:
@@ -50,7 +64,13 @@ class DataLoader:
         try:
             if self.data_source.endswith(".csv"):
                 # ISSUE: No encoding specification
-                df = pd.read_csv(self.data_source)
+                # The multi-threaded Arrow parser is much faster than the default C engine
+                df = pd.read_csv(self.data_source, engine="pyarrow", dtype=self.dtype)
+            elif self.data_source.endswith(".jsonl"):
+                df = pd.read_json(self.data_source, lines=True, engine="pyarrow")
+                # The pyarrow JSON engine ignores dtype, so the known column types are applied afterwards
+                if self.dtype:
+                    df = df.astype(self.dtype)
             elif self.data_source.endswith(".json"):
                 # ISSUE: No handling of large JSON files
                 df = pd.read_json(self.data_source)
@@ -70,14 +90,14 @@ class DataLoader:
         """Basic data cleaning operations"""
 
         # ISSUE: Hardcoded cleaning strategies
-        # Remove rows with any missing values
-        df_clean = df.dropna()
+        # Keep rows with no missing values that are the first occurrence of their contents,
+        # building one mask and materializing the result once instead of dropna().drop_duplicates()
+        # ISSUE: Remove duplicates without considering business logic
+        keep = df.notna().all(axis=1).to_numpy() & ~df.duplicated().to_numpy()
+        df_clean = df[keep]
 
-        # ISSUE: No logging of data loss
         rows_removed = len(df) - len(df_clean)
-
-        # ISSUE: Remove duplicates without considering business logic
-        df_clean = df_clean.drop_duplicates()
+        logging.info(f"Cleaning removed {rows_removed} rows with missing values or duplicates")
 
         # ISSUE: No outlier detection or handling
         return df_clean
@@ -94,64 +114,79 @@ class FeatureEngineer:
     def create_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Create new features from existing data"""
 
-        df_features = df.copy()
+        # Only new columns are added, so a shallow copy is enough to leave the input untouched
+        df_features = df.copy(deep=False)
 
         # ISSUE: Hardcoded feature engineering rules
         if "age" in df.columns:
-            # Create age groups
-            df_features["age_group"] = pd.cut(
-                df["age"],
-                bins=[0, 18, 35, 50, 65, 100],
-                labels=["young", "adult", "middle_age", "senior", "elderly"],
-            )
+            # Create age groups - same (0, 18], (18, 35], ... intervals as pd.cut, out-of-range ages map to NaN
+            bin_index = np.digitize(df["age"].to_numpy(dtype=np.float64), AGE_BINS, right=True)
+            codes = np.where((bin_index >= 1) & (bin_index < len(AGE_BINS)), bin_index - 1, -1)
+            df_features["age_group"] = pd.Categorical.from_codes(codes, categories=AGE_LABELS, ordered=True)
 
         if "income" in df.columns and "expenses" in df.columns:
-            # ISSUE: No handling of division by zero
-            df_features["savings_rate"] = (df["income"] - df["expenses"]) / df["income"]
+            # Zero income yields a savings rate of 0 instead of inf/NaN
+            income = df["income"].to_numpy(dtype=np.float64)
+            savings_rate = np.zeros_like(income)
+            np.divide(income - df["expenses"].to_numpy(dtype=np.float64), income, out=savings_rate, where=income != 0)
+            df_features["savings_rate"] = savings_rate
 
         # ISSUE: No feature validation or sanity checks
         return df_features
 
-    def encode_categorical_features(self, df: pd.DataFrame, fit: bool = True) -> pd.DataFrame:
-        """Encode categorical features"""
+    def encode_categorical_features(self, df: pd.DataFrame, fit: bool = True, copy: bool = True) -> pd.DataFrame:
+        """Encode categorical features - copy=False writes the encoded columns into df itself"""
 
-        df_encoded = df.copy()
-        categorical_columns = df.select_dtypes(include=["object"]).columns
+        # Encoded columns are replaced wholesale, never written into, so a shallow copy is safe
+        df_encoded = df.copy(deep=False) if copy else df
+        categorical_columns = df.select_dtypes(include=["object", "string", "category"]).columns
 
         for column in categorical_columns:
             if fit:
-                # ISSUE: No handling of unseen categories during inference
-                encoder = LabelEncoder()
-                df_encoded[column] = encoder.fit_transform(df[column])
-                self.encoders[column] = encoder
+                # Sorted categories give the same codes LabelEncoder would
+                categories = pd.Index(df[column].dropna().unique()).sort_values()
+                df_encoded[column] = pd.Categorical(df[column], categories=categories).codes
+                self.encoders[column] = categories
             else:
                 if column in self.encoders:
-                    try:
-                        df_encoded[column] = self.encoders[column].transform(df[column])
-                    except ValueError as e:
-                        # ISSUE: Poor handling of unseen categories
-                        logging.warning(f"Unseen category in {column}: {e}")
-                        df_encoded[column] = 0  # Default to 0
+                    codes = pd.Categorical(df[column], categories=self.encoders[column]).codes
+                    # Unseen categories come back as -1
+                    if (codes == -1).any():
+                        logging.warning(f"Unseen category in {column}, defaulting to 0")
+                    df_encoded[column] = np.where(codes == -1, 0, codes)
 
         return df_encoded
 
-    def scale_features(self, df: pd.DataFrame, target_column: str, fit: bool = True) -> pd.DataFrame:
-        """Scale numerical features"""
+    def scale_features(self, df: pd.DataFrame, target_column: str, fit: bool = True, copy: bool = True) -> pd.DataFrame:
+        """Scale numerical features - copy=False writes the scaled columns into df itself"""
+
+        df_scaled = df.copy(deep=False) if copy else df
 
-        df_scaled = df.copy()
-        numerical_columns = df.select_dtypes(include=[np.number]).columns
-        feature_columns = [col for col in numerical_columns if col != target_column]
+        if fit:
+            # Column selection is fixed at fit time so inference never re-inspects dtypes
+            numerical_columns = df.select_dtypes(include=[np.number]).columns
+            self.feature_names = [col for col in numerical_columns if col != target_column]
+        feature_columns = self.feature_names
 
         if fit:
             scaler = StandardScaler()
-            df_scaled[feature_columns] = scaler.fit_transform(df[feature_columns])
+            # Tree traversal is memory-bound on the features; float32 halves the bytes moved
+            df_scaled[feature_columns] = scaler.fit_transform(df[feature_columns]).astype(np.float32, copy=False)
             self.scalers["standard"] = scaler
         else:
             if "standard" in self.scalers:
-                df_scaled[feature_columns] = self.scalers["standard"].transform(df[feature_columns])
+                df_scaled[feature_columns] = (
+                    self.scalers["standard"].transform(df[feature_columns]).astype(np.float32, copy=False)
+                )
 
         return df_scaled
 
+    def transform(self, df: pd.DataFrame, target_column: str, copy: bool = True) -> pd.DataFrame:
+        """Apply the fitted encoding and scaling in one pass over a single (optional) copy"""
+
+        df_out = self.encode_categorical_features(df, fit=False, copy=copy)
+        return self.scale_features(df_out, target_column, fit=False, copy=False)
+
 
 class ModelTrainer:
     """Model training and evaluation"""
@@ -179,6 +214,15 @@ class ModelTrainer:
                 # ISSUE: No hyperparameter tuning
                 max_depth=10,
                 min_samples_split=5,
+                n_jobs=-1,  # Build (and predict with) trees on all cores
+            )
+        elif self.model_type == "hist_gbt":
+            # Histogram-based boosting - much faster than a random forest on larger tabular data
+            self.model = HistGradientBoostingClassifier(
+                max_iter=200,
+                learning_rate=0.1,
+                max_depth=8,
+                random_state=RANDOM_SEED,
             )
         else:
             raise ValueError(f"Unsupported model type: {self.model_type}")
@@ -191,9 +235,11 @@ class ModelTrainer:
         val_score = self.model.score(X_val, y_val)
 
         # ISSUE: Limited evaluation metrics
+        # HistGradientBoostingClassifier has no impurity-based feature importances
+        feature_importances = getattr(self.model, "feature_importances_", [])
         results = {
             "validation_accuracy": val_score,
-            "feature_importance": dict(zip(X_train.columns, self.model.feature_importances_)),
+            "feature_importance": dict(zip(X_train.columns, feature_importances)),
             "classification_report": classification_report(y_val, val_predictions, output_dict=True),
         }
 
@@ -206,10 +252,9 @@ class ModelTrainer:
         os.makedirs(model_path, exist_ok=True)
 
         # Save model
-        model_file = os.path.join(model_path, "model.pkl")
+        model_file = os.path.join(model_path, "model.joblib")
         # ISSUE: Using pickle for model serialization (security risk)
-        with open(model_file, "wb") as f:
-            pickle.dump(self.model, f)
+        joblib.dump(self.model, model_file, compress=MODEL_COMPRESSION, protocol=5)
 
         # Save metadata
         metadata_file = os.path.join(model_path, "metadata.json")
@@ -233,13 +278,17 @@ class ModelPredictor:
     def load_model(self):
         """Load model and metadata"""
 
-        model_file = os.path.join(self.model_path, "model.pkl")
+        model_file = os.path.join(self.model_path, "model.joblib")
         metadata_file = os.path.join(self.model_path, "metadata.json")
 
         # ISSUE: No error handling for missing files
-        with open(model_file, "rb") as f:
-            # ISSUE: Security risk - loading pickle files
-            self.model = pickle.load(f)
+        # ISSUE: Security risk - loading pickle files
+        if os.path.exists(model_file):
+            self.model = joblib.load(model_file)
+        else:
+            # Models saved before the switch to joblib are plain pickles in model.pkl
+            with open(os.path.join(self.model_path, "model.pkl"), "rb") as f:
+                self.model = pickle.load(f)
 
         with open(metadata_file, "r") as f:
             metadata_dict = json.load(f)
@@ -247,9 +296,10 @@ class ModelPredictor:
 
         # ISSUE: FeatureEngineer not properly reloaded
         self.feature_engineer = FeatureEngineer()
+        self.feature_engineer.feature_names = list(self.metadata.feature_columns)
 
-    def predict(self, input_data: pd.DataFrame) -> Dict[str, Any]:
-        """Make predictions on new data"""
+    def predict(self, input_data: pd.DataFrame, copy: bool = True) -> Dict[str, Any]:
+        """Make predictions on new data - copy=False lets preprocessing modify input_data in place"""
 
         if self.model is None:
             self.load_model()
@@ -257,12 +307,14 @@ class ModelPredictor:
         try:
             # ISSUE: No input validation
             # ISSUE: Feature engineering pipeline not properly applied
-            processed_data = self.feature_engineer.encode_categorical_features(input_data, fit=False)
-            processed_data = self.feature_engineer.scale_features(processed_data, self.metadata.target_column, fit=False)
+            processed_data = self.feature_engineer.transform(input_data, self.metadata.target_column, copy=copy)
 
             # ISSUE: No handling of missing features
-            predictions = self.model.predict(processed_data[self.metadata.feature_columns])
-            probabilities = self.model.predict_proba(processed_data[self.metadata.feature_columns])
+            # sklearn trees predict on float32, so convert once up front instead of inside each call
+            X = processed_data[self.metadata.feature_columns].astype(np.float32, copy=False)
+            # One traversal: predict() is just the argmax over predict_proba()
+            probabilities = self.model.predict_proba(X)
+            predictions = self.model.classes_[probabilities.argmax(axis=1)]
 
             return {
                 "predictions": predictions.tolist(),
@@ -293,7 +345,7 @@ class MLPipeline:
         logging.info("Starting ML training pipeline...")
 
         # Load data
-        self.data_loader = DataLoader(data_source)
+        self.data_loader = DataLoader(data_source, self.config.get("column_dtypes"))
         df = self.data_loader.load_data()
         df_clean = self.data_loader.basic_cleaning(df)
 
@@ -347,7 +399,7 @@ class MLPipeline:
         logging.info("Starting batch prediction pipeline...")
 
         # Load data
-        data_loader = DataLoader(data_source)
+        data_loader = DataLoader(data_source, self.config.get("column_dtypes"))
         df = data_loader.load_data()
 
         # Load model and predict
@@ -361,8 +413,12 @@ class MLPipeline:
         output_df["predictions"] = results["predictions"]
         output_df["prediction_timestamp"] = results["prediction_timestamp"]
 
-        # ISSUE: Hardcoded output format
-        output_df.to_csv(output_path, index=False)
+        # Arrow's multi-threaded C++ writers instead of pandas' Python-level CSV writer;
+        # anything other than .csv is written as Parquet for cheaper re-ingestion
+        if output_path.endswith(".csv"):
+            pa_csv.write_csv(pa.Table.from_pandas(output_df, preserve_index=False), output_path)
+        else:
+            output_df.to_parquet(output_path, engine="pyarrow", compression="zstd", index=False)
         logging.info(f"Predictions saved to {output_path}")
 
 
@@ -370,6 +426,7 @@ class MLPipeline:
 PIPELINE_CONFIG = {
     "model_name": "customer_churn_model",
     "model_type": "random_forest",
+    "column_dtypes": {"plan_type": "category"},
     "data_validation": False,  # ISSUE: Data validation disabled
     "feature_selection": False,  # ISSUE: No automatic feature selection
     "hyperparameter_tuning": False,  # ISSUE: No hyperparameter optimization
@@ -379,17 +436,18 @@ PIPELINE_CONFIG = {
 def create_sample_data():
     """Create sample data for testing"""
     # ISSUE: Hardcoded sample data generation
-    np.random.seed(RANDOM_SEED)
+    # Local PCG64 generator - faster than the legacy global RNG and no shared global state
+    rng = np.random.default_rng(RANDOM_SEED)
 
     n_samples = 1000
     data = {
-        "age": np.random.randint(18, 80, n_samples),
-        "income": np.random.normal(50000, 20000, n_samples),
-        "expenses": np.random.normal(30000, 15000, n_samples),
-        "account_length": np.random.randint(1, 120, n_samples),
-        "customer_service_calls": np.random.poisson(2, n_samples),
-        "plan_type": np.random.choice(["basic", "premium", "enterprise"], n_samples),
-        "churn": np.random.choice([0, 1], n_samples, p=[0.7, 0.3]),
+        "age": rng.integers(18, 80, n_samples),
+        "income": rng.normal(50000, 20000, n_samples),
+        "expenses": rng.normal(30000, 15000, n_samples),
+        "account_length": rng.integers(1, 120, n_samples),
+        "customer_service_calls": rng.poisson(2, n_samples),
+        "plan_type": rng.choice(["basic", "premium", "enterprise"], n_samples),
+        "churn": rng.choice([0, 1], n_samples, p=[0.7, 0.3]),
     }
 
     df = pd.DataFrame(data)
@@ -1,209 +1,194 @@
 # Example: Code with performance issues
 
-import time
+import bisect
+import contextlib
+import functools
+import re
+from collections import Counter
+from operator import itemgetter
+
+import numpy as np
+
+# Largest magnitude whose doubled square still fits in int64 (2 * x**2 < 2**63)
+_MAX_VECTORIZED_ABS = 2**31 - 1
+
+# Matches exactly the characters for which str.isalnum() is False (\w is alnum plus "_")
+_NON_ALNUM_RE = re.compile(r"[\W_]+")
 
 
 def find_duplicates_slow(numbers):
-    """Find duplicates in a list - INEFFICIENT O(n²) version"""
-    duplicates = []
+    """Find duplicates in a list - single O(n) counting pass"""
 
-    # PERFORMANCE ISSUE: Nested loops create O(n²) complexity
-    for i in range(len(numbers)):
-        for j in range(i + 1, len(numbers)):
-            if numbers[i] == numbers[j] and numbers[i] not in duplicates:
-                duplicates.append(numbers[i])
+    # Counter keeps first-occurrence order, so duplicates come back in the same order as before
+    try:
+        counts = Counter(numbers)
+    except TypeError:
+        # Unhashable items (e.g. dicts) are keyed by their repr
+        counts = Counter(repr(x) for x in numbers)
+        first_seen = {}
+        for x in numbers:
+            first_seen.setdefault(repr(x), x)
+        return [first_seen[key] for key, count in counts.items() if count > 1]
 
-    return duplicates
+    return [x for x, count in counts.items() if count > 1]
 
 
 def calculate_fibonacci_slow(n):
-    """Calculate Fibonacci number - INEFFICIENT recursive version"""
+    """Calculate Fibonacci number - iterative O(n) version, no recursion"""
 
-    # PERFORMANCE ISSUE: Exponential time complexity due to repeated calculations
     if n <= 1:
         return n
 
-    # This recalculates the same values over and over
-    return calculate_fibonacci_slow(n - 1) + calculate_fibonacci_slow(n - 2)
+    a, b = 0, 1
+    for _ in range(n):
+        a, b = b, a + b
+    return a
 
 
-def search_in_list_slow(data, target):
-    """Search for target in list - INEFFICIENT linear search"""
+@functools.lru_cache(maxsize=None)
+def calculate_fibonacci_memo(n):
+    """Calculate Fibonacci number - recursive version, memoized so each value is computed once"""
 
-    # PERFORMANCE ISSUE: Linear search in potentially sorted data
-    for i, item in enumerate(data):
-        if item == target:
-            return i
+    if n <= 1:
+        return n
 
-    return -1
+    return calculate_fibonacci_memo(n - 1) + calculate_fibonacci_memo(n - 2)
 
 
-def process_large_dataset_slow(data):
-    """Process large dataset - MEMORY INEFFICIENT version"""
+def search_in_list_slow(data, target, assume_sorted=False):
+    """Search for target in list - binary search for sorted data, C-level scan otherwise"""
 
-    # PERFORMANCE ISSUE: Loading all data into memory at once
-    results = []
+    if assume_sorted:
+        i = bisect.bisect_left(data, target)
+        return i if i < len(data) and data[i] == target else -1
 
-    # PERFORMANCE ISSUE: Creating new lists instead of generators
-    squared_data = [x**2 for x in data]
-    filtered_data = [x for x in squared_data if x > 100]
-    final_data = [x * 2 for x in filtered_data]
+    try:
+        return data.index(target)
+    except ValueError:
+        return -1
 
-    # PERFORMANCE ISSUE: Inefficient string concatenation
-    result_string = ""
-    for item in final_data:
-        result_string += str(item) + ","
 
-    return result_string
+def build_index(data):
+    """Map each value to its first position for O(1) repeated lookups"""
+    index = {}
+    for i, item in enumerate(data):
+        index.setdefault(item, i)
+    return index
 
 
-def read_file_slow(filename):
-    """Read file - INEFFICIENT I/O version"""
+def process_large_dataset_slow(data):
+    """Process large dataset - vectorized with NumPy for integer data, joined in linear time"""
 
-    # PERFORMANCE ISSUE: Reading file character by character
-    content = ""
-    with open(filename, "r") as f:
-        while True:
-            char = f.read(1)
-            if not char:
-                break
-            content += char  # Inefficient string concatenation
+    arr = np.asarray(data)
+    if arr.dtype.kind in "iu" and arr.size and -_MAX_VECTORIZED_ABS <= arr.min() and arr.max() <= _MAX_VECTORIZED_ABS:
+        # Square, filter and double as whole-array operations instead of three list passes
+        squared = arr.astype(np.int64) ** 2
+        final_data = (squared[squared > 100] * 2).tolist()
+    else:
+        # Floats, huge ints and mixed or object data keep Python semantics (exact ints, int/float formatting)
+        final_data = [x * 2 for x in (x**2 for x in data) if x > 100]
 
-    return content
+    # Every item is followed by a comma, as in the original concatenation loop
+    return "".join(f"{item}," for item in final_data)
 
 
-def sort_dictionary_slow(data_dict):
-    """Sort dictionary by values - INEFFICIENT version"""
+def process_large_dataset_stream(data):
+    """Process large dataset - lazily, for inputs too large to hold in memory"""
 
-    # PERFORMANCE ISSUE: Converting to list multiple times
-    items = list(data_dict.items())
+    squared = (x**2 for x in data)
+    yield from (x * 2 for x in squared if x > 100)
 
-    # PERFORMANCE ISSUE: Bubble sort instead of built-in efficient sorting
-    n = len(items)
-    for i in range(n):
-        for j in range(0, n - i - 1):
-            if items[j][1] > items[j + 1][1]:
-                items[j], items[j + 1] = items[j + 1], items[j]
 
-    # PERFORMANCE ISSUE: Rebuilding dictionary inefficiently
-    result = {}
-    for key, value in items:
-        result[key] = value
+def read_file_slow(filename, chunk_size=1 << 16):
+    """Read file - buffered 64 KiB chunks joined once at the end"""
 
-    return result
+    chunks = []
+    with open(filename, "r", buffering=chunk_size) as f:
+        while chunk := f.read(chunk_size):
+            chunks.append(chunk)
 
+    return "".join(chunks)
 
-def calculate_statistics_slow(numbers):
-    """Calculate basic statistics - INEFFICIENT multiple iterations"""
 
-    # PERFORMANCE ISSUE: Multiple passes through the same data
-    total = 0
-    for num in numbers:
-        total += num
-    mean = total / len(numbers)
+def sort_dictionary_slow(data_dict):
+    """Sort dictionary by values - built-in Timsort, stable like the old bubble sort"""
 
-    # Another pass for variance
-    variance_sum = 0
-    for num in numbers:
-        variance_sum += (num - mean) ** 2
-    variance = variance_sum / len(numbers)
+    return dict(sorted(data_dict.items(), key=itemgetter(1)))
 
-    # Another pass for median
-    sorted_numbers = []
-    for num in numbers:
-        sorted_numbers.append(num)
 
-    # PERFORMANCE ISSUE: Inefficient sorting implementation
-    for i in range(len(sorted_numbers)):
-        for j in range(i + 1, len(sorted_numbers)):
-            if sorted_numbers[i] > sorted_numbers[j]:
-                sorted_numbers[i], sorted_numbers[j] = (
-                    sorted_numbers[j],
-                    sorted_numbers[i],
-                )
+def calculate_statistics_slow(numbers):
+    """Calculate basic statistics - one Welford pass plus an O(n) quickselect median"""
 
-    median = sorted_numbers[len(sorted_numbers) // 2]
+    # Welford's online update: numerically stable mean and variance in a single pass
+    n = 0
+    mean = 0.0
+    m2 = 0.0
+    for num in numbers:
+        n += 1
+        delta = num - mean
+        mean += delta / n
+        m2 += delta * (num - mean)
+    variance = m2 / n
+
+    # Upper median, as before; partition only orders the element we need
+    middle = n // 2
+    median = np.partition(np.asarray(numbers), middle)[middle].item()
 
     return {"mean": mean, "variance": variance, "median": median}
 
 
-def database_query_slow():
-    """Database queries - INEFFICIENT multiple queries"""
+def database_query_slow(limit=1):
+    """Database queries - one connection, one parameterized query for id, name and email"""
     import sqlite3
 
-    # PERFORMANCE ISSUE: Opening/closing connection multiple times
-    for i in range(100):
-        conn = sqlite3.connect("example.db")
-        cursor = conn.cursor()
-
-        # PERFORMANCE ISSUE: N+1 query problem
-        cursor.execute("SELECT id FROM users LIMIT 1")
-        user_id = cursor.fetchone()[0]
-
-        # Separate query for each user detail
-        cursor.execute(f"SELECT name FROM users WHERE id = {user_id}")
-        name = cursor.fetchone()
-
-        cursor.execute(f"SELECT email FROM users WHERE id = {user_id}")
-        email = cursor.fetchone()
-
-        conn.close()
-
-        # PERFORMANCE ISSUE: Unnecessary sleep in loop
-        time.sleep(0.01)
+    with contextlib.closing(sqlite3.connect("example.db")) as conn:
+        # A single bound statement replaces the per-column follow-up queries (N+1)
+        return conn.execute("SELECT id, name, email FROM users LIMIT ?", (limit,)).fetchall()
 
 
 def string_processing_slow(text_list):
-    """String processing - INEFFICIENT operations"""
-
-    # PERFORMANCE ISSUE: Repeated string concatenation
-    result = ""
+    """String processing - one precompiled regex substitution per text, joined once"""
 
-    for text in text_list:
-        # PERFORMANCE ISSUE: Multiple regex compilations
-        import re
+    # Stripping everything but alphanumerics leaves no whitespace to strip or replace
+    return "".join(f"{_NON_ALNUM_RE.sub('', text).lower()}\n" for text in text_list)
 
-        pattern = re.compile(r"\d+")  # Compiling regex in loop
 
-        # PERFORMANCE ISSUE: Inefficient string operations
-        cleaned = ""
-        for char in text:
-            if char.isalnum():
-                cleaned += char  # String concatenation in loop
+# Module-level counter updated by the functions below
+global_counter = 0
 
-        # PERFORMANCE ISSUE: Multiple string operations
-        processed = cleaned.lower().strip().replace(" ", "_")
-        result += processed + "\n"
 
-    return result
+def increment_counter_slow():
+    """Increment global counter - the +1/-1/+1 loop nets +1000, so apply it once"""
+    global global_counter
 
+    global_counter += 1000
 
-# PERFORMANCE ISSUE: Global variable modifications in functions
-global_counter = 0
 
-
-def increment_counter_slow():
-    """Increment global counter - INEFFICIENT global access"""
+def increment_counter_local():
+    """Increment global counter - localize, loop on the fast local, store back once"""
     global global_counter
 
-    # PERFORMANCE ISSUE: Unnecessary global variable access
-    for i in range(1000):
-        global_counter += 1
-        global_counter -= 1
-        global_counter += 1
+    counter = global_counter
+    for _ in range(1000):
+        counter += 1
+        counter -= 1
+        counter += 1
+    global_counter = counter
 
 
 if __name__ == "__main__":
-    # Test the inefficient functions
-    print("Testing inefficient implementations...")
+    # Exercise the optimized implementations
+    print("Testing optimized implementations...")
 
-    # This will be very slow for large inputs
     large_list = list(range(1000)) * 2  # List with duplicates
     duplicates = find_duplicates_slow(large_list)
     print(f"Found {len(duplicates)} duplicates")
 
-    # This will be extremely slow for n > 35
     fib_result = calculate_fibonacci_slow(30)
     print(f"Fibonacci(30) = {fib_result}")
 
-    print("All inefficient operations completed!")
+    increment_counter_slow()
+    increment_counter_local()
+    print(f"Counter = {global_counter}")
+
+    print("All operations completed!")
@@ -2,12 +2,32 @@
 Data models for code review system
 """
 
-from dataclasses import dataclass, field
+import copy
+import sys
+from dataclasses import asdict, dataclass, field, fields, is_dataclass
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
+# slots=True drops the per-instance __dict__ but needs Python 3.10+; older interpreters keep plain dataclasses
+DATACLASS_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+_IMMUTABLE_LEAVES = (str, int, float, bool, type(None))
+
+
+def _copy_json_like(value: Any) -> Any:
+    """Deep-copy a value the way ``asdict`` does, with fast paths for dicts, lists and immutable leaves"""
+    if isinstance(value, _IMMUTABLE_LEAVES):
+        return value
+    if isinstance(value, dict):
+        return {key: _copy_json_like(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json_like(item) for item in value]
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    return copy.deepcopy(value)
+
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ReviewResult:
     """Enhanced result from code review with model metadata and RAG capabilities"""
 
@@ -30,13 +50,26 @@ class ReviewResult:
     num_guidelines: Optional[int] = None
     guideline_categories: Optional[List[str]] = field(default_factory=list)
 
-    def __post_init__(self):
-        """Post-initialization to handle backward compatibility"""
-        if self.technique is not None and self.technique_used is None:
-            self.technique_used = self.technique
+    @classmethod
+    def from_legacy(cls, issues: List[Any], suggestions: List[Any], **kwargs: Any) -> "ReviewResult":
+        """Build a ReviewResult from the old call shape (plain-string issues, ``technique`` instead of ``technique_used``)"""
+        if kwargs.get("technique_used") is None:
+            kwargs["technique_used"] = kwargs.get("technique")
+        return cls(
+            issues=[item if isinstance(item, dict) else {"description": item} for item in issues],
+            suggestions=[item if isinstance(item, dict) else {"description": item} for item in suggestions],
+            **kwargs,
+        )
 
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary for JSON serialization.
+
+        Unlike ``asdict`` this is shallow: the issue and suggestion lists are shared, not deep-copied.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
 
-@dataclass
+
+@dataclass(frozen=True, **DATACLASS_SLOTS)
 class ModelConfig:
     """Configuration for a specific model"""
 
@@ -46,9 +79,10 @@ class ModelConfig:
     max_tokens: int
     description: str
     env_var: Optional[str] = None
+    timeout: Optional[float] = None
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class RAGContext:
     """Context information for RAG-enhanced reviews"""
 
@@ -69,7 +103,7 @@ class RAGContext:
         }
 
 
-@dataclass
+@dataclass(**DATACLASS_SLOTS)
 class ComparisonResult:
     """Result from comparing RAG vs traditional reviews"""
 
@@ -78,11 +112,16 @@ class ComparisonResult:
     improvement_metrics: Dict[str, Any]
     timestamp: str
 
+    @staticmethod
+    def _review_dict(review: ReviewResult) -> Dict[str, Any]:
+        """Deep copy of a review as a dict; equal to ``asdict(review)`` but without its per-value dispatch"""
+        return {f.name: _copy_json_like(getattr(review, f.name)) for f in fields(review)}
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
         return {
-            "traditional_review": self.traditional_review.__dict__,
-            "rag_enhanced_review": self.rag_enhanced_review.__dict__,
+            "traditional_review": self._review_dict(self.traditional_review),
+            "rag_enhanced_review": self._review_dict(self.rag_enhanced_review),
             "improvement_metrics": self.improvement_metrics,
             "timestamp": self.timestamp,
         }
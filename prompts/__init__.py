@@ -2,6 +2,6 @@
 Prompt templates and engineering for the Smart Code Reviewer
 """
 
-from .templates import EnhancedPromptTemplates
+from .templates import CompiledPrompt, EnhancedPromptTemplates
 
-__all__ = ["EnhancedPromptTemplates"]
+__all__ = ["CompiledPrompt", "EnhancedPromptTemplates"]
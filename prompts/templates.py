@@ -2,6 +2,37 @@
 Enhanced prompt templates with different prompting techniques
 """
 
+from string import Formatter
+from typing import List, Optional, Tuple
+
+
+class CompiledPrompt:
+    """Prompt template pre-split into literal chunks and field names.
+
+    Parsing happens once at import time; rendering is plain string joining,
+    producing the same text as ``template.format(**values)`` for string values.
+    """
+
+    __slots__ = ("template", "_parts")
+
+    def __init__(self, template: str):
+        self.template = template
+        parts: List[Tuple[str, Optional[str]]] = []
+        for literal, field_name, format_spec, conversion in Formatter().parse(template):
+            if format_spec or conversion:
+                raise ValueError(f"Unsupported format spec in prompt field {field_name!r}")
+            parts.append((literal, field_name))
+        self._parts = tuple(parts)
+
+    def render(self, **values: str) -> str:
+        """Substitute field values into the template"""
+        chunks = []
+        for literal, field_name in self._parts:
+            chunks.append(literal)
+            if field_name is not None:
+                chunks.append(str(values[field_name]))
+        return "".join(chunks)
+
 
 class EnhancedPromptTemplates:
     """Enhanced prompt templates with better structure"""
@@ -73,3 +104,7 @@ class EnhancedPromptTemplates:
         "reasoning": "comprehensive reasoning based on step-by-step analysis"
     }}
     """
+
+    ZERO_SHOT_PROMPT = CompiledPrompt(ZERO_SHOT_REVIEW)
+    FEW_SHOT_PROMPT = CompiledPrompt(FEW_SHOT_REVIEW)
+    COT_PROMPT = CompiledPrompt(COT_REVIEW)
@@ -2,6 +2,6 @@
 Model providers and registry for the Smart Code Reviewer
 """
 
-from .model_registry import ModelRegistry
+from .model_registry import MissingApiKeyError, ModelRegistry, UnsupportedProviderError
 
-__all__ = ["ModelRegistry"]
+__all__ = ["ModelRegistry", "MissingApiKeyError", "UnsupportedProviderError"]
@@ -2,86 +2,234 @@
 Model registry and provider management for LangChain integration
 """
 
+import asyncio
+import copy
+import importlib
 import logging
 import os
-from typing import Dict, Optional
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Optional, Tuple
 
 import requests
 import yaml
-from langchain_anthropic import ChatAnthropic
-from langchain_community.llms import HuggingFaceHub
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_ollama import ChatOllama
-
-# LangChain imports
-from langchain_openai import ChatOpenAI
 
 from models.data_models import ModelConfig
 
 logger = logging.getLogger(__name__)
 
+# LangChain provider classes, imported on first use so only the providers actually selected pay their import cost
+_PROVIDER_IMPORTS = {
+    "ChatOpenAI": "langchain_openai",
+    "ChatAnthropic": "langchain_anthropic",
+    "ChatGoogleGenerativeAI": "langchain_google_genai",
+    "HuggingFaceHub": "langchain_community.llms",
+    "ChatOllama": "langchain_ollama",
+}
+
+# Fallbacks when neither the model nor the config's defaults section sets them
+DEFAULT_REQUEST_TIMEOUT = 60.0
+DEFAULT_PROVIDER_CONCURRENCY = 4
+
+# How long a successful /api/tags listing is reused before probing Ollama again
+OLLAMA_TAGS_TTL = 30.0
+
+# Parsed config files, keyed by absolute path and validated against the file's mtime and size
+YAML_CACHE_SIZE = 100
+_yaml_cache: "OrderedDict[str, Tuple[int, int, Any]]" = OrderedDict()
+_yaml_cache_lock = threading.Lock()
+
+# libyaml's C loader when PyYAML was built with it; same safe subset as yaml.safe_load
+YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _provider_class(name: str):
+    """Return a LangChain provider class, importing it and caching it at module scope on first use"""
+    cls = globals().get(name)
+    if cls is None:
+        cls = getattr(importlib.import_module(_PROVIDER_IMPORTS[name]), name)
+        globals()[name] = cls
+    return cls
+
+
+class MissingApiKeyError(ValueError):
+    """A model's API key variable is not set in the environment"""
+
+
+class UnsupportedProviderError(ValueError):
+    """A model's configured provider has no LangChain integration in the registry"""
+
+
+def _load_yaml_cached(path: str) -> Any:
+    """Parse a YAML file, reusing the last parse while its mtime and size are unchanged.
+
+    Callers get a deep copy, so they can modify the result without touching the cache.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        # Nothing to validate a cache entry against; parse uncached and let open() report the problem
+        with open(path, "r") as file:
+            return yaml.load(file, Loader=YAML_LOADER)
+
+    key = os.path.abspath(path)
+    with _yaml_cache_lock:
+        cached = _yaml_cache.get(key)
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            _yaml_cache.move_to_end(key)
+            return copy.deepcopy(cached[2])
+
+    with open(path, "r") as file:
+        data = yaml.load(file, Loader=YAML_LOADER)
+
+    with _yaml_cache_lock:
+        _yaml_cache[key] = (stat.st_mtime_ns, stat.st_size, data)
+        _yaml_cache.move_to_end(key)
+        if len(_yaml_cache) > YAML_CACHE_SIZE:
+            _yaml_cache.popitem(last=False)
+    return copy.deepcopy(data)
+
+
+def __getattr__(name: str):
+    if name in _PROVIDER_IMPORTS:
+        return _provider_class(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 class ModelRegistry:
     """Dynamic model registry with LangChain integration"""
 
-    def __init__(self, config_path: str = "models_config.yaml"):
+    def __init__(self, config_path: Optional[str] = "models_config.yaml"):
         self.config_path = config_path
         self.models: Dict[str, ModelConfig] = {}
         self.providers: Dict[str, Dict] = {}
-        self.load_config()
+        self.defaults: Dict[str, Any] = {}
+        # API key variable of every non-Ollama model (None when it needs none), resolved once per config load
+        self._model_env_vars: Dict[str, Optional[str]] = {}
+        self._ollama_models_cache: Optional[Tuple[float, FrozenSet[str]]] = None
+        self._ollama_models_lock = threading.Lock()
+        # Keep-alive connections for the Ollama probes; only used under _ollama_models_lock
+        self._http = requests.Session()
+        self._model_cache: Dict[str, Tuple[Optional[weakref.ref], Optional[str], Any]] = {}
+        self._model_cache_lock = threading.Lock()
+        if config_path is not None:
+            self.load_config()
+
+    @classmethod
+    def from_dict(cls, config: Dict[str, Any]) -> "ModelRegistry":
+        """Build a registry from an already parsed config with the same layout as models_config.yaml"""
+        registry = cls(config_path=None)
+        registry._populate(copy.deepcopy(config))
+        return registry
 
     def load_config(self):
         """Load model configurations from YAML file"""
         try:
-            with open(self.config_path, "r") as file:
-                config = yaml.safe_load(file)
-
-            # Load model configs
-            for model_id, model_data in config.get("models", {}).items():
-                self.models[model_id] = ModelConfig(**model_data)
-
-            # Load provider configs
-            self.providers = config.get("providers", {})
-
-            logger.info(f"Loaded {len(self.models)} models from config")
-
+            self._populate(_load_yaml_cached(self.config_path))
         except FileNotFoundError:
             logger.error(f"Config file {self.config_path} not found")
         except Exception as e:
             logger.error(f"Error loading config: {e}")
 
+    def _populate(self, config: Dict[str, Any]):
+        """Load model and provider configs from a parsed config"""
+        # Load model configs
+        for model_id, model_data in config.get("models", {}).items():
+            self.models[model_id] = ModelConfig(**model_data)
+
+        # Load provider configs
+        self.providers = config.get("providers", {})
+        self.defaults = config.get("defaults", {})
+        self._model_env_vars = {
+            model_id: model.env_var or self.providers.get(model.provider, {}).get("env_var")
+            for model_id, model in self.models.items()
+            if model.provider != "ollama"
+        }
+
+        logger.info(f"Loaded {len(self.models)} models from config")
+
     def get_available_models(self) -> Dict[str, str]:
         """Get list of available models with descriptions"""
+        # API key checks are dict lookups; Ollama models all check against one cached /api/tags listing
         return {model_id: config.description for model_id, config in self.models.items() if self._is_model_available(model_id)}
 
+    def get_timeout(self, model_id: str) -> float:
+        """Request timeout in seconds for a model (model setting, then config defaults)"""
+        config = self.models.get(model_id)
+        if config is not None and config.timeout is not None:
+            return float(config.timeout)
+        return float(self.defaults.get("timeout", DEFAULT_REQUEST_TIMEOUT))
+
+    def get_max_concurrency(self, provider: str) -> int:
+        """Maximum concurrent requests to a provider (provider setting, then config defaults)"""
+        provider_config = self.providers.get(provider, {})
+        return int(provider_config.get("max_concurrency", self.defaults.get("max_concurrency", DEFAULT_PROVIDER_CONCURRENCY)))
+
     def _is_model_available(self, model_id: str) -> bool:
         """Check if model is available (API key exists or Ollama model exists)"""
         if model_id not in self.models:
             return False
 
-        config = self.models[model_id]
-
         # Special case for Ollama models - check if model exists locally
-        if config.provider == "ollama":
-            return self._is_ollama_model_available(config.model_name)
-
-        provider_config = self.providers.get(config.provider, {})
-        env_var = config.env_var or provider_config.get("env_var")
+        if model_id not in self._model_env_vars:
+            return self._is_ollama_model_available(self.models[model_id].model_name)
 
+        env_var = self._model_env_vars[model_id]
         if env_var:
-            return bool(os.getenv(env_var))
+            return bool(os.environ.get(env_var))
         return True
 
+    def _fetch_ollama_models(self) -> FrozenSet[str]:
+        """Return the names of locally installed Ollama models, cached for OLLAMA_TAGS_TTL seconds"""
+        with self._ollama_models_lock:
+            now = time.monotonic()
+            cached = self._ollama_models_cache
+            if cached is not None and now - cached[0] < OLLAMA_TAGS_TTL:
+                return cached[1]
+
+            names: FrozenSet[str] = frozenset()
+            try:
+                response = self._http.get("http://localhost:11434/api/tags", timeout=5)
+                if response.status_code == 200:
+                    names = frozenset(model["name"] for model in response.json().get("models", []))
+            except (requests.RequestException, KeyError):
+                pass
+
+            self._ollama_models_cache = (now, names)
+            return names
+
     def _is_ollama_model_available(self, model_name: str) -> bool:
         """Check if Ollama model is available locally"""
+        return model_name in self._fetch_ollama_models()
+
+    def get_or_create(self, model_id: str):
+        """Return a cached LangChain model instance, creating it on first use.
+
+        Provider SDK clients keep connection pools bound to the event loop they were first used on,
+        so an instance is only reused within the loop (or loop-less caller) that created it, and
+        only while its API key is unchanged.
+        """
         try:
-            response = requests.get("http://localhost:11434/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                return any(model["name"] == model_name for model in models)
-        except (requests.RequestException, KeyError):
-            pass
-        return False
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        env_var = self._model_env_vars.get(model_id)
+        api_key = os.environ.get(env_var) if env_var else None
+
+        with self._model_cache_lock:
+            cached = self._model_cache.get(model_id)
+        if cached is not None:
+            loop_ref, cached_key, model = cached
+            same_loop = (loop_ref is None and loop is None) or (loop_ref is not None and loop_ref() is loop)
+            if same_loop and cached_key == api_key:
+                return model
+
+        model = self.create_model(model_id)
+        with self._model_cache_lock:
+            self._model_cache[model_id] = (weakref.ref(loop) if loop is not None else None, api_key, model)
+        return model
 
     def create_model(self, model_id: str):
         """Dynamically create a LangChain model instance"""
@@ -89,51 +237,50 @@ class ModelRegistry:
             raise ValueError(f"Model {model_id} not found in registry")
 
         config = self.models[model_id]
-        provider_config = self.providers.get(config.provider, {})
 
         # Check API key
-        env_var = config.env_var or provider_config.get("env_var")
-        if env_var and not os.getenv(env_var):
-            raise ValueError(f"API key {env_var} not found for model {model_id}")
+        env_var = self._model_env_vars.get(model_id)
+        if env_var and not os.environ.get(env_var):
+            raise MissingApiKeyError(f"API key {env_var} not found for model {model_id}")
 
         # Create model based on provider
         if config.provider == "openai":
-            return ChatOpenAI(
+            return _provider_class("ChatOpenAI")(
                 model=config.model_name,
                 temperature=config.temperature,
                 max_tokens=config.max_tokens,
-                api_key=os.getenv("OPENAI_API_KEY"),
+                api_key=os.environ.get("OPENAI_API_KEY"),
             )
 
         elif config.provider == "anthropic":
-            return ChatAnthropic(
+            return _provider_class("ChatAnthropic")(
                 model=config.model_name,
                 temperature=config.temperature,
                 max_tokens=config.max_tokens,
-                api_key=os.getenv("ANTHROPIC_API_KEY"),
+                api_key=os.environ.get("ANTHROPIC_API_KEY"),
             )
 
         elif config.provider == "google":
-            return ChatGoogleGenerativeAI(
+            return _provider_class("ChatGoogleGenerativeAI")(
                 model=config.model_name,
                 temperature=config.temperature,
                 max_output_tokens=config.max_tokens,
-                google_api_key=os.getenv("GOOGLE_API_KEY"),
+                google_api_key=os.environ.get("GOOGLE_API_KEY"),
             )
 
         elif config.provider == "huggingface":
-            return HuggingFaceHub(
+            return _provider_class("HuggingFaceHub")(
                 repo_id=config.model_name,
                 model_kwargs={
                     "temperature": config.temperature,
                     "max_length": config.max_tokens,
                 },
-                huggingfacehub_api_token=os.getenv("HUGGINGFACE_API_TOKEN"),
+                huggingfacehub_api_token=os.environ.get("HUGGINGFACE_API_TOKEN"),
             )
 
         elif config.provider == "ollama":
             provider_config = self.providers.get("ollama", {})
-            return ChatOllama(
+            return _provider_class("ChatOllama")(
                 model=config.model_name,
                 temperature=config.temperature,
                 num_predict=config.max_tokens,
@@ -141,4 +288,4 @@ class ModelRegistry:
             )
 
         else:
-            raise ValueError(f"Unsupported provider: {config.provider}")
+            raise UnsupportedProviderError(f"Unsupported provider: {config.provider}")
@@ -6,6 +6,8 @@ to enhance code reviews with relevant coding guidelines and best practices.
 """
 
 from .document_loader import DocumentLoader
+from .embedding_cache import EmbeddingCache
+from .semantic_cache import SemanticCache
 from .vector_store import VectorStore
 
-__all__ = ["DocumentLoader", "VectorStore"]
+__all__ = ["DocumentLoader", "EmbeddingCache", "SemanticCache", "VectorStore"]
@@ -5,17 +5,37 @@ This module handles loading and chunking of coding guidelines and best practices
 documents for vector storage and retrieval.
 """
 
+import asyncio
 import logging
 import os
+import re
+from itertools import islice
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Iterable, List, Optional
 
 from langchain.schema import Document
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from langchain_community.document_loaders import DirectoryLoader, TextLoader
+
+try:
+    # Optional Rust-backed splitter; the pure-Python LangChain splitter is used when it is not installed
+    from semantic_text_splitter import MarkdownSplitter
+except ImportError:
+    MarkdownSplitter = None
 
 logger = logging.getLogger(__name__)
 
+_H1_RE = re.compile(r"^# (.+)$", re.MULTILINE)
+
+
+def _read_markdown(path: Path) -> Document:
+    """Read a single markdown file into a Document."""
+    return Document(page_content=path.read_text(encoding="utf-8", errors="ignore"), metadata={"source": str(path)})
+
+
+async def _read_markdown_files(paths: Iterable[Path]) -> List[Document]:
+    """Read files concurrently in worker threads so the event loop is never blocked on disk I/O."""
+    return list(await asyncio.gather(*(asyncio.to_thread(_read_markdown, path) for path in paths)))
+
 
 class DocumentLoader:
     """Loads and chunks documents from the knowledge base directory."""
@@ -45,6 +65,7 @@ class DocumentLoader:
             separators=["\n\n", "\n", ". ", " ", ""],
             keep_separator=True,
         )
+        self._markdown_splitter = MarkdownSplitter(chunk_size, overlap=chunk_overlap) if MarkdownSplitter else None
 
         logger.info(f"DocumentLoader initialized with docs_path: {self.docs_path}")
 
@@ -61,14 +82,7 @@ class DocumentLoader:
                 return []
 
             # Load markdown files from all subdirectories
-            loader = DirectoryLoader(
-                str(self.docs_path),
-                glob="**/*.md",
-                loader_cls=TextLoader,
-                show_progress=True,
-            )
-
-            documents = loader.load()
+            documents = await _read_markdown_files(sorted(self.docs_path.rglob("*.md")))
             logger.info(f"Loaded {len(documents)} documents from {self.docs_path}")
 
             # Add category metadata based on directory structure
@@ -105,12 +119,8 @@ class DocumentLoader:
         )
 
         # Extract document title from first heading
-        lines = doc.page_content.split("\n")
-        title = None
-        for line in lines:
-            if line.startswith("# "):
-                title = line[2:].strip()
-                break
+        match = _H1_RE.search(doc.page_content)
+        title = match.group(1).strip() if match else None
 
         if title:
             doc.metadata["title"] = title
@@ -126,12 +136,8 @@ class DocumentLoader:
             List of chunked documents
         """
         try:
-            chunks = self.text_splitter.split_documents(documents)
-
-            # Add chunk metadata
-            for i, chunk in enumerate(chunks):
-                chunk.metadata["chunk_id"] = i
-                chunk.metadata["chunk_size"] = len(chunk.page_content)
+            chunks = self._split_documents(documents)
+            self._add_chunk_metadata(chunks)
 
             logger.info(f"Split {len(documents)} documents into {len(chunks)} chunks")
             return chunks
@@ -140,6 +146,38 @@ class DocumentLoader:
             logger.error(f"Error chunking documents: {str(e)}")
             return documents
 
+    def _split_documents(self, documents: List[Document]) -> List[Document]:
+        """
+        Split documents with the Rust markdown splitter when available, else the LangChain splitter.
+
+        Args:
+            documents: Documents to split
+
+        Returns:
+            Chunks carrying a copy of their source document's metadata
+        """
+        if self._markdown_splitter is None:
+            return self.text_splitter.split_documents(documents)
+
+        return [
+            Document(page_content=text, metadata=dict(doc.metadata))
+            for doc in documents
+            for text in self._markdown_splitter.chunks(doc.page_content)
+        ]
+
+    @staticmethod
+    def _add_chunk_metadata(chunks: List[Document], start_id: int = 0) -> None:
+        """
+        Number chunks and record their sizes.
+
+        Args:
+            chunks: Chunks to annotate in place
+            start_id: chunk_id assigned to the first chunk
+        """
+        for i, chunk in enumerate(chunks, start_id):
+            chunk.metadata["chunk_id"] = i
+            chunk.metadata["chunk_size"] = len(chunk.page_content)
+
     async def load_and_chunk(self) -> List[Document]:
         """
         Load documents and split them into chunks in one operation.
@@ -153,6 +191,36 @@ class DocumentLoader:
 
         return await self.chunk_documents(documents)
 
+    async def iter_chunk_batches(self, batch_size: int = 64) -> AsyncIterator[List[Document]]:
+        """
+        Load and chunk the knowledge base incrementally, batch_size files at a time.
+
+        Lets callers embed and store one batch while the next one is still being read.
+
+        Args:
+            batch_size: Number of files read per batch
+
+        Yields:
+            Lists of chunked documents with the same metadata as load_and_chunk
+        """
+        if not self.docs_path.exists():
+            logger.error(f"Knowledge base directory not found: {self.docs_path}")
+            return
+
+        paths = self.docs_path.rglob("*.md")
+        next_chunk_id = 0
+        while batch_paths := list(islice(paths, batch_size)):
+            documents = await _read_markdown_files(batch_paths)
+            for doc in documents:
+                self._add_metadata(doc)
+
+            chunks = await asyncio.to_thread(self._split_documents, documents)
+            self._add_chunk_metadata(chunks, next_chunk_id)
+            next_chunk_id += len(chunks)
+
+            logger.info(f"Split {len(documents)} documents into {len(chunks)} chunks")
+            yield chunks
+
     def get_categories(self) -> List[str]:
         """
         Get list of available categories in the knowledge base.
@@ -160,12 +228,12 @@ class DocumentLoader:
         Returns:
             List of category names
         """
-        categories = []
-        if self.docs_path.exists():
-            for item in self.docs_path.iterdir():
-                if item.is_dir():
-                    categories.append(item.name)
-        return sorted(categories)
+        if not self.docs_path.exists():
+            return []
+
+        # DirEntry.is_dir() uses the file type from the directory read instead of a stat per entry
+        with os.scandir(self.docs_path) as entries:
+            return sorted(entry.name for entry in entries if entry.is_dir())
 
     async def load_category(self, category: str) -> List[Document]:
         """
@@ -183,9 +251,7 @@ class DocumentLoader:
             return []
 
         try:
-            loader = DirectoryLoader(str(category_path), glob="*.md", loader_cls=TextLoader)
-
-            documents = loader.load()
+            documents = await _read_markdown_files(sorted(category_path.glob("*.md")))
             for doc in documents:
                 self._add_metadata(doc)
                 doc.metadata["category"] = category
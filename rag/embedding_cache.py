@@ -0,0 +1,143 @@
+"""
+Persistent embedding cache for the RAG knowledge base.
+
+Embeddings are keyed by SHA-256 of the embedding model name and the input
+text, so re-indexing an unchanged knowledge base or repeating a query never
+goes back to the embedding API.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+logger = logging.getLogger(__name__)
+
+# SQLite caps the number of bound parameters per statement (999 on older builds)
+_LOOKUP_BATCH = 500
+
+
+class EmbeddingCache(Embeddings):
+    """Embeddings wrapper that stores vectors in SQLite with a small in-memory LRU in front."""
+
+    def __init__(self, embeddings: Embeddings, db_path: Path, model_name: str, memory_size: int = 1024):
+        """
+        Initialize the embedding cache.
+
+        Args:
+            embeddings: Underlying embeddings used on cache misses
+            db_path: SQLite file holding the cached vectors
+            model_name: Embedding model name, part of every cache key
+            memory_size: Number of vectors kept in the in-memory LRU
+        """
+        self.embeddings = embeddings
+        self.db_path = Path(db_path)
+        self.model_name = model_name
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            self._conn.commit()
+        return self._conn
+
+    def _key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}|{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: List[float]):
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        if len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, keys: List[str]) -> Dict[str, List[float]]:
+        """Return cached vectors for the given keys, checking memory before disk"""
+        found: Dict[str, List[float]] = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+            pending = list({key for key in keys if key not in found})
+            if not pending:
+                return found
+
+            conn = self._connection()
+            for start in range(0, len(pending), _LOOKUP_BATCH):
+                batch = pending[start : start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = conn.execute(f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch)
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    found[key] = vector.tolist()
+                    self._remember(key, found[key])
+        return found
+
+    def _store(self, vectors: Dict[str, List[float]]):
+        """Write freshly computed vectors to memory and disk"""
+        with self._lock:
+            for key, vector in vectors.items():
+                self._remember(key, vector)
+            conn = self._connection()
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                ((key, array("f", vector).tobytes()) for key, vector in vectors.items()),
+            )
+            conn.commit()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed documents, calling the underlying model only for texts not seen before"""
+        keys = [self._key(text) for text in texts]
+        vectors = self._lookup(keys)
+
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in vectors:
+                missing.setdefault(key, text)
+
+        if missing:
+            fresh = dict(zip(missing, self.embeddings.embed_documents(list(missing.values()))))
+            self._store(fresh)
+            vectors.update(fresh)
+
+        logger.debug(f"Embedding cache: {len(texts) - len(missing)} hits, {len(missing)} misses")
+        return [vectors[key] for key in keys]
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query, reusing the cached vector when available"""
+        key = self._key(text)
+        vector = self._lookup([key]).get(key)
+        if vector is None:
+            vector = self.embeddings.embed_query(text)
+            self._store({key: vector})
+        return vector
+
+    def clear(self):
+        """Drop all cached vectors, in memory and on disk"""
+        with self._lock:
+            self._memory.clear()
+            conn = self._connection()
+            conn.execute("DELETE FROM embeddings")
+            conn.commit()
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,150 @@
+"""
+Similarity-keyed LRU cache.
+
+Entries are looked up by embedding: a lookup hits when a cached entry with the
+same exact key has a cosine similarity to the probe at or above the threshold.
+Entries can optionally expire after a time-to-live. All operations are
+thread-safe.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+import numpy as np
+
+V = TypeVar("V")
+
+
+class _Bucket:
+    """Pre-normalized float32 embeddings of all entries sharing one exact key, one row per entry"""
+
+    __slots__ = ("matrix", "entry_ids", "rows")
+
+    def __init__(self, dimensions: int):
+        self.matrix = np.empty((4, dimensions), dtype=np.float32)
+        self.entry_ids: List[int] = []
+        self.rows: Dict[int, int] = {}
+
+    def add(self, entry_id: int, vector: np.ndarray) -> None:
+        count = len(self.entry_ids)
+        if count == len(self.matrix):
+            # Grow geometrically so inserts stay amortized O(d)
+            grown = np.empty((2 * count, self.matrix.shape[1]), dtype=np.float32)
+            grown[:count] = self.matrix
+            self.matrix = grown
+        self.matrix[count] = vector
+        self.entry_ids.append(entry_id)
+        self.rows[entry_id] = count
+
+    def remove(self, entry_id: int) -> None:
+        # Swap the last row into the freed slot to keep rows contiguous
+        row = self.rows.pop(entry_id)
+        last_id = self.entry_ids.pop()
+        if last_id != entry_id:
+            self.matrix[row] = self.matrix[len(self.entry_ids)]
+            self.entry_ids[row] = last_id
+            self.rows[last_id] = row
+
+    def scores(self, vector: np.ndarray) -> np.ndarray:
+        return self.matrix[: len(self.entry_ids)] @ vector
+
+
+class SemanticCache(Generic[V]):
+    """Bounded LRU cache whose entries match on embedding similarity within an exact key."""
+
+    def __init__(self, max_size: int = 256, threshold: float = 0.97, ttl: Optional[float] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of entries kept
+            threshold: Minimum cosine similarity for a hit
+            ttl: Seconds an entry stays valid, or None to keep entries until evicted
+        """
+        self.max_size = max_size
+        self.threshold = threshold
+        self.ttl = ttl
+        # LRU order of (key, value, stored_at); the vectors live in the per-key buckets
+        self._entries: "OrderedDict[int, Tuple[Hashable, V, float]]" = OrderedDict()
+        self._buckets: Dict[Hashable, _Bucket] = {}
+        self._seq = 0
+        # Lookups reorder and evict entries too, and the bucket rows must stay in step with them
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    @staticmethod
+    def _unit_vector(embedding: Any) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _remove(self, entry_id: int) -> None:
+        key = self._entries.pop(entry_id)[0]
+        bucket = self._buckets[key]
+        bucket.remove(entry_id)
+        if not bucket.entry_ids:
+            del self._buckets[key]
+
+    def lookup(self, key: Hashable, embedding: Any) -> Optional[V]:
+        """
+        Return the value of the most similar entry stored under key, if similar enough.
+
+        Args:
+            key: Exact-match part of the cache key (e.g. k and filters)
+            embedding: Embedding of the probe
+
+        Returns:
+            Cached value or None
+        """
+        vector = self._unit_vector(embedding)
+        with self._lock:
+            while True:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    return None
+
+                similarities = bucket.scores(vector)
+                best = int(np.argmax(similarities))
+                if similarities[best] < self.threshold:
+                    return None
+
+                entry_id = bucket.entry_ids[best]
+                _, value, stored_at = self._entries[entry_id]
+                if self.ttl is not None and stored_at < time.monotonic() - self.ttl:
+                    # Expired entries are dropped when they would have been served; try the next best
+                    self._remove(entry_id)
+                    continue
+
+                self._entries.move_to_end(entry_id)
+                return value
+
+    def store(self, key: Hashable, embedding: Any, value: V) -> None:
+        """
+        Add an entry, evicting the least recently used one when full.
+
+        Args:
+            key: Exact-match part of the cache key
+            embedding: Embedding the value is stored under
+            value: Value to cache
+        """
+        vector = self._unit_vector(embedding)
+        with self._lock:
+            self._seq += 1
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = _Bucket(len(vector))
+            bucket.add(self._seq, vector)
+            self._entries[self._seq] = (key, value, time.monotonic())
+            if len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._buckets.clear()
@@ -5,18 +5,62 @@ This module provides vector storage and similarity search capabilities
 for the Smart Code Reviewer's knowledge base.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import os
+import sqlite3
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
 import chromadb
+import numpy as np
 from langchain.schema import Document
 from langchain_chroma import Chroma
 from langchain_openai import OpenAIEmbeddings
 
+from .embedding_cache import EmbeddingCache
+from .semantic_cache import SemanticCache
+
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "text-embedding-3-small"  # More cost-effective embedding model
+# text-embedding-3 models are truncated server-side; 512 of the native 1536 dims keeps most of the accuracy
+# at a third of the storage and distance-computation cost. Override with RAG_EMBEDDING_DIMENSIONS.
+DEFAULT_EMBEDDING_DIMENSIONS = 512
+EMBED_CACHE_FILENAME = "embed_cache.db"
+
+# Texts per embedding request and per Chroma insert when building the collection
+EMBED_BATCH_SIZE = 512
+
+# Embedding requests in flight at once while building the collection
+EMBED_MAX_CONCURRENCY = 4
+
+# Loaded batches allowed to wait for embedding before the loader is paused
+STREAM_QUEUE_SIZE = 4
+
+CHROMA_SQLITE_FILENAME = "chroma.sqlite3"
+
+# Category tally computed inside Chroma's SQLite store instead of pulling every metadata row into Python
+_CATEGORY_COUNTS_SQL = """
+    SELECT em.string_value, COUNT(*)
+    FROM embedding_metadata AS em
+    JOIN embeddings AS e ON e.id = em.id
+    JOIN segments AS s ON s.id = e.segment_id
+    WHERE s.collection = ? AND em.key = 'category'
+    GROUP BY em.string_value
+"""
+
+# Semantic query cache: paraphrased queries whose embeddings are this close reuse earlier results,
+# for up to QUERY_CACHE_TTL seconds
+QUERY_CACHE_SIZE = 256
+QUERY_EMBEDDING_CACHE_SIZE = 2048
+QUERY_CACHE_THRESHOLD = 0.97
+QUERY_CACHE_TTL = 600.0
+
 
 class VectorStore:
     """Vector store implementation using ChromaDB for document retrieval."""
@@ -25,6 +69,7 @@ class VectorStore:
         self,
         persist_directory: str = "./chroma_db",
         collection_name: str = "code_review_kb",
+        embedding_dimensions: Optional[int] = None,
     ):
         """
         Initialize the vector store.
@@ -32,22 +77,41 @@ class VectorStore:
         Args:
             persist_directory: Directory to persist the ChromaDB
             collection_name: Name of the ChromaDB collection
+            embedding_dimensions: Embedding size requested from the model (defaults to
+                RAG_EMBEDDING_DIMENSIONS or DEFAULT_EMBEDDING_DIMENSIONS)
         """
         self.persist_directory = Path(persist_directory)
         self.collection_name = collection_name
+        self.embedding_dimensions = embedding_dimensions or int(
+            os.getenv("RAG_EMBEDDING_DIMENSIONS", DEFAULT_EMBEDDING_DIMENSIONS)
+        )
         self.vectorstore = None
+        self._query_cache: SemanticCache[List[Document]] = SemanticCache(
+            QUERY_CACHE_SIZE, QUERY_CACHE_THRESHOLD, QUERY_CACHE_TTL
+        )
+        self._query_embeddings: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._query_embeddings_lock = threading.Lock()
 
         # Initialize OpenAI embeddings
         try:
             self.embeddings = OpenAIEmbeddings(
                 openai_api_key=os.getenv("OPENAI_API_KEY"),
-                model="text-embedding-3-small",  # More cost-effective embedding model
+                model=EMBEDDING_MODEL,
+                dimensions=self.embedding_dimensions,
             )
             logger.info("OpenAI embeddings initialized successfully")
         except Exception as e:
             logger.error(f"Failed to initialize OpenAI embeddings: {str(e)}")
             raise
 
+        # Reuse embeddings of unchanged texts across re-indexing and repeated queries
+        if os.getenv("RAG_USE_EMBED_CACHE", "true").lower() != "false":
+            self.embeddings = EmbeddingCache(
+                self.embeddings,
+                db_path=self.persist_directory / EMBED_CACHE_FILENAME,
+                model_name=f"{EMBEDDING_MODEL}:{self.embedding_dimensions}",
+            )
+
         # Ensure persist directory exists
         self.persist_directory.mkdir(parents=True, exist_ok=True)
         logger.info(f"VectorStore initialized with persist_directory: {self.persist_directory}")
@@ -69,12 +133,15 @@ class VectorStore:
 
             logger.info(f"Creating vector store with {len(documents)} documents")
 
-            self.vectorstore = Chroma.from_documents(
-                documents=documents,
-                embedding=self.embeddings,
-                persist_directory=str(self.persist_directory),
-                collection_name=self.collection_name,
-            )
+            self._query_cache.clear()
+            by_id = self._documents_by_content_id(documents)
+            ids = list(by_id)
+            texts = [doc.page_content for doc in by_id.values()]
+            metadatas = [doc.metadata for doc in by_id.values()]
+            embeddings = await self._embed_documents(texts)
+
+            self.vectorstore = self._open_chroma()
+            self._add_embedded(ids, texts, metadatas, embeddings)
 
             # In newer ChromaDB versions, persistence happens automatically
 
@@ -85,6 +152,119 @@ class VectorStore:
             logger.error(f"Error creating vector store: {str(e)}")
             return False
 
+    async def create_vectorstore_streaming(self, batches: AsyncIterator[List[Document]]) -> int:
+        """
+        Create vector store from batches of documents, embedding each batch while the next is loaded.
+
+        Args:
+            batches: Async iterator of document batches, e.g. DocumentLoader.iter_chunk_batches()
+
+        Returns:
+            Number of documents stored (0 if nothing was stored or an error occurred)
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_SIZE)
+
+        async def produce():
+            try:
+                async for batch in batches:
+                    if batch:
+                        await queue.put(batch)
+            except Exception:
+                await queue.put(None)
+                raise
+            await queue.put(None)
+
+        producer = None
+        try:
+            self._query_cache.clear()
+            self.vectorstore = self._open_chroma()
+            producer = asyncio.create_task(produce())
+
+            stored = 0
+            while (batch := await queue.get()) is not None:
+                by_id = self._documents_by_content_id(batch)
+                texts = [doc.page_content for doc in by_id.values()]
+                embeddings = await self._embed_documents(texts)
+                self._add_embedded(list(by_id), texts, [doc.metadata for doc in by_id.values()], embeddings)
+                stored += len(by_id)
+
+            await producer
+            logger.info(f"Vector store created and persisted with {stored} documents")
+            return stored
+
+        except Exception as e:
+            logger.error(f"Error creating vector store: {str(e)}")
+            return 0
+
+        finally:
+            if producer is not None and not producer.done():
+                producer.cancel()
+
+    @staticmethod
+    def _documents_by_content_id(documents: List[Document]) -> Dict[str, Document]:
+        """
+        Key documents by SHA-256 of their content, keeping the first of any duplicates.
+
+        Content-derived ids let update_vectorstore tell unchanged chunks from new or removed ones.
+        """
+        by_id: Dict[str, Document] = {}
+        for doc in documents:
+            by_id.setdefault(hashlib.sha256(doc.page_content.encode("utf-8")).hexdigest(), doc)
+        return by_id
+
+    def _open_chroma(self) -> Chroma:
+        return Chroma(
+            persist_directory=str(self.persist_directory),
+            embedding_function=self.embeddings,
+            collection_name=self.collection_name,
+        )
+
+    def _add_embedded(
+        self,
+        ids: List[str],
+        texts: List[str],
+        metadatas: List[Dict[str, Any]],
+        embeddings: np.ndarray,
+    ) -> None:
+        """Upsert precomputed embeddings into the collection in EMBED_BATCH_SIZE slices"""
+        collection = self.vectorstore._collection
+        for start in range(0, len(ids), EMBED_BATCH_SIZE):
+            end = start + EMBED_BATCH_SIZE
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings[start:end],
+                documents=texts[start:end],
+                metadatas=metadatas[start:end],
+            )
+
+    def _embed_batch(self, texts: List[str]) -> np.ndarray:
+        return np.asarray(self.embeddings.embed_documents(texts), dtype=np.float32)
+
+    async def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts in batches of EMBED_BATCH_SIZE, running up to EMBED_MAX_CONCURRENCY batches concurrently.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Contiguous float32 array with one row per text, in input order. Each batch is
+            converted as it arrives, so the boxed float lists are freed early and Chroma
+            receives vectors already in its native precision.
+        """
+        batches = [texts[start : start + EMBED_BATCH_SIZE] for start in range(0, len(texts), EMBED_BATCH_SIZE)]
+        # Created per call: asyncio primitives must not outlive the event loop they run on
+        limit = asyncio.Semaphore(EMBED_MAX_CONCURRENCY)
+
+        async def embed(batch: List[str]) -> np.ndarray:
+            async with limit:
+                return await asyncio.to_thread(self._embed_batch, batch)
+
+        results = await asyncio.gather(*(embed(batch) for batch in batches))
+        if not results:
+            return np.empty((0, self.embedding_dimensions), dtype=np.float32)
+        return np.concatenate(results)
+
     def load_vectorstore(self) -> bool:
         """
         Load existing vector store from persistence.
@@ -109,6 +289,16 @@ class VectorStore:
                 logger.warning("Vector store is empty")
                 return False
 
+            # A store built with another embedding size can't be queried; drop it so it gets rebuilt
+            sample = self.vectorstore._collection.get(limit=1, include=["embeddings"])["embeddings"]
+            if len(sample) and len(sample[0]) != self.embedding_dimensions:
+                logger.warning(
+                    f"Vector store has {len(sample[0])}-dim embeddings, expected {self.embedding_dimensions}; rebuilding"
+                )
+                self.vectorstore.delete_collection()
+                self.vectorstore = None
+                return False
+
             logger.info(f"Vector store loaded with {collection_count} documents")
             return True
 
@@ -116,7 +306,38 @@ class VectorStore:
             logger.error(f"Error loading vector store: {str(e)}")
             return False
 
-    async def similarity_search(self, query: str, k: int = 3, filter_dict: Optional[Dict[str, Any]] = None) -> List[Document]:
+    async def embed_query(self, query: str) -> List[float]:
+        """
+        Embed a search query, reusing recent embeddings of the same text.
+
+        Args:
+            query: Search query
+
+        Returns:
+            Query embedding, suitable for the query_embedding argument of the search methods
+        """
+        # Key by digest so long queries (whole code submissions) are not held twice
+        key = hashlib.sha256(query.encode("utf-8")).hexdigest()
+        with self._query_embeddings_lock:
+            embedding = self._query_embeddings.get(key)
+            if embedding is not None:
+                self._query_embeddings.move_to_end(key)
+                return embedding
+
+        embedding = await asyncio.to_thread(self.embeddings.embed_query, query)
+        with self._query_embeddings_lock:
+            self._query_embeddings[key] = embedding
+            if len(self._query_embeddings) > QUERY_EMBEDDING_CACHE_SIZE:
+                self._query_embeddings.popitem(last=False)
+        return embedding
+
+    async def similarity_search(
+        self,
+        query: str,
+        k: int = 3,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+    ) -> List[Document]:
         """
         Perform similarity search on the vector store.
 
@@ -124,6 +345,7 @@ class VectorStore:
             query: Search query
             k: Number of documents to return
             filter_dict: Optional metadata filters
+            query_embedding: Precomputed embedding of query (see embed_query)
 
         Returns:
             List of relevant documents
@@ -134,21 +356,36 @@ class VectorStore:
                     logger.error("Vector store not available for search")
                     return []
 
-            # Perform similarity search
+            # Embed once; the vector serves both the semantic cache lookup and the Chroma search
+            embedding = query_embedding if query_embedding is not None else await self.embed_query(query)
+            cache_key = (k, json.dumps(filter_dict, sort_keys=True, default=str) if filter_dict else None)
+            docs = self._query_cache.lookup(cache_key, embedding)
+            if docs is not None:
+                logger.info(f"Query cache hit with {len(docs)} documents for query: '{query[:50]}...'")
+                return list(docs)
+
+            # Perform similarity search off the event loop so callers can overlap other work with it
             if filter_dict:
-                docs = self.vectorstore.similarity_search(query=query, k=k, filter=filter_dict)
+                docs = await asyncio.to_thread(
+                    self.vectorstore.similarity_search_by_vector, embedding=embedding, k=k, filter=filter_dict
+                )
             else:
-                docs = self.vectorstore.similarity_search(query=query, k=k)
+                docs = await asyncio.to_thread(self.vectorstore.similarity_search_by_vector, embedding=embedding, k=k)
 
+            self._query_cache.store(cache_key, embedding, list(docs))
             logger.info(f"Found {len(docs)} relevant documents for query: '{query[:50]}...'")
-            return docs
+            return list(docs)
 
         except Exception as e:
             logger.error(f"Error during similarity search: {str(e)}")
             return []
 
     async def similarity_search_with_score(
-        self, query: str, k: int = 3, filter_dict: Optional[Dict[str, Any]] = None
+        self,
+        query: str,
+        k: int = 3,
+        filter_dict: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[tuple]:
         """
         Perform similarity search with relevance scores.
@@ -157,6 +394,7 @@ class VectorStore:
             query: Search query
             k: Number of documents to return
             filter_dict: Optional metadata filters
+            query_embedding: Precomputed embedding of query (see embed_query)
 
         Returns:
             List of (document, score) tuples
@@ -167,11 +405,19 @@ class VectorStore:
                     logger.error("Vector store not available for search")
                     return []
 
-            # Perform similarity search with scores
+            # Perform similarity search with scores off the event loop
+            embedding = query_embedding if query_embedding is not None else await self.embed_query(query)
             if filter_dict:
-                results = self.vectorstore.similarity_search_with_score(query=query, k=k, filter=filter_dict)
+                results = await asyncio.to_thread(
+                    self.vectorstore.similarity_search_by_vector_with_relevance_scores,
+                    embedding=embedding,
+                    k=k,
+                    filter=filter_dict,
+                )
             else:
-                results = self.vectorstore.similarity_search_with_score(query=query, k=k)
+                results = await asyncio.to_thread(
+                    self.vectorstore.similarity_search_by_vector_with_relevance_scores, embedding=embedding, k=k
+                )
 
             logger.info(f"Found {len(results)} scored results for query: '{query[:50]}...'")
             return results
@@ -180,7 +426,9 @@ class VectorStore:
             logger.error(f"Error during similarity search with score: {str(e)}")
             return []
 
-    async def search_by_category(self, query: str, category: str, k: int = 3) -> List[Document]:
+    async def search_by_category(
+        self, query: str, category: str, k: int = 3, query_embedding: Optional[List[float]] = None
+    ) -> List[Document]:
         """
         Search for documents within a specific category.
 
@@ -188,12 +436,13 @@ class VectorStore:
             query: Search query
             category: Category to search within
             k: Number of documents to return
+            query_embedding: Precomputed embedding of query (see embed_query)
 
         Returns:
             List of relevant documents from the specified category
         """
         filter_dict = {"category": category}
-        return await self.similarity_search(query, k, filter_dict)
+        return await self.similarity_search(query, k, filter_dict, query_embedding=query_embedding)
 
     def get_collection_stats(self) -> Dict[str, Any]:
         """
@@ -212,13 +461,15 @@ class VectorStore:
 
             # Get metadata for all documents to analyze categories
             if count > 0:
-                results = collection.get(include=["metadatas"])
-                metadatas = results.get("metadatas", [])
+                categories = self._count_categories_sql(collection, count)
+                if categories is None:
+                    results = collection.get(include=["metadatas"])
+                    metadatas = results.get("metadatas", [])
 
-                categories = {}
-                for metadata in metadatas:
-                    category = metadata.get("category", "unknown")
-                    categories[category] = categories.get(category, 0) + 1
+                    categories = {}
+                    for metadata in metadatas:
+                        category = metadata.get("category", "unknown")
+                        categories[category] = categories.get(category, 0) + 1
 
                 return {
                     "total_documents": count,
@@ -236,6 +487,37 @@ class VectorStore:
             logger.error(f"Error getting collection stats: {str(e)}")
             return {"error": str(e)}
 
+    def _count_categories_sql(self, collection, count: int) -> Optional[Dict[str, int]]:
+        """
+        Count documents per category with one GROUP BY on Chroma's SQLite file.
+
+        Args:
+            collection: Chroma collection to count
+            count: Total number of documents in the collection
+
+        Returns:
+            Category counts, or None if the store is not a local SQLite database with the expected schema
+        """
+        db_path = self.persist_directory / CHROMA_SQLITE_FILENAME
+        if not db_path.exists():
+            return None
+
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                rows = conn.execute(_CATEGORY_COUNTS_SQL, (str(collection.id),)).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            logger.debug(f"Falling back to metadata scan for collection stats: {str(e)}")
+            return None
+
+        categories = {category: total for category, total in rows if category is not None}
+        uncategorized = count - sum(categories.values())
+        if uncategorized > 0:
+            categories["unknown"] = categories.get("unknown", 0) + uncategorized
+        return categories
+
     async def add_documents(self, documents: List[Document]) -> bool:
         """
         Add new documents to existing vector store.
@@ -252,9 +534,12 @@ class VectorStore:
                     # Create new vector store if none exists
                     return await self.create_vectorstore(documents)
 
-            # Add documents to existing vector store
-            self.vectorstore.add_documents(documents)
-            self.vectorstore.persist()
+            # Add documents to existing vector store; Chroma persists writes automatically
+            by_id = self._documents_by_content_id(documents)
+            texts = [doc.page_content for doc in by_id.values()]
+            embeddings = await self._embed_documents(texts)
+            self._add_embedded(list(by_id), texts, [doc.metadata for doc in by_id.values()], embeddings)
+            self._query_cache.clear()
 
             logger.info(f"Added {len(documents)} documents to vector store")
             return True
@@ -274,8 +559,16 @@ class VectorStore:
             if self.persist_directory.exists():
                 import shutil
 
-                shutil.rmtree(self.persist_directory)
+                # Keep the embedding cache so a rebuild of unchanged documents needs no API calls
+                for child in self.persist_directory.iterdir():
+                    if child.name == EMBED_CACHE_FILENAME:
+                        continue
+                    if child.is_dir():
+                        shutil.rmtree(child)
+                    else:
+                        child.unlink()
                 self.vectorstore = None
+                self._query_cache.clear()
                 logger.info("Vector store collection deleted")
                 return True
             return True
@@ -286,7 +579,10 @@ class VectorStore:
 
     async def update_vectorstore(self, documents: List[Document]) -> bool:
         """
-        Update vector store by recreating it with new documents.
+        Update vector store to match a new set of documents.
+
+        Chunks are identified by a hash of their content, so only new chunks are embedded,
+        removed chunks are deleted and unchanged chunks just get their metadata refreshed.
 
         Args:
             documents: New set of documents
@@ -294,8 +590,35 @@ class VectorStore:
         Returns:
             True if successful, False otherwise
         """
-        # Delete existing collection
-        self.delete_collection()
+        try:
+            if not self.vectorstore:
+                if not self.load_vectorstore():
+                    return await self.create_vectorstore(documents)
 
-        # Create new collection with updated documents
-        return await self.create_vectorstore(documents)
+            collection = self.vectorstore._collection
+            by_id = self._documents_by_content_id(documents)
+            existing_ids = set(collection.get(include=[])["ids"])
+
+            stale_ids = list(existing_ids - by_id.keys())
+            kept_ids = [doc_id for doc_id in by_id if doc_id in existing_ids]
+            new_ids = [doc_id for doc_id in by_id if doc_id not in existing_ids]
+
+            for start in range(0, len(stale_ids), EMBED_BATCH_SIZE):
+                collection.delete(ids=stale_ids[start : start + EMBED_BATCH_SIZE])
+
+            for start in range(0, len(kept_ids), EMBED_BATCH_SIZE):
+                batch_ids = kept_ids[start : start + EMBED_BATCH_SIZE]
+                collection.update(ids=batch_ids, metadatas=[by_id[doc_id].metadata for doc_id in batch_ids])
+
+            if new_ids:
+                texts = [by_id[doc_id].page_content for doc_id in new_ids]
+                embeddings = await self._embed_documents(texts)
+                self._add_embedded(new_ids, texts, [by_id[doc_id].metadata for doc_id in new_ids], embeddings)
+
+            self._query_cache.clear()
+            logger.info(f"Vector store updated: {len(new_ids)} added, {len(stale_ids)} removed, {len(kept_ids)} unchanged")
+            return True
+
+        except Exception as e:
+            logger.error(f"Error updating vector store: {str(e)}")
+            return False
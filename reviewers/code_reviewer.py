@@ -5,8 +5,9 @@ Enhanced code reviewer with LangChain and multi-model support
 import asyncio
 import json
 import logging
+import re
 import time
-from typing import Dict
+from typing import AsyncIterator, Dict, List, Optional, Tuple
 
 # LangChain imports
 from langchain_core.messages import HumanMessage, SystemMessage
@@ -17,6 +18,9 @@ from providers.model_registry import ModelRegistry
 
 logger = logging.getLogger(__name__)
 
+_JSON_FENCE_RE = re.compile(r"```json\s*")
+_JSON_DECODER = json.JSONDecoder()
+
 
 class EnhancedCodeReviewer:
     """Enhanced code reviewer with LangChain and multi-model support"""
@@ -24,6 +28,11 @@ class EnhancedCodeReviewer:
     def __init__(self, config_path: str = "models_config.yaml"):
         self.model_registry = ModelRegistry(config_path)
         self.templates = EnhancedPromptTemplates()
+        self._prompts_by_technique = {
+            "zero_shot": self.templates.ZERO_SHOT_PROMPT,
+            "few_shot": self.templates.FEW_SHOT_PROMPT,
+            "cot": self.templates.COT_PROMPT,
+        }
 
     async def review_code_async(
         self,
@@ -44,17 +53,14 @@ class EnhancedCodeReviewer:
             model_config = self.model_registry.models[model_id]
 
             # Create model instance
-            model = self.model_registry.create_model(model_id)
+            model = self.model_registry.get_or_create(model_id)
 
             # Select prompt template
-            if technique == "zero_shot":
-                prompt = self.templates.ZERO_SHOT_REVIEW.format(language=language, code=code)
-            elif technique == "few_shot":
-                prompt = self.templates.FEW_SHOT_REVIEW.format(language=language, code=code)
-            elif technique == "cot":
-                prompt = self.templates.COT_REVIEW.format(language=language, code=code)
-            else:
-                raise ValueError(f"Unknown technique: {technique}")
+            try:
+                template = self._prompts_by_technique[technique]
+            except KeyError:
+                raise ValueError(f"Unknown technique: {technique}") from None
+            prompt = template.render(language=language, code=code)
 
             # Create messages
             messages = [
@@ -89,7 +95,6 @@ class EnhancedCodeReviewer:
                 timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
                 provider=model_config.provider,
                 execution_time=execution_time,
-                technique=technique,  # For backward compatibility
             )
 
         except Exception as e:
@@ -104,7 +109,6 @@ class EnhancedCodeReviewer:
                 timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
                 provider="unknown",
                 execution_time=execution_time,
-                technique=technique,  # For backward compatibility
             )
 
     def review_code(self, *args, **kwargs) -> ReviewResult:
@@ -114,24 +118,12 @@ class EnhancedCodeReviewer:
     def _parse_response(self, response: str) -> Dict:
         """Enhanced response parsing with multiple fallback methods"""
         try:
-            # Method 1: Look for JSON block in code format
-            if "```json" in response:
-                start = response.find("```json") + 7
-                end = response.find("```", start)
-                if end != -1:
-                    json_str = response[start:end].strip()
-                    return json.loads(json_str)
-
-            # Method 2: Find first { to last }
-            json_start = response.find("{")
-            json_end = response.rfind("}") + 1
-            if json_start != -1 and json_end > json_start:
-                json_str = response[json_start:json_end]
-                return json.loads(json_str)
-
-            # Method 3: Try the whole response if it looks like JSON
-            if response.strip().startswith("{"):
-                return json.loads(response.strip())
+            # Method 1: JSON block in code format; Method 2: first object in the text.
+            # raw_decode parses in place from the given offset and stops at the end of the first object
+            fence = _JSON_FENCE_RE.search(response)
+            json_start = fence.end() if fence else response.find("{")
+            if json_start != -1:
+                return _JSON_DECODER.raw_decode(response, json_start)[0]
 
             # Fallback: create structure from response
             return {
@@ -149,48 +141,82 @@ class EnhancedCodeReviewer:
                 "reasoning": f"JSON error: {e}. Response: {response[:200]}...",
             }
 
-    async def compare_models_async(
-        self, code: str, language: str = "python", technique: str = "zero_shot"
-    ) -> Dict[str, ReviewResult]:
-        """Compare multiple models on the same code"""
-        available_models = self.model_registry.get_available_models()
-
-        if not available_models:
+    async def compare_models_stream(
+        self,
+        code: str,
+        language: str = "python",
+        technique: str = "zero_shot",
+        model_ids: Optional[List[str]] = None,
+        max_concurrency: int = 8,
+    ) -> AsyncIterator[Tuple[str, ReviewResult]]:
+        """Review code with several models concurrently, yielding (model_id, result) as each one finishes.
+
+        At most max_concurrency reviews run at once overall, and at most the provider's configured
+        max_concurrency per provider, so one provider's rate limit isn't spent by a burst of calls.
+        Each review is bounded by the model's configured timeout.
+        """
+        if model_ids is None:
+            model_ids = list(self.model_registry.get_available_models())
+
+        if not model_ids:
             logger.warning("No models available for comparison")
-            return {}
-
-        # Create tasks for all available models
-        tasks = []
-        model_ids = []
-
-        for model_id in available_models.keys():
-            task = self.review_code_async(code, language, technique, model_id)
-            tasks.append(task)
-            model_ids.append(model_id)
-
-        # Execute all reviews concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Combine results
-        comparison = {}
-        for model_id, result in zip(model_ids, results):
-            if isinstance(result, Exception):
-                comparison[model_id] = ReviewResult(
-                    issues=[f"Error: {result}"],
+            return
+
+        # Semaphores are created per call: asyncio primitives must not outlive the event loop they run on
+        overall_limit = asyncio.Semaphore(max_concurrency)
+        provider_limits: Dict[str, asyncio.Semaphore] = {}
+
+        def provider_of(model_id: str) -> str:
+            config = self.model_registry.models.get(model_id)
+            return config.provider if config is not None else "unknown"
+
+        for provider in {provider_of(model_id) for model_id in model_ids}:
+            provider_limits[provider] = asyncio.Semaphore(self.model_registry.get_max_concurrency(provider))
+
+        async def review(model_id: str) -> Tuple[str, ReviewResult]:
+            timeout = self.model_registry.get_timeout(model_id)
+            try:
+                async with overall_limit, provider_limits[provider_of(model_id)]:
+                    return model_id, await asyncio.wait_for(
+                        self.review_code_async(code, language, technique, model_id), timeout=timeout
+                    )
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError):
+                    e = TimeoutError(f"Review timed out after {timeout:g}s")
+                return model_id, ReviewResult(
+                    issues=[f"Error: {e}"],
                     suggestions=["Check model configuration"],
                     rating="Error",
-                    reasoning=str(result),
+                    reasoning=str(e),
                     model_used=model_id,
                     technique_used=technique,
                     timestamp=time.strftime("%Y-%m-%d %H:%M:%S"),
                     provider="unknown",
                     execution_time=0.0,
-                    technique=technique,  # For backward compatibility
                 )
-            else:
-                comparison[model_id] = result
 
-        return comparison
+        # Execute all reviews concurrently
+        tasks = [asyncio.create_task(review(model_id)) for model_id in model_ids]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Consumer stopped early: don't leave reviews running in the background
+            for task in tasks:
+                task.cancel()
+
+    async def compare_models_async(
+        self, code: str, language: str = "python", technique: str = "zero_shot"
+    ) -> Dict[str, ReviewResult]:
+        """Compare multiple models on the same code"""
+        model_ids = list(self.model_registry.get_available_models())
+
+        results = {
+            model_id: result async for model_id, result in self.compare_models_stream(code, language, technique, model_ids)
+        }
+
+        # Keep the registry's model order regardless of completion order
+        return {model_id: results[model_id] for model_id in model_ids}
 
     def compare_models(self, *args, **kwargs) -> Dict[str, ReviewResult]:
         """Synchronous wrapper for async model comparison"""
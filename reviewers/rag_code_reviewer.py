@@ -5,22 +5,122 @@ This module extends the EnhancedCodeReviewer with Retrieval-Augmented Generation
 capabilities, using relevant coding guidelines and best practices to enhance reviews.
 """
 
+import asyncio
+import concurrent.futures
+import copy
+import hashlib
 import json
 import logging
 import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
 
-from langchain.prompts import PromptTemplate
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from models.data_models import ReviewResult
-from rag import DocumentLoader, VectorStore
+from prompts import CompiledPrompt
+from rag import DocumentLoader, SemanticCache, VectorStore
 
-from .code_reviewer import EnhancedCodeReviewer
+from .code_reviewer import _JSON_DECODER, _JSON_FENCE_RE, EnhancedCodeReviewer
+from .review_cache import ReviewCache
+
+try:
+    # Optional faster JSON parser; orjson.JSONDecodeError subclasses json.JSONDecodeError
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
 
 logger = logging.getLogger(__name__)
 
+# Opt-in (RAG_SEMANTIC_REVIEW_CACHE=true): near-identical resubmissions (same model, language and
+# guideline count) reuse the earlier RAG review. Off by default, as it costs an extra whole-code
+# embedding per review and a one-line change can still land above the threshold.
+REVIEW_CACHE_SIZE = 256
+REVIEW_CACHE_THRESHOLD = 0.99
+
+# Knowledge base stats only change on (re)initialization; polling within this window reuses a snapshot
+STATS_SNAPSHOT_TTL = 30.0
+
+# Traditional (zero-shot) reviews used as the RAG fallback and comparison baseline, keyed by input hash
+TRADITIONAL_CACHE_SIZE = 256
+
+# Exact resubmissions are also answered from disk, surviving restarts; a TTL of 0 disables this
+# Resolved against the project root, so the store doesn't depend on the working directory
+REVIEW_STORE_PATH = Path(__file__).resolve().parent.parent / "cache" / "review_cache.db"
+DEFAULT_REVIEW_STORE_TTL = 86400.0
+
+# Code markers that steer the guideline search. Matching inside a lookahead reports
+# overlapping markers too, so each one behaves like a plain substring check.
+_CODE_PATTERN_RE = re.compile(
+    r"(?=(?:(?P<secret>(?i:password|secret))|(?P<sql>(?i:select|insert))|(?P<loop_for>for)|(?P<loop_range>range)"
+    r"|(?P<definition>def |class )|(?P<error_handling>try:|except)|(?P<imports>import )))"
+)
+
+# (markers that must all be present, query term), in query order
+_SEARCH_TERMS = (
+    (frozenset({"secret"}), "security authentication"),
+    (frozenset({"loop_for", "loop_range"}), "performance optimization loops"),
+    (frozenset({"definition"}), "function naming conventions"),
+    (frozenset({"error_handling"}), "error handling"),
+    (frozenset({"imports"}), "imports best practices"),
+    (frozenset({"sql"}), "SQL injection security"),
+)
+
+
+def _load_review_json(content: str) -> Dict[str, Any]:
+    """Parse the review object from a model response.
+
+    Bare JSON takes the fast path. Otherwise the object is decoded in place from the ```json fence
+    or first brace, so fenced or prose-wrapped responses parse without slicing out a copy.
+    """
+    try:
+        return _json_loads(content)
+    except json.JSONDecodeError:
+        fence = _JSON_FENCE_RE.search(content)
+        start = fence.end() if fence else content.find("{")
+        if start == -1:
+            raise
+        return _JSON_DECODER.raw_decode(content, start)[0]
+
+
+# (whole second, "YYYY-MM-DDTHH:MM:SS" local-time prefix) of the last timestamp produced
+_iso_second: Tuple[int, str] = (-1, "")
+
+
+def _now_iso() -> str:
+    """Equivalent of datetime.now().isoformat() that only rebuilds the date/time part once per second"""
+    global _iso_second
+    now = time.time()
+    second = int(now)
+    cached_second, prefix = _iso_second
+    if second != cached_second:
+        prefix = datetime.fromtimestamp(second).isoformat()
+        _iso_second = (second, prefix)
+    micros = int((now - second) * 1_000_000)
+    return f"{prefix}.{micros:06d}" if micros else prefix
+
+
+def _intern(value: Any) -> Any:
+    """Intern short enum-like strings so long-lived reviews share one copy of each"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _intern_enum_fields(items: Any, field_names: Tuple[str, ...]) -> Any:
+    """Intern the given enum-like fields of each issue/suggestion dict in place"""
+    if isinstance(items, list):
+        for item in items:
+            if isinstance(item, dict):
+                for name in field_names:
+                    if name in item:
+                        item[name] = _intern(item[name])
+    return items
+
 
 class RAGCodeReviewer(EnhancedCodeReviewer):
     """Enhanced code reviewer with RAG capabilities for knowledge-aware reviews."""
@@ -33,8 +133,22 @@ class RAGCodeReviewer(EnhancedCodeReviewer):
         self.document_loader = DocumentLoader()
         self.vector_store = VectorStore()
 
-        # Track initialization status
+        # Track initialization status. Requests run on separate threads and event loops, so a
+        # first-time initialization is shared through a thread-safe future rather than an asyncio.Lock.
         self.rag_initialized = False
+        self._init_guard = threading.Lock()
+        self._init_future: Optional[concurrent.futures.Future] = None
+        self._review_cache: Optional[SemanticCache[ReviewResult]] = None
+        if os.getenv("RAG_SEMANTIC_REVIEW_CACHE", "false").lower() == "true":
+            self._review_cache = SemanticCache(REVIEW_CACHE_SIZE, REVIEW_CACHE_THRESHOLD)
+        review_store_ttl = float(os.getenv("RAG_REVIEW_CACHE_TTL", DEFAULT_REVIEW_STORE_TTL))
+        self._review_store = ReviewCache(REVIEW_STORE_PATH, review_store_ttl) if review_store_ttl > 0 else None
+        self._traditional_cache: "OrderedDict[str, ReviewResult]" = OrderedDict()
+        # Traditional reviews still running, so concurrent callers (e.g. a comparison whose RAG half
+        # falls back) await the same LLM call. Thread-safe futures, as requests run on separate loops.
+        self._traditional_pending: Dict[str, concurrent.futures.Future] = {}
+        self._traditional_lock = threading.Lock()
+        self._stats_snapshot: Optional[Tuple[float, Dict[str, Any]]] = None
         self.setup_rag_chain()
 
         logger.info("RAGCodeReviewer initialized")
@@ -42,37 +156,30 @@ class RAGCodeReviewer(EnhancedCodeReviewer):
     def setup_rag_chain(self):
         """Setup the RAG chain with enhanced prompts."""
 
-        # RAG-enhanced prompt template
-        self.rag_template = """
-You are an expert code reviewer with access to comprehensive coding guidelines and best practices.
+        # Invariant instructions go in the system message so every review shares the same prompt prefix,
+        # which providers with prompt caching can reuse instead of re-processing it
+        self.rag_system_prompt = """You are an expert code reviewer with access to comprehensive coding guidelines and best practices.
 
-RELEVANT CODING GUIDELINES:
-{context}
+You will receive relevant coding guidelines followed by the code to review.
+Based on those coding guidelines, provide a comprehensive code review following this exact JSON format:
 
-CODE TO REVIEW:
-```{language}
-{code}
-```
-
-Based on the coding guidelines above, provide a comprehensive code review following this exact JSON format:
-
-{{
+{
     "issues": [
-        {{
+        {
             "type": "security|performance|style|maintainability|bug",
             "severity": "critical|high|medium|low",
             "description": "Detailed description of the issue",
             "line_reference": "Specific line or function if applicable",
             "guideline_reference": "Which guideline from the context this violates"
-        }}
+        }
     ],
     "suggestions": [
-        {{
+        {
             "type": "improvement|best_practice|optimization",
             "description": "Actionable improvement suggestion",
             "code_example": "Improved code example if applicable",
             "guideline_reference": "Which guideline supports this suggestion"
-        }}
+        }
     ],
     "rating": "Excellent|Good|Fair|Poor",
     "reasoning": "Detailed explanation of the rating based on the guidelines",
@@ -80,13 +187,29 @@ Based on the coding guidelines above, provide a comprehensive code review follow
         "List of specific guidelines referenced from the context"
     ],
     "rag_context_quality": "high|medium|low"
-}}
+}
 
 Focus on issues and improvements that are specifically supported by the provided guidelines.
 If the code follows best practices mentioned in the guidelines, acknowledge this in your review.
 """
 
-        self.rag_prompt = PromptTemplate(template=self.rag_template, input_variables=["context", "code", "language"])
+        # RAG-enhanced prompt template: only the per-review parts
+        self.rag_template = """
+RELEVANT CODING GUIDELINES:
+{context}
+
+CODE TO REVIEW:
+```{language}
+{code}
+```
+"""
+
+        self.rag_prompt = CompiledPrompt(self.rag_template)
+        self._rag_system_message = SystemMessage(content=self.rag_system_prompt)
+        # Anthropic only caches a prefix that is explicitly marked
+        self._rag_system_message_cached = SystemMessage(
+            content=[{"type": "text", "text": self.rag_system_prompt, "cache_control": {"type": "ephemeral"}}]
+        )
 
         logger.info("RAG chain setup completed")
 
@@ -103,29 +226,51 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
             # Try to load existing vector store first
             if self.vector_store.load_vectorstore():
                 self.rag_initialized = True
+                self._stats_snapshot = None
                 logger.info("Loaded existing vector store")
                 return True
 
-            # If no existing vector store, create one from documents
-            documents = await self.document_loader.load_and_chunk()
-            if not documents:
-                logger.warning("No documents found in knowledge base")
-                return False
-
-            # Create vector store
-            success = await self.vector_store.create_vectorstore(documents)
-            if success:
+            # If no existing vector store, create one from documents, embedding batches as they are loaded
+            num_chunks = await self.vector_store.create_vectorstore_streaming(self.document_loader.iter_chunk_batches())
+            if num_chunks:
                 self.rag_initialized = True
-                logger.info(f"RAG initialized with {len(documents)} document chunks")
+                self._stats_snapshot = None
+                logger.info(f"RAG initialized with {num_chunks} document chunks")
                 return True
             else:
-                logger.error("Failed to create vector store")
+                logger.error("Failed to create vector store from knowledge base")
                 return False
 
         except Exception as e:
             logger.error(f"Error initializing RAG: {str(e)}")
             return False
 
+    async def _ensure_rag_initialized(self) -> bool:
+        """Initialize RAG once, letting concurrent callers wait on the initialization already in flight"""
+        if self.rag_initialized:
+            return True
+
+        with self._init_guard:
+            if self.rag_initialized:
+                return True
+            pending = self._init_future
+            owner = pending is None
+            if owner:
+                pending = self._init_future = concurrent.futures.Future()
+
+        if not owner:
+            # shield keeps a cancelled waiter from cancelling the shared future
+            return await asyncio.shield(asyncio.wrap_future(pending))
+
+        success = False
+        try:
+            success = await self.initialize_rag()
+            return success
+        finally:
+            with self._init_guard:
+                self._init_future = None
+            pending.set_result(success)
+
     async def review_code_with_rag(
         self,
         code: str,
@@ -147,39 +292,61 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
         """
         try:
             # Ensure RAG is initialized
-            if not self.rag_initialized:
-                if not await self.initialize_rag():
-                    logger.warning("RAG not available, falling back to traditional review")
-                    return await self.review_code_async(code, language, "zero_shot", model_id)
+            if not await self._ensure_rag_initialized():
+                logger.warning("RAG not available, falling back to traditional review")
+                return await self._traditional_review(code, language, model_id)
+
+            # Serve identical resubmissions from the persistent review store
+            cache_key = (model_id or "gpt-4", language, num_guidelines)
+            store_key = ReviewCache.make_key(code, *cache_key, "rag")
+            if self._review_store is not None:
+                stored = await asyncio.to_thread(self._review_store.get, store_key)
+                if stored is not None:
+                    logger.info("RAG review served from review store")
+                    return stored
+
+            # Serve near-identical resubmissions from the semantic review cache, when enabled
+            code_embedding = None
+            if self._review_cache is not None:
+                code_embedding = await self.vector_store.embed_query(f"{language}\n{code}")
+                cached = self._review_cache.lookup(cache_key, code_embedding)
+                if cached is not None:
+                    logger.info("RAG review served from semantic cache")
+                    return copy.deepcopy(cached)
 
             # Create search query based on code content and language
             search_query = self._create_search_query(code, language)
 
-            # Retrieve relevant guidelines
-            relevant_docs = await self.vector_store.similarity_search(search_query, k=num_guidelines)
+            # Retrieve relevant guidelines while the model is fetched or instantiated. Retrieval is
+            # scheduled first, so it is already waiting on its worker threads when the model is built.
+            relevant_docs, model = await asyncio.gather(
+                self._retrieve_guidelines(search_query, num_guidelines),
+                self._get_model(model_id or "gpt-4"),
+            )
 
             if not relevant_docs:
                 logger.warning("No relevant guidelines found, falling back to traditional review")
-                return await self.review_code_async(code, language, "zero_shot", model_id)
+                return await self._traditional_review(code, language, model_id)
 
             # Build context from retrieved documents
             context = self._build_context(relevant_docs)
 
             # Create RAG-enhanced prompt
-            enhanced_prompt = self.rag_prompt.format(context=context, code=code, language=language)
+            enhanced_prompt = self.rag_prompt.render(context=context, code=code, language=language)
 
-            # Get model and perform review
-            model = self.model_registry.create_model(model_id or "gpt-4")
-
-            messages = [
-                SystemMessage(content="You are an expert code reviewer with access to comprehensive coding guidelines."),
-                HumanMessage(content=enhanced_prompt),
-            ]
+            # Perform review
+            messages = [self._system_message_for(model_id or "gpt-4"), HumanMessage(content=enhanced_prompt)]
 
             response = await model.ainvoke(messages)
 
             # Parse and enhance the result
             result = self._parse_rag_review_result(response.content, model_id, relevant_docs)
+            # Unparseable responses come back rated "Error" and must not be served to later submissions
+            if result.rating != "Error":
+                if self._review_cache is not None:
+                    self._review_cache.store(cache_key, code_embedding, copy.deepcopy(result))
+                if self._review_store is not None:
+                    await asyncio.to_thread(self._review_store.put, store_key, result)
 
             logger.info(f"RAG review completed using {len(relevant_docs)} guidelines")
             return result
@@ -187,7 +354,58 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
         except Exception as e:
             logger.error(f"Error in RAG review: {str(e)}")
             # Fallback to traditional review
-            return await self.review_code_async(code, language, "zero_shot", model_id)
+            return await self._traditional_review(code, language, model_id)
+
+    async def _traditional_review(self, code: str, language: str, model_id: Optional[str]) -> ReviewResult:
+        """Zero-shot review without RAG, memoized so fallbacks and comparisons don't repeat the LLM call"""
+        model_id = model_id or "gpt-4"
+        key = hashlib.blake2b(f"{model_id}|{language}|zero_shot|{code}".encode("utf-8"), digest_size=16).hexdigest()
+        with self._traditional_lock:
+            cached = self._traditional_cache.get(key)
+            if cached is not None:
+                self._traditional_cache.move_to_end(key)
+            pending = self._traditional_pending.get(key)
+            running = cached is None and pending is not None
+            if cached is None and pending is None:
+                pending = self._traditional_pending[key] = concurrent.futures.Future()
+        if cached is not None:
+            return copy.deepcopy(cached)
+        if running:
+            return copy.deepcopy(await asyncio.wrap_future(pending))
+
+        try:
+            result = await self.review_code_async(code, language, "zero_shot", model_id)
+        except BaseException as e:
+            with self._traditional_lock:
+                del self._traditional_pending[key]
+            pending.set_exception(e)
+            raise
+
+        snapshot = copy.deepcopy(result)
+        with self._traditional_lock:
+            del self._traditional_pending[key]
+            if result.rating != "Error":
+                self._traditional_cache[key] = snapshot
+                if len(self._traditional_cache) > TRADITIONAL_CACHE_SIZE:
+                    self._traditional_cache.popitem(last=False)
+        pending.set_result(snapshot)
+        return result
+
+    async def _retrieve_guidelines(self, search_query: str, k: int) -> List:
+        """Embed the search query (memoized by the store) and fetch the k closest guidelines"""
+        query_embedding = await self.vector_store.embed_query(search_query)
+        return await self.vector_store.similarity_search(search_query, k=k, query_embedding=query_embedding)
+
+    def _system_message_for(self, model_id: str) -> SystemMessage:
+        """Return the RAG system message, marked for prompt caching where the provider needs it"""
+        config = self.model_registry.models.get(model_id)
+        if config is not None and config.provider == "anthropic":
+            return self._rag_system_message_cached
+        return self._rag_system_message
+
+    async def _get_model(self, model_id: str):
+        """Return the model for this event loop; runs on the loop thread, as get_or_create requires"""
+        return self.model_registry.get_or_create(model_id)
 
     def _create_search_query(self, code: str, language: str) -> str:
         """
@@ -200,27 +418,13 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
         Returns:
             Search query string
         """
-        # Extract key terms and patterns from code
-        query_terms = [language]
-
-        # Add common patterns found in code
-        if "password" in code.lower() or "secret" in code.lower():
-            query_terms.append("security authentication")
-
-        if "for" in code and "range" in code:
-            query_terms.append("performance optimization loops")
+        # Extract key terms and patterns from code in a single scan
+        found = {match.lastgroup for match in _CODE_PATTERN_RE.finditer(code)}
 
-        if "def " in code or "class " in code:
-            query_terms.append("function naming conventions")
-
-        if "try:" in code or "except" in code:
-            query_terms.append("error handling")
-
-        if "import " in code:
-            query_terms.append("imports best practices")
-
-        if "SELECT" in code.upper() or "INSERT" in code.upper():
-            query_terms.append("SQL injection security")
+        query_terms = [language]
+        for required, term in _SEARCH_TERMS:
+            if required <= found:
+                query_terms.append(term)
 
         # Create comprehensive search query
         search_query = f"{language} code review best practices " + " ".join(query_terms)
@@ -237,19 +441,10 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
         Returns:
             Formatted context string
         """
-        context_parts = []
-
-        for i, doc in enumerate(documents, 1):
-            # Get document metadata
-            metadata = doc.metadata
-            category = metadata.get("category", "general")
-            title = metadata.get("title", "Guidelines")
-
-            # Format document content
-            context_part = f"## Guideline {i}: {title} ({category})\n{doc.page_content}\n"
-            context_parts.append(context_part)
-
-        return "\n".join(context_parts)
+        return "\n".join(
+            f"## Guideline {i}: {metadata.get('title', 'Guidelines')} ({metadata.get('category', 'general')})\n{content}\n"
+            for i, (metadata, content) in enumerate(((doc.metadata, doc.page_content) for doc in documents), 1)
+        )
 
     def _parse_rag_review_result(self, response_content: str, model_id: str, relevant_docs: List) -> ReviewResult:
         """
@@ -261,29 +456,27 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
             relevant_docs: Documents used for context
 
         Returns:
-            Enhanced ReviewResult
+            Enhanced ReviewResult, rated "Error" if the response could not be parsed
         """
         try:
             # Parse JSON response
-            review_data = json.loads(response_content)
+            review_data = _load_review_json(response_content)
 
-            # Create base result
+            # Create result with RAG-specific metadata
             result = ReviewResult(
-                rating=review_data.get("rating", "Fair"),
-                issues=review_data.get("issues", []),
-                suggestions=review_data.get("suggestions", []),
+                rating=_intern(review_data.get("rating", "Fair")),
+                issues=_intern_enum_fields(review_data.get("issues", []), ("type", "severity")),
+                suggestions=_intern_enum_fields(review_data.get("suggestions", []), ("type",)),
                 reasoning=review_data.get("reasoning", ""),
                 model_used=model_id,
                 technique_used="rag",
-                timestamp=datetime.now().isoformat(),
+                timestamp=_now_iso(),
+                guidelines_used=review_data.get("guidelines_used", []),
+                rag_context_quality=_intern(review_data.get("rag_context_quality", "medium")),
+                num_guidelines=len(relevant_docs),
+                guideline_categories=list(set(doc.metadata.get("category", "general") for doc in relevant_docs)),
             )
 
-            # Add RAG-specific metadata
-            result.guidelines_used = review_data.get("guidelines_used", [])
-            result.rag_context_quality = review_data.get("rag_context_quality", "medium")
-            result.num_guidelines = len(relevant_docs)
-            result.guideline_categories = list(set(doc.metadata.get("category", "general") for doc in relevant_docs))
-
             return result
 
         except json.JSONDecodeError as e:
@@ -291,7 +484,7 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
 
             # Fallback parsing
             return ReviewResult(
-                rating="Fair",
+                rating="Error",
                 issues=[
                     {
                         "description": "Failed to parse detailed review",
@@ -302,7 +495,7 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
                 reasoning="Error parsing enhanced review response",
                 model_used=model_id,
                 technique_used="rag",
-                timestamp=datetime.now().isoformat(),
+                timestamp=_now_iso(),
             )
 
     async def compare_rag_vs_traditional(self, code: str, language: str = "python", model_id: str = None) -> Dict[str, Any]:
@@ -318,14 +511,33 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
             Comparison results
         """
         try:
-            # Perform both types of reviews
-            traditional_result = await self.review_code_async(code, language, "zero_shot", model_id)
-            rag_result = await self.review_code_with_rag(code, language, model_id)
+            # Perform both types of reviews concurrently; neither depends on the other
+            traditional_result, rag_result = await asyncio.gather(
+                self._traditional_review(code, language, model_id),
+                self.review_code_with_rag(code, language, model_id),
+                return_exceptions=True,
+            )
+
+            traditional_failed = isinstance(traditional_result, Exception)
+            rag_failed = isinstance(rag_result, Exception)
+            if traditional_failed and rag_failed:
+                raise rag_result
+            if traditional_failed or rag_failed:
+                # Keep whichever review succeeded so the caller still gets partial data
+                failed_name, error = (
+                    ("traditional_review", traditional_result) if traditional_failed else ("rag_enhanced_review", rag_result)
+                )
+                logger.error(f"Comparison {failed_name} failed: {str(error)}")
+                return {
+                    "traditional_review": None if traditional_failed else traditional_result.to_dict(),
+                    "rag_enhanced_review": None if rag_failed else rag_result.to_dict(),
+                    "error": f"{failed_name} failed: {str(error)}",
+                }
 
             # Calculate comparison metrics
             comparison = {
-                "traditional_review": traditional_result.__dict__,
-                "rag_enhanced_review": rag_result.__dict__,
+                "traditional_review": traditional_result.to_dict(),
+                "rag_enhanced_review": rag_result.to_dict(),
                 "comparison": {
                     "guidelines_referenced": getattr(rag_result, "num_guidelines", 0),
                     "context_quality": getattr(rag_result, "rag_context_quality", "none"),
@@ -355,8 +567,7 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
             List of matching guidelines with metadata
         """
         try:
-            if not self.rag_initialized:
-                await self.initialize_rag()
+            await self._ensure_rag_initialized()
 
             if category:
                 docs = await self.vector_store.search_by_category(query, category, k)
@@ -388,14 +599,17 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
             Knowledge base statistics
         """
         try:
-            stats = self.vector_store.get_collection_stats()
-            categories = self.document_loader.get_categories()
+            snapshot = self._stats_snapshot
+            if snapshot is None or time.monotonic() - snapshot[0] >= STATS_SNAPSHOT_TTL:
+                stats = self.vector_store.get_collection_stats()
+                snapshot = (
+                    time.monotonic(),
+                    {"vector_store_stats": stats, "available_categories": self.document_loader.get_categories()},
+                )
+                if "error" not in stats:
+                    self._stats_snapshot = snapshot
 
-            return {
-                "vector_store_stats": stats,
-                "available_categories": categories,
-                "rag_initialized": self.rag_initialized,
-            }
+            return {**copy.deepcopy(snapshot[1]), "rag_initialized": self.rag_initialized}
 
         except Exception as e:
             logger.error(f"Error getting knowledge base stats: {str(e)}")
@@ -417,8 +631,13 @@ If the code follows best practices mentioned in the guidelines, acknowledge this
                 logger.warning("No documents found for refresh")
                 return False
 
-            # Update vector store
+            # Update vector store; cached reviews were grounded in the old guidelines
             success = await self.vector_store.update_vectorstore(documents)
+            if self._review_cache is not None:
+                self._review_cache.clear()
+            self._stats_snapshot = None
+            if self._review_store is not None:
+                await asyncio.to_thread(self._review_store.clear)
             if success:
                 self.rag_initialized = True
                 logger.info(f"Knowledge base refreshed with {len(documents)} document chunks")
@@ -0,0 +1,93 @@
+"""
+Persistent review cache.
+
+Finished reviews are stored in SQLite keyed by SHA-256 of the code, language,
+model and review settings, so an identical submission is answered from disk
+even after a server restart.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+from models.data_models import ReviewResult
+
+logger = logging.getLogger(__name__)
+
+
+class ReviewCache:
+    """SQLite-backed store of ReviewResults with a time-to-live."""
+
+    def __init__(self, db_path: Path, ttl: float = 86400.0):
+        """
+        Initialize the review cache.
+
+        Args:
+            db_path: SQLite file holding the cached reviews
+            ttl: Seconds a cached review stays valid
+        """
+        self.db_path = Path(db_path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        """Open the cache database on first use"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+            # WAL lets other worker processes read while one of them writes
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS reviews (hash TEXT PRIMARY KEY, result TEXT NOT NULL, ts REAL NOT NULL)"
+            )
+            self._conn.commit()
+        return self._conn
+
+    @staticmethod
+    def make_key(*parts: object) -> str:
+        """Hash the parts that determine a review into a cache key"""
+        return hashlib.sha256("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[ReviewResult]:
+        """Return the cached review for key if present and not expired"""
+        with self._lock:
+            row = (
+                self._connection()
+                .execute("SELECT result FROM reviews WHERE hash = ? AND ts > ?", (key, time.time() - self.ttl))
+                .fetchone()
+            )
+        if row is None:
+            return None
+        try:
+            return ReviewResult(**json.loads(row[0]))
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cached review: {str(e)}")
+            return None
+
+    def put(self, key: str, result: ReviewResult):
+        """Store a review under key"""
+        payload = json.dumps(result.to_dict(), default=str)
+        with self._lock:
+            conn = self._connection()
+            conn.execute("INSERT OR REPLACE INTO reviews (hash, result, ts) VALUES (?, ?, ?)", (key, payload, time.time()))
+            conn.commit()
+
+    def clear(self):
+        """Drop all cached reviews"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute("DELETE FROM reviews")
+            conn.commit()
+
+    def close(self):
+        """Close the cache database"""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -2,17 +2,21 @@
 Pytest configuration and fixtures for Smart Code Reviewer tests
 """
 
+import asyncio
 import os
 import sys
-import tempfile
+from contextlib import contextmanager
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Dict
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, create_autospec
 
 import pytest
 
-# Add the project root to the Python path
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Add the project root to the Python path once for the whole session; test modules rely on it
+PROJECT_ROOT = str(Path(__file__).parent.parent)
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
 
 # Test environment variables
 TEST_ENV_VARS = {
@@ -26,6 +30,15 @@ TEST_ENV_VARS = {
 }
 
 
+def pytest_addoption(parser):
+    parser.addoption(
+        "--refresh-embed-cache",
+        action="store_true",
+        default=False,
+        help="Clear the on-disk RAG embedding cache before integration tests so embeddings are recomputed",
+    )
+
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_test_environment():
     """Set up test environment variables"""
@@ -47,10 +60,9 @@ def setup_test_environment():
 
 
 @pytest.fixture
-def temp_dir():
-    """Create a temporary directory for tests"""
-    with tempfile.TemporaryDirectory() as tmp_dir:
-        yield Path(tmp_dir)
+def temp_dir(tmp_path):
+    """Temporary directory for tests (pytest's tmp_path, under the session's base temp dir)"""
+    return tmp_path
 
 
 @pytest.fixture
@@ -94,15 +106,19 @@ API_KEY = "sk-1234567890abcdef"
 """
 
 
-@pytest.fixture
+# Models reported as available by the mocked registries
+AVAILABLE_MODELS = {
+    "gpt-4": "OpenAI GPT-4",
+    "gpt-3.5-turbo": "OpenAI GPT-3.5 Turbo",
+    "claude-3-sonnet": "Anthropic Claude 3 Sonnet",
+}
+
+
+@pytest.fixture(scope="module")
 def mock_model_registry():
-    """Mock model registry for testing"""
+    """Mock model registry for testing, shared by a module's tests; treat it as read-only"""
     mock_registry = Mock()
-    mock_registry.get_available_models.return_value = {
-        "gpt-4": "OpenAI GPT-4",
-        "gpt-3.5-turbo": "OpenAI GPT-3.5 Turbo",
-        "claude-3-sonnet": "Anthropic Claude 3 Sonnet",
-    }
+    mock_registry.get_available_models.return_value = dict(AVAILABLE_MODELS)
     mock_registry.create_model.return_value = Mock()
     return mock_registry
 
@@ -139,9 +155,9 @@ def mock_document_loader():
     return mock_loader
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_review_result():
-    """Sample review result for testing"""
+    """Sample review result for testing, shared across the session (ReviewResult is frozen)"""
     from datetime import datetime
 
     from models.data_models import ReviewResult
@@ -150,7 +166,6 @@ def sample_review_result():
         rating=3,
         model_used="gpt-4",
         provider="openai",
-        technique="zero_shot",
         execution_time=1.5,
         issues=[
             "Potential division by zero in divide function",
@@ -168,19 +183,123 @@ def sample_review_result():
     )
 
 
-@pytest.fixture
-def flask_test_client():
-    """Flask test client for API testing"""
+@pytest.fixture(scope="session")
+def _flask_app(setup_test_environment):
+    """Flask app configured for testing, imported once per session.
+
+    Importing app builds the reviewers and the agent, which dominates API test setup. Tests
+    patch attributes on the imported app module, so sharing it across tests is safe.
+    """
     from app import app
 
     app.config["TESTING"] = True
     app.config["WTF_CSRF_ENABLED"] = False
+    return app
+
 
-    with app.test_client() as client:
-        with app.app_context():
+@pytest.fixture(scope="session")
+def endpoint_event_loop():
+    """One event loop for the session, handed to endpoints instead of a new loop per request"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest.fixture
+def flask_test_client(_flask_app, endpoint_event_loop, monkeypatch):
+    """Flask test client for API testing; endpoints run their coroutines on endpoint_event_loop"""
+
+    @contextmanager
+    def shared_event_loop():
+        asyncio.set_event_loop(endpoint_event_loop)
+        yield endpoint_event_loop
+
+    monkeypatch.setattr("app._event_loop", shared_event_loop)
+    with _flask_app.test_client() as client:
+        with _flask_app.app_context():
             yield client
 
 
+@pytest.fixture(scope="session")
+def _reviewer_spec():
+    """Autospec'd EnhancedCodeReviewer, built once per session"""
+    from reviewers import EnhancedCodeReviewer
+
+    return create_autospec(EnhancedCodeReviewer, instance=True)
+
+
+@pytest.fixture(scope="session")
+def _rag_reviewer_spec():
+    """Autospec'd RAGCodeReviewer, built once per session"""
+    from reviewers import RAGCodeReviewer
+
+    return create_autospec(RAGCodeReviewer, instance=True)
+
+
+@pytest.fixture(scope="session")
+def _code_agent_spec():
+    """Autospec'd CodeReviewAgent, built once per session"""
+    from agents import CodeReviewAgent
+
+    return create_autospec(CodeReviewAgent, instance=True)
+
+
+def _fresh_mock(spec_mock):
+    """Clear calls, return values and side effects left on a shared mock by the previous test.
+
+    Resetting keeps the autospec'd attribute tree; a copy.copy would share it instead and leak
+    configured children between tests.
+    """
+    spec_mock.reset_mock(return_value=True, side_effect=True)
+    return spec_mock
+
+
+@pytest.fixture
+def reviewer_mock(_flask_app, _reviewer_spec, monkeypatch):
+    """Autospec'd mock installed as app.reviewer.
+
+    Its model registry is a plain stub listing AVAILABLE_MODELS; tests that need other models
+    or a failure assign their own function to model_registry.get_available_models.
+    """
+    reviewer = _fresh_mock(_reviewer_spec)
+    reviewer.model_registry = SimpleNamespace(get_available_models=lambda: dict(AVAILABLE_MODELS))
+    monkeypatch.setattr("app.reviewer", reviewer)
+    return reviewer
+
+
+@pytest.fixture
+def rag_reviewer_mock(_flask_app, _rag_reviewer_spec, monkeypatch):
+    """Autospec'd mock installed as app.rag_reviewer"""
+    rag_reviewer = _fresh_mock(_rag_reviewer_spec)
+    monkeypatch.setattr("app.rag_reviewer", rag_reviewer)
+    return rag_reviewer
+
+
+@pytest.fixture
+def code_agent_mock(_flask_app, _code_agent_spec, monkeypatch):
+    """Autospec'd mock installed as app.code_agent"""
+    code_agent = _fresh_mock(_code_agent_spec)
+    monkeypatch.setattr("app.code_agent", code_agent)
+    return code_agent
+
+
+@pytest.fixture
+def patch_app(reviewer_mock, rag_reviewer_mock, code_agent_mock):
+    """Factory setting what a mocked app collaborator method returns.
+
+    Targets are "<collaborator>.<method>" paths such as "rag_reviewer.review_code_with_rag".
+    The result is set as the autospec'd method's return_value, so async methods still
+    return an awaitable resolving to it.
+    """
+    collaborators = {"reviewer": reviewer_mock, "rag_reviewer": rag_reviewer_mock, "code_agent": code_agent_mock}
+
+    def _patch(target: str, result: Any):
+        collaborator, attribute = target.split(".", 1)
+        getattr(collaborators[collaborator], attribute).return_value = result
+
+    return _patch
+
+
 @pytest.fixture
 def mock_openai_response():
     """Mock OpenAI API response"""
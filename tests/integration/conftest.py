@@ -0,0 +1,75 @@
+"""
+Shared fixtures for integration tests
+"""
+
+import asyncio
+
+import pytest
+from filelock import FileLock
+from langchain_core.language_models.fake_chat_models import FakeListChatModel
+
+from rag import EmbeddingCache, VectorStore
+from reviewers.rag_code_reviewer import RAGCodeReviewer
+
+
+@pytest.fixture(scope="session", autouse=True)
+def refresh_embed_cache(request):
+    """Honor --refresh-embed-cache.
+
+    Knowledge base chunks and test snippets are otherwise embedded once and then served from
+    the SHA-256 keyed on-disk cache (chroma_db/embed_cache.db) on every later run.
+    """
+    if request.config.getoption("--refresh-embed-cache"):
+        embeddings = VectorStore().embeddings
+        if isinstance(embeddings, EmbeddingCache):
+            embeddings.clear()
+
+
+@pytest.fixture(scope="module")
+def vcr_config(pytestconfig):
+    """pytest-recording settings for tests marked vcr.
+
+    Cassettes live in tests/integration/cassettes/; API keys never reach them. Requests match on
+    their body too, so a changed prompt, snippet or model records a new interaction.
+
+    No cassettes are committed, so a run without --record-mode (pytest-recording's default is
+    "none") records missing cassettes once instead of failing every recorded call.
+    """
+    record_mode = pytestconfig.getoption("--record-mode", default=None)
+    return {
+        "filter_headers": ["authorization", "x-api-key", "x-goog-api-key"],
+        "match_on": ["method", "scheme", "host", "path", "body"],
+        "record_mode": record_mode if record_mode not in (None, "none") else "once",
+    }
+
+
+@pytest.fixture(scope="session")
+def rag_reviewer(tmp_path_factory):
+    """One RAG reviewer per test session (per worker under pytest-xdist), initialized once.
+
+    Initialization loads the knowledge base and vector store, which is by far the slowest
+    part of the RAG tests. The reviewer keeps no event-loop-bound state, so initializing it
+    on a throwaway loop here is safe for async tests running on their own loops.
+
+    Workers initialize under a lock in the temp root they share, so only the first one builds
+    the persisted Chroma index; the rest wait and then just load it from disk. The persistent
+    review store is disabled, so every run performs its reviews instead of replaying stored ones.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("RAG_REVIEW_CACHE_TTL", "0")
+        reviewer = RAGCodeReviewer()
+    with FileLock(str(tmp_path_factory.getbasetemp().parent / "rag_index.lock")):
+        asyncio.run(reviewer.initialize_rag())
+    return reviewer
+
+
+@pytest.fixture
+def mock_llm():
+    """Chat model replaying one canned analyze -> reason -> synthesize pass of the agent workflow"""
+    return FakeListChatModel(
+        responses=[
+            "The code is a small Python module; a RAG-enhanced review focused on security and style fits best.",
+            "REASONING: The request is simple and the analysis already covers it.\nACTION: synthesize",
+            "## Code Review Report\n\nNo critical issues found. Consider adding type hints and docstrings.",
+        ]
+    )
@@ -13,8 +13,9 @@ from pathlib import Path
 
 import pytest
 
-# Add the parent directory to the path so we can import our modules
-sys.path.append(str(Path(__file__).parent.parent))
+# conftest.py puts the project root on the path under pytest; standalone runs add it here
+if __name__ == "__main__":
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from agents import CodeReviewAgent, CodeReviewRequest
 from agents.tools import AgentTools
@@ -63,64 +64,85 @@ def authenticate(username, password):
 
 @pytest.mark.asyncio
 @pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.vcr
 async def test_agent_tools():
     """Test the agent tools functionality."""
     print("🔧 Testing Agent Tools...")
 
     tools = AgentTools()
 
-    # Test RAG code review tool
-    print("Testing RAG code review tool...")
-    from agents.tools import rag_code_review
+    from agents.tools import get_knowledge_base_stats, rag_code_review, search_guidelines, traditional_code_review
 
-    result = rag_code_review.invoke({"code": SIMPLE_PYTHON_CODE, "language": "python", "model_id": "gpt-4"})
-    print(f"✅ RAG review result: {len(result)} characters")
-    assert len(result) > 0, "RAG code review should return non-empty result"
+    # The tools are independent, so invoke them concurrently; ainvoke runs each sync tool in a worker thread
+    print("Testing RAG review, traditional review, guidelines search and knowledge base stats tools...")
+    rag_result, traditional_result, search_result, stats_result = await asyncio.gather(
+        rag_code_review.ainvoke({"code": SIMPLE_PYTHON_CODE, "language": "python", "model_id": "gpt-4"}),
+        traditional_code_review.ainvoke({"code": SIMPLE_PYTHON_CODE, "language": "python", "model_id": "gpt-4"}),
+        search_guidelines.ainvoke({"query": "python security best practices", "k": 3}),
+        get_knowledge_base_stats.ainvoke({}),
+    )
 
-    # Test traditional code review tool
-    print("Testing traditional code review tool...")
-    from agents.tools import traditional_code_review
+    # Test RAG code review tool
+    print(f"✅ RAG review result: {len(rag_result)} characters")
+    assert rag_result, "RAG code review should return non-empty result"
 
-    result = traditional_code_review.invoke({"code": SIMPLE_PYTHON_CODE, "language": "python", "model_id": "gpt-4"})
-    print(f"✅ Traditional review result: {len(result)} characters")
-    assert len(result) > 0, "Traditional code review should return non-empty result"
+    # Test traditional code review tool
+    print(f"✅ Traditional review result: {len(traditional_result)} characters")
+    assert traditional_result, "Traditional code review should return non-empty result"
 
     # Test guidelines search
-    print("Testing guidelines search...")
-    from agents.tools import search_guidelines
-
-    result = search_guidelines.invoke({"query": "python security best practices", "k": 3})
-    print(f"✅ Guidelines search result: {len(result)} characters")
-    assert len(result) > 0, "Guidelines search should return non-empty result"
+    print(f"✅ Guidelines search result: {len(search_result)} characters")
+    assert search_result, "Guidelines search should return non-empty result"
 
     # Test knowledge base stats
-    print("Testing knowledge base stats...")
-    from agents.tools import get_knowledge_base_stats
-
-    result = get_knowledge_base_stats.invoke({})
-    print(f"✅ Knowledge base stats: {len(result)} characters")
-    assert len(result) > 0, "Knowledge base stats should return non-empty result"
+    print(f"✅ Knowledge base stats: {len(stats_result)} characters")
+    assert stats_result, "Knowledge base stats should return non-empty result"
 
     print("✅ All agent tools tested successfully!")
 
 
 @pytest.mark.asyncio
 @pytest.mark.integration
+async def test_code_review_agent_with_mock_llm(mock_llm):
+    """Test the agent workflow end to end against a canned LLM, without network calls."""
+    agent = CodeReviewAgent(model_id="gpt-4", llm=mock_llm)
+
+    for code in (SIMPLE_PYTHON_CODE, VULNERABLE_PYTHON_CODE):
+        request = CodeReviewRequest(code=code, language="python", user_request="Review this Python code")
+
+        result = await agent.review_code(request)
+
+        assert "error" not in result, f"Agent returned error: {result.get('error', 'Unknown error')}"
+        assert result["agent_analysis"]["iterations"] > 0, "Agent should have at least one iteration"
+        assert result["review_results"].startswith("## Code Review Report")
+        assert result["metadata"]["workflow_complete"] is True, "Workflow should be complete"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@pytest.mark.slow
+@pytest.mark.vcr
 async def test_code_review_agent():
     """Test the CodeReviewAgent functionality."""
     print("\n🤖 Testing Code Review Agent...")
 
     agent = CodeReviewAgent(model_id="gpt-4")
 
-    # Test simple code review
-    print("Testing simple code review...")
-    request = CodeReviewRequest(
+    # The two reviews are independent workflow runs (state lives in each invocation), so their LLM round-trips overlap
+    print("Testing simple and vulnerable code reviews concurrently...")
+    simple_request = CodeReviewRequest(
         code=SIMPLE_PYTHON_CODE,
         language="python",
         user_request="Review this simple Python function",
     )
+    vulnerable_request = CodeReviewRequest(
+        code=VULNERABLE_PYTHON_CODE,
+        language="python",
+        user_request="Focus on security vulnerabilities in this code",
+    )
 
-    result = await agent.review_code(request)
+    result, vulnerable_result = await asyncio.gather(agent.review_code(simple_request), agent.review_code(vulnerable_request))
 
     assert "error" not in result, f"Agent returned error: {result.get('error', 'Unknown error')}"
 
@@ -133,24 +155,14 @@ async def test_code_review_agent():
     assert len(result["agent_analysis"]["tools_used"]) > 0, "Agent should use at least one tool"
     assert result["metadata"]["workflow_complete"] is True, "Workflow should be complete"
 
-    # Test vulnerable code review
-    print("\nTesting vulnerable code review...")
-    request = CodeReviewRequest(
-        code=VULNERABLE_PYTHON_CODE,
-        language="python",
-        user_request="Focus on security vulnerabilities in this code",
-    )
+    assert "error" not in vulnerable_result, f"Agent returned error: {vulnerable_result.get('error', 'Unknown error')}"
 
-    result = await agent.review_code(request)
+    print(f"\n✅ Vulnerable code review completed:")
+    print(f"  - Iterations: {vulnerable_result['agent_analysis']['iterations']}")
+    print(f"  - Tools used: {vulnerable_result['agent_analysis']['tools_used']}")
 
-    assert "error" not in result, f"Agent returned error: {result.get('error', 'Unknown error')}"
-
-    print(f"✅ Vulnerable code review completed:")
-    print(f"  - Iterations: {result['agent_analysis']['iterations']}")
-    print(f"  - Tools used: {result['agent_analysis']['tools_used']}")
-
-    assert result["agent_analysis"]["iterations"] > 0, "Agent should have at least one iteration"
-    assert len(result["agent_analysis"]["tools_used"]) > 0, "Agent should use at least one tool"
+    assert vulnerable_result["agent_analysis"]["iterations"] > 0, "Agent should have at least one iteration"
+    assert len(vulnerable_result["agent_analysis"]["tools_used"]) > 0, "Agent should use at least one tool"
 
     # Test agent info
     print("\nTesting agent info...")
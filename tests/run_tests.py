@@ -5,59 +5,133 @@ Provides convenient commands for running different types of tests
 """
 
 import argparse
+import hashlib
+import importlib.util
 import os
+import shlex
+import shutil
 import subprocess
 import sys
+import sysconfig
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+CACHE_DIR_PATTERNS = ("__pycache__", ".pytest_cache")
+REPORT_ARTIFACTS = ("htmlcov", "coverage.xml", ".coverage")
+SKIPPED_DIRS = {".git", "venv", ".venv", "node_modules"}
+ENV_CHECK_CACHE = Path.home() / ".cache" / "smart-code-reviewer" / "env-ok"
+
 
 def run_command(command, description=None):
-    """Run a shell command and handle errors"""
+    """Run a command, given as an argv list, and handle errors
+
+    pytest commands run in-process through pytest.main, which skips a fresh interpreter and
+    plugin bootstrap per target; anything else is executed directly, without a shell.
+    """
     if description:
         print(f"\n🔍 {description}")
         print("-" * (len(description) + 4))
 
-    print(f"$ {command}")
-    result = subprocess.run(command, shell=True)  # nosec B602
+    print(f"$ {shlex.join(command)}")
+    if command[0] == "pytest":
+        import pytest
+
+        returncode = int(pytest.main(command[1:]))
+    else:
+        returncode = subprocess.run(command).returncode
 
-    if result.returncode != 0:
-        print(f"❌ Command failed with exit code {result.returncode}")
+    if returncode != 0:
+        print(f"❌ Command failed with exit code {returncode}")
         return False
 
     return True
 
 
-def run_unit_tests():
-    """Run unit tests only"""
-    return run_command("pytest tests/unit/ -v --tb=short", "Running Unit Tests")
+def parallel_args(jobs="auto", dist=None):
+    """pytest-xdist options for running tests across worker processes ([] when disabled or not installed)"""
+    if str(jobs) in ("0", "1") or importlib.util.find_spec("xdist") is None:
+        return []
+    args = ["-n", str(jobs)]
+    if dist:
+        args.append(f"--dist={dist}")
+    return args
+
+
+def recording_args(record_mode="once"):
+    """pytest-recording options for replaying recorded LLM responses ([] when not installed)"""
+    if importlib.util.find_spec("pytest_recording") is None:
+        return []
+    return [f"--record-mode={record_mode}"]
+
+
+def run_unit_tests(jobs="auto"):
+    """Run unit tests only (whole files per worker, so module-scoped fixtures are built once)"""
+    return run_command(
+        ["pytest", "tests/unit/", *parallel_args(jobs, dist="loadfile"), "-v", "--tb=short"], "Running Unit Tests"
+    )
 
 
 def run_api_tests():
     """Run API tests only"""
-    return run_command("pytest tests/unit/test_api.py -v --tb=short", "Running API Tests")
+    return run_command(["pytest", "tests/unit/test_api.py", "-v", "--tb=short"], "Running API Tests")
 
 
-def run_integration_tests():
+def run_integration_tests(jobs="auto", record_mode="once"):
     """Run integration tests only"""
-    return run_command("pytest tests/integration/ -v --tb=short", "Running Integration Tests")
+    # loadfile keeps each file's tests on one worker so they share its RAG/agent setup
+    return run_command(
+        [
+            "pytest",
+            "tests/integration/",
+            *parallel_args(jobs, dist="loadfile"),
+            *recording_args(record_mode),
+            "-v",
+            "--tb=short",
+        ],
+        "Running Integration Tests",
+    )
 
 
-def run_all_tests():
+def run_all_tests(jobs="auto", record_mode="once"):
     """Run all tests with coverage"""
     return run_command(
-        "pytest tests/ -v --cov=. --cov-report=html --cov-report=term-missing",
+        [
+            "pytest",
+            "tests/",
+            *parallel_args(jobs, dist="loadfile"),
+            *recording_args(record_mode),
+            "-v",
+            "--cov=.",
+            "--cov-report=html",
+            "--cov-report=term-missing",
+        ],
         "Running All Tests with Coverage",
     )
 
 
-def run_fast_tests():
+def run_fast_tests(jobs="auto", record_mode="once"):
     """Run fast tests (excluding slow ones)"""
-    return run_command("pytest tests/ -m 'not slow' -v --tb=short", "Running Fast Tests")
+    return run_command(
+        ["pytest", "tests/", *parallel_args(jobs), *recording_args(record_mode), "-m", "not slow", "-v", "--tb=short"],
+        "Running Fast Tests",
+    )
 
 
 def run_specific_test(test_path):
     """Run a specific test file or test function"""
-    return run_command(f"pytest {test_path} -v --tb=short", f"Running Specific Test: {test_path}")
+    return run_command(["pytest", test_path, "-v", "--tb=short"], f"Running Specific Test: {test_path}")
+
+
+def _environment_key():
+    """Fingerprint of the interpreter, installed packages and project checked by check_test_environment"""
+    parts = [sys.version, str(Path.cwd().resolve())]
+    for path in (sysconfig.get_paths()["purelib"], "requirements.txt", "models/data_models.py"):
+        try:
+            # site-packages changes mtime whenever pip installs or removes a package
+            parts.append(str(os.path.getmtime(path)))
+        except OSError:
+            parts.append("missing")
+    return hashlib.sha256(":".join(parts).encode("utf-8")).hexdigest()
 
 
 def check_test_environment():
@@ -65,6 +139,14 @@ def check_test_environment():
     print("🔧 Checking Test Environment")
     print("-" * 28)
 
+    key = _environment_key()
+    try:
+        if ENV_CHECK_CACHE.read_text(errors="ignore") == key:
+            print("✅ cached env ok (nothing changed since the last successful check)")
+            return True
+    except OSError:
+        pass
+
     # Check if pytest is installed
     try:
         import pytest
@@ -102,6 +184,12 @@ def check_test_environment():
         print(f"❌ Failed to import core modules: {e}")
         return False
 
+    try:
+        ENV_CHECK_CACHE.parent.mkdir(parents=True, exist_ok=True)
+        ENV_CHECK_CACHE.write_text(key)
+    except OSError:
+        pass
+
     print("\n🎉 Test environment is ready!")
     return True
 
@@ -109,7 +197,7 @@ def check_test_environment():
 def generate_coverage_report():
     """Generate detailed coverage report"""
     if not run_command(
-        "pytest tests/ --cov=. --cov-report=html --cov-report=xml --cov-report=term",
+        ["pytest", "tests/", "--cov=.", "--cov-report=html", "--cov-report=xml", "--cov-report=term"],
         "Generating Coverage Report",
     ):
         return False
@@ -122,34 +210,39 @@ def generate_coverage_report():
     return True
 
 
+def _remove_artifact(path):
+    """Delete one artifact file or directory tree and describe what was removed"""
+    if path.is_dir():
+        shutil.rmtree(path, ignore_errors=True)
+        return f"directory: {path}"
+    path.unlink()
+    return f"file: {path}"
+
+
 def clean_test_artifacts():
     """Clean test artifacts and cache files"""
     print("🧹 Cleaning Test Artifacts")
     print("-" * 27)
 
-    artifacts = [
-        ".pytest_cache",
-        "__pycache__",
-        "htmlcov",
-        "coverage.xml",
-        ".coverage",
-        "tests/__pycache__",
-        "tests/.pytest_cache",
+    root = Path(".")
+    # Cache directories are removed at every depth; virtualenvs and VCS metadata are left alone
+    targets = [
+        path
+        for pattern in CACHE_DIR_PATTERNS
+        for path in root.rglob(pattern)
+        if not SKIPPED_DIRS.intersection(path.parts[:-1])
     ]
-
-    for artifact in artifacts:
-        if os.path.exists(artifact):
-            if os.path.isdir(artifact):
-                import shutil
-
-                shutil.rmtree(artifact)
-                print(f"✅ Removed directory: {artifact}")
-            else:
-                os.remove(artifact)
-                print(f"✅ Removed file: {artifact}")
+    for artifact in REPORT_ARTIFACTS:
+        path = root / artifact
+        if path.exists():
+            targets.append(path)
         else:
             print(f"⏭️  Not found: {artifact}")
 
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        for removed in executor.map(_remove_artifact, targets):
+            print(f"✅ Removed {removed}")
+
     print("\n🎉 Cleanup completed!")
 
 
@@ -169,6 +262,8 @@ Examples:
   python run_tests.py --coverage         # Generate coverage report
   python run_tests.py --clean            # Clean test artifacts
   python run_tests.py --test tests/test_api.py  # Run specific test file
+  python run_tests.py --unit --jobs 1    # Run unit tests in a single process (debugging)
+  python run_tests.py --integration --record-mode rewrite  # Re-record LLM responses against the live APIs
         """,
     )
 
@@ -182,6 +277,18 @@ Examples:
     group.add_argument("--coverage", action="store_true", help="Generate coverage report")
     group.add_argument("--clean", action="store_true", help="Clean test artifacts")
     group.add_argument("--test", type=str, help="Run specific test file or function")
+    parser.add_argument(
+        "--jobs",
+        default="auto",
+        help="Worker processes for pytest-xdist: a number, 'auto' (default), or 1 to run in a single process",
+    )
+
+    parser.add_argument(
+        "--record-mode",
+        default="once",
+        help="pytest-recording mode for LLM calls: 'once' (default) replays cassettes and records missing ones, "
+        "'rewrite' re-records everything, 'none' fails on unrecorded calls",
+    )
 
     args = parser.parse_args()
 
@@ -193,15 +300,15 @@ Examples:
     if args.check:
         success = check_test_environment()
     elif args.unit:
-        success = run_unit_tests()
+        success = run_unit_tests(args.jobs)
     elif args.api:
         success = run_api_tests()
     elif args.integration:
-        success = run_integration_tests()
+        success = run_integration_tests(args.jobs, args.record_mode)
     elif args.all:
-        success = run_all_tests()
+        success = run_all_tests(args.jobs, args.record_mode)
     elif args.fast:
-        success = run_fast_tests()
+        success = run_fast_tests(args.jobs, args.record_mode)
     elif args.coverage:
         success = generate_coverage_report()
     elif args.clean:
@@ -2,12 +2,118 @@
 Unit tests for Flask API endpoints
 """
 
+import asyncio
 import json
-from unittest.mock import Mock, patch
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from types import SimpleNamespace
 
 import pytest
+from flask.json.provider import DefaultJSONProvider
 
-from models.data_models import ReviewResult
+# Stat result served for every example file, built once instead of per stat() call
+_FILE_STAT = SimpleNamespace(st_size=100, st_mtime=1234567890)
+
+
+def _raise(error):
+    """Stand-in for a function that fails with error"""
+
+    def raiser(*args, **kwargs):
+        raise error
+
+    return raiser
+
+
+# Request payloads are built once at import and posted with json=, serialized by the app's provider
+CODE_PAYLOAD = {"code": "def test(): pass", "language": "python"}
+ZERO_SHOT_PAYLOAD = {**CODE_PAYLOAD, "technique": "zero_shot"}
+MISSING_CODE_PAYLOAD = {"language": "python", "technique": "zero_shot"}
+
+# (method, url, JSON payload, attribute of the app module that fails)
+ERROR_CASES = [
+    pytest.param("GET", "/models", None, "reviewer.model_registry.get_available_models", id="models"),
+    pytest.param("GET", "/files", None, "get_available_files", id="files"),
+    pytest.param("POST", "/review-custom", CODE_PAYLOAD, "reviewer.review_code_async", id="review-custom"),
+]
+
+# (method, url, JSON payload, patch_app target, canned result, response key echoing the result)
+PASSTHROUGH_CASES = [
+    pytest.param(
+        "POST",
+        "/rag/compare",
+        CODE_PAYLOAD,
+        "rag_reviewer.compare_rag_vs_traditional",
+        {
+            "traditional_review": {"rating": 3, "issues": ["Issue 1"]},
+            "rag_review": {"rating": 4, "issues": ["Issue 1", "Issue 2"]},
+            "comparison": {
+                "rating_improvement": 1,
+                "additional_issues_found": 1,
+                "additional_suggestions": 2,
+                "guidelines_referenced": 3,
+            },
+        },
+        "comparison",
+        id="rag-compare",
+    ),
+    pytest.param(
+        "POST",
+        "/rag/search-guidelines",
+        {"query": "error handling", "k": 5},
+        "rag_reviewer.search_guidelines",
+        [{"content": "Use proper error handling", "title": "Error Handling Guide", "category": "best_practices"}],
+        "results",
+        id="rag-search-guidelines",
+    ),
+    pytest.param(
+        "GET",
+        "/rag/knowledge-base/stats",
+        None,
+        "rag_reviewer.get_knowledge_base_stats",
+        {
+            "rag_initialized": True,
+            "vector_store_stats": {"total_documents": 100},
+            "available_categories": ["security", "performance"],
+        },
+        "stats",
+        id="rag-knowledge-base-stats",
+    ),
+    pytest.param(
+        "GET",
+        "/agent/info",
+        None,
+        "code_agent.get_agent_info",
+        {
+            "model": "gpt-4",
+            "capabilities": ["code_review", "rag_search"],
+            "available_tools": ["traditional_review", "rag_review"],
+        },
+        "agent_info",
+        id="agent-info",
+    ),
+    pytest.param(
+        "POST",
+        "/agent/review",
+        {**CODE_PAYLOAD, "user_request": "Focus on security"},
+        "code_agent.review_code",
+        {
+            "rating": 4,
+            "summary": "Code review completed",
+            "detailed_analysis": "Analysis details",
+            "recommendations": ["Recommendation 1"],
+        },
+        "agent_review",
+        id="agent-review",
+    ),
+]
+
+# Steps of the review workflow: (method, url, JSON payload)
+WORKFLOW_STEPS = [
+    pytest.param("GET", "/models", None, id="list-models"),
+    pytest.param("POST", "/review-custom", {**CODE_PAYLOAD, "model": "gpt-4"}, id="traditional-review"),
+    pytest.param("POST", "/rag/compare", CODE_PAYLOAD, id="rag-compare"),
+]
 
 
 @pytest.mark.api
@@ -19,7 +125,7 @@ class TestApiEndpoints:
         response = flask_test_client.get("/")
 
         assert response.status_code == 200
-        data = json.loads(response.data)
+        data = response.get_json()
 
         assert data["service"] == "Enhanced Smart Code Reviewer API"
         assert data["status"] == "running"
@@ -27,347 +133,210 @@ class TestApiEndpoints:
         assert "available_models" in data
         assert "available_files" in data
 
-    def test_models_endpoint(self, flask_test_client, mock_model_registry):
+    def test_models_endpoint(self, flask_test_client, reviewer_mock):
         """Test the models endpoint"""
-        with patch("app.reviewer.model_registry", mock_model_registry):
-            response = flask_test_client.get("/models")
+        response = flask_test_client.get("/models")
 
-            assert response.status_code == 200
-            data = json.loads(response.data)
-
-            assert data["success"] is True
-            assert "models" in data
-            assert data["count"] == 3
-
-    def test_models_endpoint_error(self, flask_test_client):
-        """Test the models endpoint error handling"""
-        with patch(
-            "app.reviewer.model_registry.get_available_models",
-            side_effect=Exception("Test error"),
-        ):
-            response = flask_test_client.get("/models")
-
-            assert response.status_code == 500
-            data = json.loads(response.data)
+        assert response.status_code == 200
+        data = response.get_json()
 
-            assert data["success"] is False
-            assert "error" in data
+        assert data["success"] is True
+        assert "models" in data
+        assert data["count"] == 3
 
-    def test_files_endpoint(self, flask_test_client):
+    def test_files_endpoint(self, flask_test_client, monkeypatch):
         """Test the files endpoint"""
-        with patch("app.get_available_files", return_value=["test.py"]):
-            with patch("app.read_file_content", return_value="def test(): pass"):
-                with patch("pathlib.Path.stat") as mock_stat:
-                    mock_stat.return_value.st_size = 100
-                    mock_stat.return_value.st_mtime = 1234567890
+        monkeypatch.setattr("app.get_available_files", lambda: ["test.py"])
+        monkeypatch.setattr("app.read_file_content", lambda filename: "def test(): pass")
+        monkeypatch.setattr(Path, "stat", lambda self, **kwargs: _FILE_STAT)
 
-                    response = flask_test_client.get("/files")
+        response = flask_test_client.get("/files")
 
-                    assert response.status_code == 200
-                    data = json.loads(response.data)
+        assert response.status_code == 200
+        data = response.get_json()
 
-                    assert data["success"] is True
-                    assert len(data["files"]) == 1
-                    assert data["files"][0]["filename"] == "test.py"
+        assert data["success"] is True
+        assert len(data["files"]) == 1
+        assert data["files"][0]["filename"] == "test.py"
 
-    def test_files_endpoint_error(self, flask_test_client):
-        """Test the files endpoint error handling"""
-        with patch("app.get_available_files", side_effect=Exception("Test error")):
-            response = flask_test_client.get("/files")
+    def test_review_custom_endpoint(self, flask_test_client, reviewer_mock, sample_review_result):
+        """Test the custom code review endpoint"""
+        reviewer_mock.review_code_async.return_value = sample_review_result
 
-            assert response.status_code == 500
-            data = json.loads(response.data)
+        response = flask_test_client.post("/review-custom", json=ZERO_SHOT_PAYLOAD)
 
-            assert data["success"] is False
-            assert "error" in data
+        assert response.status_code == 200
+        data = response.get_json()
 
-    def test_review_custom_endpoint(self, flask_test_client, sample_review_result):
-        """Test the custom code review endpoint"""
-        with patch("app.reviewer.review_code_async", return_value=sample_review_result):
-            test_data = {
-                "code": "def test(): pass",
-                "language": "python",
-                "technique": "zero_shot",
-            }
-
-            response = flask_test_client.post(
-                "/review-custom",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-
-            assert data["success"] is True
-            assert "rating" in data
-            assert data["rating"] == 3
-            assert len(data["issues"]) == 3
+        assert data["success"] is True
+        assert "rating" in data
+        assert data["rating"] == 3
+        assert len(data["issues"]) == 3
 
     def test_review_custom_endpoint_missing_code(self, flask_test_client):
         """Test custom review endpoint with missing code"""
-        test_data = {"language": "python", "technique": "zero_shot"}
-
-        response = flask_test_client.post(
-            "/review-custom",
-            data=json.dumps(test_data),
-            content_type="application/json",
-        )
+        response = flask_test_client.post("/review-custom", json=MISSING_CODE_PAYLOAD)
 
         assert response.status_code == 400
-        data = json.loads(response.data)
+        data = response.get_json()
 
         assert data["success"] is False
         assert "error" in data
 
-    def test_review_custom_endpoint_error(self, flask_test_client):
-        """Test custom review endpoint error handling"""
-        with patch("app.reviewer.review_code_async", side_effect=Exception("Review error")):
-            test_data = {"code": "def test(): pass", "language": "python"}
-
-            response = flask_test_client.post(
-                "/review-custom",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
-
-            assert response.status_code == 500
-            data = json.loads(response.data)
-
-            assert data["success"] is False
-            assert "error" in data
-
-    def test_review_file_endpoint(self, flask_test_client, sample_review_result):
+    def test_review_file_endpoint(self, flask_test_client, reviewer_mock, sample_review_result, monkeypatch):
         """Test file review endpoint"""
-        with patch("app.get_available_files", return_value=["test.py"]):
-            with patch("app.read_file_content", return_value="def test(): pass"):
-                with patch("app.reviewer.review_code", return_value=sample_review_result):
-                    response = flask_test_client.get("/review/test.py?model=gpt-4")
-
-                    assert response.status_code == 200
-                    data = json.loads(response.data)
+        reviewer_mock.review_code_async.return_value = sample_review_result
+        monkeypatch.setattr("app.get_available_files", lambda: ["test.py"])
+        monkeypatch.setattr("app.read_file_content", lambda filename: "def test(): pass")
 
-                    assert data["success"] is True
-                    assert "rating" in data
-                    assert data["filename"] == "test.py"
-
-    def test_review_file_not_found(self, flask_test_client):
-        """Test file review endpoint with non-existent file"""
-        with patch("app.get_available_files", return_value=["other.py"]):
-            response = flask_test_client.get("/review/nonexistent.py")
+        response = flask_test_client.get("/review/test.py?model=gpt-4")
 
-            assert response.status_code == 404
-            data = json.loads(response.data)
-
-            assert data["success"] is False
-            assert "error" in data
-
-    def test_rag_review_custom_endpoint(self, flask_test_client, sample_review_result):
-        """Test RAG custom review endpoint"""
-        with patch("app.rag_reviewer.review_code_with_rag", return_value=sample_review_result):
-            test_data = {"code": "def test(): pass", "language": "python"}
+        assert response.status_code == 200
+        data = response.get_json()
 
-            response = flask_test_client.post(
-                "/rag/review-custom",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
+        assert data["success"] is True
+        assert "rating" in data
+        assert data["filename"] == "test.py"
 
-            assert response.status_code == 200
-            data = json.loads(response.data)
+    def test_review_file_not_found(self, flask_test_client, monkeypatch):
+        """Test file review endpoint with non-existent file"""
+        monkeypatch.setattr("app.get_available_files", lambda: ["other.py"])
 
-            assert data["success"] is True
-            assert "rating" in data
+        response = flask_test_client.get("/review/nonexistent.py")
 
-    def test_rag_compare_endpoint(self, flask_test_client):
-        """Test RAG comparison endpoint"""
-        mock_comparison = {
-            "traditional_review": {"rating": 3, "issues": ["Issue 1"]},
-            "rag_review": {"rating": 4, "issues": ["Issue 1", "Issue 2"]},
-            "comparison": {
-                "rating_improvement": 1,
-                "additional_issues_found": 1,
-                "additional_suggestions": 2,
-                "guidelines_referenced": 3,
-            },
-        }
+        assert response.status_code == 404
+        data = response.get_json()
 
-        with patch("app.rag_reviewer.compare_rag_vs_traditional", return_value=mock_comparison):
-            test_data = {"code": "def test(): pass", "language": "python"}
-
-            response = flask_test_client.post(
-                "/rag/compare",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-
-            assert data["success"] is True
-            assert "comparison" in data
-
-    def test_rag_search_guidelines_endpoint(self, flask_test_client):
-        """Test RAG search guidelines endpoint"""
-        mock_results = [
-            {
-                "content": "Use proper error handling",
-                "title": "Error Handling Guide",
-                "category": "best_practices",
-            }
-        ]
-
-        with patch("app.rag_reviewer.search_guidelines", return_value=mock_results):
-            test_data = {"query": "error handling", "k": 5}
-
-            response = flask_test_client.post(
-                "/rag/search-guidelines",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
-
-            assert response.status_code == 200
-            data = json.loads(response.data)
-
-            assert data["success"] is True
-            assert len(data["results"]) == 1
-
-    def test_rag_knowledge_base_stats_endpoint(self, flask_test_client):
-        """Test RAG knowledge base stats endpoint"""
-        mock_stats = {
-            "rag_initialized": True,
-            "vector_store_stats": {"total_documents": 100},
-            "available_categories": ["security", "performance"],
-        }
+        assert data["success"] is False
+        assert "error" in data
 
-        with patch("app.rag_reviewer.get_knowledge_base_stats", return_value=mock_stats):
-            response = flask_test_client.get("/rag/knowledge-base/stats")
+    def test_rag_review_custom_endpoint(self, flask_test_client, patch_app, sample_review_result):
+        """Test RAG custom review endpoint"""
+        patch_app("rag_reviewer.review_code_with_rag", sample_review_result)
 
-            assert response.status_code == 200
-            data = json.loads(response.data)
+        response = flask_test_client.post("/rag/review-custom", json=CODE_PAYLOAD)
 
-            assert data["success"] is True
-            assert "stats" in data
+        assert response.status_code == 200
+        data = response.get_json()
 
-    def test_agent_info_endpoint(self, flask_test_client):
-        """Test agent info endpoint"""
-        mock_info = {
-            "model": "gpt-4",
-            "capabilities": ["code_review", "rag_search"],
-            "available_tools": ["traditional_review", "rag_review"],
-        }
+        assert data["success"] is True
+        assert "rating" in data
 
-        with patch("app.code_agent.get_agent_info", return_value=mock_info):
-            response = flask_test_client.get("/agent/info")
+    @pytest.mark.parametrize("method, url, body, target", ERROR_CASES)
+    def test_endpoint_errors(self, flask_test_client, reviewer_mock, monkeypatch, method, url, body, target):
+        """Test endpoints answer 500 with an error message when a collaborator fails"""
+        monkeypatch.setattr(f"app.{target}", _raise(Exception("Test error")))
 
-            assert response.status_code == 200
-            data = json.loads(response.data)
+        response = flask_test_client.open(
+            url,
+            method=method,
+            json=body,
+        )
 
-            assert data["success"] is True
-            assert "agent_info" in data
+        assert response.status_code == 500
+        data = response.get_json()
 
-    def test_agent_review_custom_endpoint(self, flask_test_client):
-        """Test agent custom review endpoint"""
-        mock_result = {
-            "rating": 4,
-            "summary": "Code review completed",
-            "detailed_analysis": "Analysis details",
-            "recommendations": ["Recommendation 1"],
-        }
+        assert data["success"] is False
+        assert "error" in data
 
-        with patch("app.code_agent.review_code", return_value=mock_result):
-            test_data = {
-                "code": "def test(): pass",
-                "language": "python",
-                "user_request": "Focus on security",
-            }
+    @pytest.mark.parametrize("method, url, body, target, result, key", PASSTHROUGH_CASES)
+    def test_rag_and_agent_endpoints(self, flask_test_client, patch_app, method, url, body, target, result, key):
+        """Test RAG and agent endpoints return their collaborator's result under the expected key"""
+        patch_app(target, result)
 
-            response = flask_test_client.post(
-                "/agent/review",
-                data=json.dumps(test_data),
-                content_type="application/json",
-            )
+        response = flask_test_client.open(
+            url,
+            method=method,
+            json=body,
+        )
 
-            assert response.status_code == 200
-            data = json.loads(response.data)
+        assert response.status_code == 200
+        data = response.get_json()
 
-            assert data["success"] is True
-            assert "agent_review" in data
+        assert data["success"] is True
+        assert data[key] == result
 
-    def test_404_error_handler(self, flask_test_client):
+    def test_404_error_handler(self, flask_test_client, patch_app):
         """Test 404 error handler"""
         response = flask_test_client.get("/nonexistent-endpoint")
 
         assert response.status_code == 404
-        data = json.loads(response.data)
+        data = response.get_json()
 
         assert data["success"] is False
         assert "error" in data
         assert "available_endpoints" in data
 
-    def test_500_error_handler(self, flask_test_client):
-        """Test 500 error handler"""
-        with patch(
-            "app.reviewer.model_registry.get_available_models",
-            side_effect=Exception("Internal error"),
-        ):
-            response = flask_test_client.get("/models")
-
-            assert response.status_code == 500
-            data = json.loads(response.data)
+    def test_cors_headers(self, flask_test_client, patch_app):
+        """Test CORS headers are properly set"""
+        response = flask_test_client.options("/")
 
-            assert data["success"] is False
-            assert "error" in data
+        # CORS headers should be present
+        assert "Access-Control-Allow-Origin" in response.headers
 
 
 @pytest.mark.api
-@pytest.mark.integration
 class TestApiIntegration:
-    """Integration tests for API endpoints"""
-
-    def test_full_review_workflow(self, flask_test_client, sample_review_result):
-        """Test complete review workflow"""
-        # 1. Get available models
-        with patch(
-            "app.reviewer.model_registry.get_available_models",
-            return_value={"gpt-4": "GPT-4"},
-        ):
-            models_response = flask_test_client.get("/models")
-            assert models_response.status_code == 200
-
-        # 2. Review code with traditional method
-        with patch("app.reviewer.review_code", return_value=sample_review_result):
-            review_data = {
-                "code": "def test(): pass",
-                "language": "python",
-                "model": "gpt-4",
-            }
-
-            review_response = flask_test_client.post(
-                "/review-custom",
-                data=json.dumps(review_data),
-                content_type="application/json",
-            )
-            assert review_response.status_code == 200
-
-        # 3. Compare with RAG
-        mock_comparison = {
+    """Review workflow through the API: list models, review traditionally, compare with RAG.
+
+    Every step runs against freshly reset mocks, so the steps are independent tests that
+    pytest-xdist can spread across workers.
+    """
+
+    @pytest.mark.parametrize("method, url, body", WORKFLOW_STEPS)
+    def test_full_review_workflow(
+        self, flask_test_client, reviewer_mock, rag_reviewer_mock, sample_review_result, method, url, body
+    ):
+        """Test each step of the complete review workflow"""
+        reviewer_mock.model_registry.get_available_models = lambda: {"gpt-4": "GPT-4"}
+        reviewer_mock.review_code_async.return_value = sample_review_result
+        rag_reviewer_mock.compare_rag_vs_traditional.return_value = {
             "traditional_review": {"rating": 3},
             "rag_review": {"rating": 4},
             "comparison": {"rating_improvement": 1},
         }
 
-        with patch("app.rag_reviewer.compare_rag_vs_traditional", return_value=mock_comparison):
-            compare_response = flask_test_client.post(
-                "/rag/compare",
-                data=json.dumps({"code": "def test(): pass", "language": "python"}),
-                content_type="application/json",
-            )
-            assert compare_response.status_code == 200
+        response = flask_test_client.open(url, method=method, json=body)
 
-    def test_cors_headers(self, flask_test_client):
-        """Test CORS headers are properly set"""
-        response = flask_test_client.options("/")
+        assert response.status_code == 200
 
-        # CORS headers should be present
-        assert "Access-Control-Allow-Origin" in response.headers
+
+@pytest.mark.api
+class TestJsonProvider:
+    """Test suite for the app's JSON provider"""
+
+    def test_matches_default_provider_output(self, _flask_app):
+        """Test responses serialize like Flask's default provider, keys sorted"""
+
+        @dataclass
+        class Point:
+            x: int
+
+        payload = {"b": 1, "a": datetime(2024, 1, 2, 3, 4, 5), "point": Point(2), "big": 2**70}
+
+        expected = DefaultJSONProvider(_flask_app).dumps(payload)
+
+        assert _flask_app.json.dumps(payload) == expected
+        assert _flask_app.json.dumps({"b": 1, 1: "one"}) == '{"1":"one","b":1}'
+        assert _flask_app.json.loads(expected) == json.loads(expected)
+
+
+@pytest.mark.api
+class TestEndpointEventLoop:
+    """Test suite for the event loop endpoints run coroutines on"""
+
+    def test_requests_share_the_session_loop(self, flask_test_client, reviewer_mock, endpoint_event_loop):
+        """Test successive requests reuse the session's loop instead of creating their own"""
+        loops = []
+
+        async def review_code_async(*args):
+            loops.append(asyncio.get_running_loop())
+            raise RuntimeError("stop after recording the loop")
+
+        reviewer_mock.review_code_async.side_effect = review_code_async
+
+        for _ in range(2):
+            flask_test_client.post("/review-custom", json=CODE_PAYLOAD)
+
+        assert loops == [endpoint_event_loop, endpoint_event_loop]
+        assert not endpoint_event_loop.is_closed()
@@ -2,6 +2,7 @@
 Unit tests for data models
 """
 
+from dataclasses import FrozenInstanceError, asdict
 from datetime import datetime
 
 import pytest
@@ -73,6 +74,54 @@ class TestReviewResult:
         assert result.technique_used == "few_shot"
         assert result.technique == "few_shot"
 
+    def test_review_result_from_legacy(self):
+        """Test ReviewResult.from_legacy maps the deprecated call shape"""
+        result = ReviewResult.from_legacy(
+            issues=["Hardcoded password", {"description": "SQL injection"}],
+            suggestions=["Use environment variables"],
+            rating="Poor",
+            reasoning="Security issues",
+            model_used="gpt-4",
+            timestamp="2023-01-01T00:00:00Z",
+            technique="zero_shot",
+        )
+
+        assert result.technique_used == "zero_shot"
+        assert result.issues == [{"description": "Hardcoded password"}, {"description": "SQL injection"}]
+        assert result.suggestions == [{"description": "Use environment variables"}]
+
+    def test_review_result_to_dict_is_shallow(self):
+        """Test ReviewResult.to_dict matches asdict without copying nested lists"""
+        result = ReviewResult(
+            issues=[{"description": "Hardcoded password"}],
+            suggestions=[],
+            rating="Poor",
+            reasoning="Security issues",
+            model_used="gpt-4",
+            technique_used="zero_shot",
+            timestamp="2023-01-01T00:00:00Z",
+        )
+
+        data = result.to_dict()
+
+        assert data == asdict(result)
+        assert data["issues"] is result.issues
+
+    def test_review_result_is_frozen(self):
+        """Test ReviewResult fields cannot be reassigned after construction"""
+        result = ReviewResult(
+            issues=[],
+            suggestions=[],
+            rating="Good",
+            reasoning="Clean code",
+            model_used="gpt-4",
+            technique_used="rag",
+            timestamp="2023-01-01T00:00:00Z",
+        )
+
+        with pytest.raises(FrozenInstanceError):
+            result.rating = "Poor"
+
     def test_review_result_rag_fields(self):
         """Test ReviewResult with RAG-specific fields"""
         result = ReviewResult(
@@ -236,6 +285,56 @@ class TestComparisonResult:
         assert "timestamp" in data
         assert data["improvement_metrics"]["test_metric"] == 123
 
+    def test_comparison_result_to_dict_returns_copies(self):
+        """Test mutating the serialized reviews leaves the dataclasses untouched"""
+        review = ReviewResult(
+            issues=[{"description": "Hardcoded password"}],
+            suggestions=[],
+            rating="Poor",
+            reasoning="Traditional",
+            model_used="gpt-4",
+            technique_used="zero_shot",
+            timestamp="2023-01-01T00:00:00Z",
+        )
+        comparison = ComparisonResult(
+            traditional_review=review,
+            rag_enhanced_review=review,
+            improvement_metrics={},
+            timestamp="2023-01-01T00:00:00Z",
+        )
+
+        data = comparison.to_dict()
+        data["traditional_review"]["rating"] = "Excellent"
+        data["traditional_review"]["issues"].clear()
+
+        assert review.rating == "Poor"
+        assert review.issues == [{"description": "Hardcoded password"}]
+
+    def test_comparison_result_to_dict_matches_asdict(self):
+        """Test the serialized reviews equal asdict() output, nested values included"""
+        review = ReviewResult(
+            issues=[{"description": "Hardcoded password", "lines": [3, 7], "meta": {"cwe": 798}}],
+            suggestions=[{"description": "Use environment variables"}],
+            rating="Poor",
+            reasoning="Traditional",
+            model_used="gpt-4",
+            technique_used="zero_shot",
+            timestamp="2023-01-01T00:00:00Z",
+            execution_time=1.5,
+            guidelines_used=["Never hardcode secrets"],
+        )
+        comparison = ComparisonResult(
+            traditional_review=review,
+            rag_enhanced_review=review,
+            improvement_metrics={},
+            timestamp="2023-01-01T00:00:00Z",
+        )
+
+        data = comparison.to_dict()
+
+        assert data["traditional_review"] == asdict(review)
+        assert data["traditional_review"]["issues"][0]["lines"] is not review.issues[0]["lines"]
+
 
 @pytest.mark.unit
 class TestModelConfig:
@@ -276,17 +375,21 @@ class TestModelConfig:
         assert config.description == "Anthropic Claude 3 Sonnet"
         assert config.env_var is None
 
-    def test_model_config_different_providers(self):
+    @pytest.mark.parametrize(
+        "provider, model_name, temperature, max_tokens, description",
+        [
+            ("openai", "gpt-4", 0.7, 2048, "OpenAI GPT-4"),
+            ("anthropic", "claude-3", 0.5, 4096, "Anthropic Claude 3"),
+            ("google", "gemini-pro", 0.3, 8192, "Google Gemini Pro"),
+            ("ollama", "llama2", 0.8, 1024, "Local Llama 2"),
+        ],
+    )
+    def test_model_config_different_providers(self, provider, model_name, temperature, max_tokens, description):
         """Test ModelConfig with different providers"""
-        configs = [
-            ModelConfig("openai", "gpt-4", 0.7, 2048, "OpenAI GPT-4"),
-            ModelConfig("anthropic", "claude-3", 0.5, 4096, "Anthropic Claude 3"),
-            ModelConfig("google", "gemini-pro", 0.3, 8192, "Google Gemini Pro"),
-            ModelConfig("ollama", "llama2", 0.8, 1024, "Local Llama 2"),
-        ]
-
-        assert len(configs) == 4
-        assert configs[0].provider == "openai"
-        assert configs[1].provider == "anthropic"
-        assert configs[2].provider == "google"
-        assert configs[3].provider == "ollama"
+        config = ModelConfig(provider, model_name, temperature, max_tokens, description)
+
+        assert config.provider == provider
+        assert config.model_name == model_name
+        assert config.temperature == temperature
+        assert config.max_tokens == max_tokens
+        assert config.description == description
@@ -2,55 +2,103 @@
 Unit tests for ModelRegistry
 """
 
+import copy
 import tempfile
 from pathlib import Path
-from unittest.mock import Mock, mock_open, patch
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
 
 import pytest
+import requests
 import yaml
 
 from models.data_models import ModelConfig
-from providers.model_registry import ModelRegistry
+from providers import model_registry
+from providers.model_registry import MissingApiKeyError, ModelRegistry, UnsupportedProviderError
+
+# Write test configs with libyaml's emitter when available, as the registry reads them with its loader
+YAML_DUMPER = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Environment variables holding the API keys of the models in sample_config
+API_KEY_VARS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY")
+
+# Sample configuration for testing and its YAML, serialized once at import
+SAMPLE_CONFIG = {
+    "models": {
+        "gpt-4": {
+            "provider": "openai",
+            "model_name": "gpt-4",
+            "description": "OpenAI GPT-4",
+            "temperature": 0.7,
+            "max_tokens": 2048,
+            "env_var": "OPENAI_API_KEY",
+        },
+        "claude-3-sonnet": {
+            "provider": "anthropic",
+            "model_name": "claude-3-sonnet-20240229",
+            "description": "Anthropic Claude 3 Sonnet",
+            "temperature": 0.7,
+            "max_tokens": 4096,
+            "env_var": "ANTHROPIC_API_KEY",
+        },
+    },
+    "providers": {
+        "openai": {"env_var": "OPENAI_API_KEY"},
+        "anthropic": {"env_var": "ANTHROPIC_API_KEY"},
+    },
+}
+SAMPLE_CONFIG_YAML = yaml.dump(SAMPLE_CONFIG, Dumper=YAML_DUMPER).encode("utf-8")
 
 
-class TestModelRegistry:
-    """Test suite for ModelRegistry class"""
+def _tags_response(*names: str) -> SimpleNamespace:
+    """Stand-in for a successful Ollama /api/tags response listing the given models"""
+    payload = {"models": [{"name": name} for name in names]}
+    return SimpleNamespace(status_code=200, json=lambda: payload)
 
-    @pytest.fixture
-    def sample_config(self):
-        """Sample configuration for testing"""
-        return {
-            "models": {
-                "gpt-4": {
-                    "provider": "openai",
-                    "model_name": "gpt-4",
-                    "description": "OpenAI GPT-4",
-                    "temperature": 0.7,
-                    "max_tokens": 2048,
-                    "env_var": "OPENAI_API_KEY",
-                },
-                "claude-3-sonnet": {
-                    "provider": "anthropic",
-                    "model_name": "claude-3-sonnet-20240229",
-                    "description": "Anthropic Claude 3 Sonnet",
-                    "temperature": 0.7,
-                    "max_tokens": 4096,
-                    "env_var": "ANTHROPIC_API_KEY",
-                },
-            },
-            "providers": {
-                "openai": {"env_var": "OPENAI_API_KEY"},
-                "anthropic": {"env_var": "ANTHROPIC_API_KEY"},
-            },
-        }
 
-    @pytest.fixture
-    def temp_config_file(self, sample_config, temp_dir):
-        """Create a temporary config file"""
-        config_file = temp_dir / "test_config.yaml"
-        with open(config_file, "w") as f:
-            yaml.dump(sample_config, f)
-        return str(config_file)
+@pytest.fixture(scope="module")
+def sample_config():
+    """Sample configuration for testing, shared by the module; tests that change it work on a copy"""
+    return SAMPLE_CONFIG
+
+
+@pytest.fixture(scope="module")
+def temp_config_file(tmp_path_factory):
+    """Config file written once per module from SAMPLE_CONFIG_YAML"""
+    config_file = tmp_path_factory.mktemp("model_registry") / "test_config.yaml"
+    config_file.write_bytes(SAMPLE_CONFIG_YAML)
+    return str(config_file)
+
+
+@pytest.fixture(scope="module")
+def base_registry(sample_config):
+    """Registry built once per module for read-only tests"""
+    return ModelRegistry.from_dict(sample_config)
+
+
+@pytest.fixture
+def provider_mocks(monkeypatch):
+    """Mocks installed in place of the LangChain provider classes of the models in sample_config.
+
+    They go straight into the module's globals, where the registry caches provider classes;
+    monkeypatch.setattr would first read the old attribute and so import the real LangChain package.
+    """
+    mocks = {"ChatOpenAI": Mock(), "ChatAnthropic": Mock()}
+    for name, mock in mocks.items():
+        monkeypatch.setitem(vars(model_registry), name, mock)
+    return mocks
+
+
+@pytest.fixture
+def no_api_keys(monkeypatch):
+    """Remove the API keys the test config refers to from the environment"""
+    for env_var in API_KEY_VARS:
+        monkeypatch.delenv(env_var, raising=False)
+
+
+@pytest.mark.unit
+class TestModelRegistry:
+    """Test suite for ModelRegistry class"""
 
     def test_init_with_valid_config(self, temp_config_file):
         """Test initialization with valid config file"""
@@ -68,126 +116,157 @@ class TestModelRegistry:
             assert len(registry.models) == 0
             assert len(registry.providers) == 0
 
-    def test_init_with_invalid_yaml(self):
+    def test_init_with_invalid_yaml(self, tmp_path):
         """Test initialization with invalid YAML"""
-        with patch("builtins.open", mock_open(read_data="invalid: yaml: content:")):
-            with patch("yaml.safe_load", side_effect=yaml.YAMLError):
-                registry = ModelRegistry(config_path="invalid.yaml")
-                assert len(registry.models) == 0
+        config_file = tmp_path / "invalid.yaml"
+        config_file.write_text("invalid: yaml: content:")
 
-    def test_get_available_models_with_api_keys(self, temp_config_file):
-        """Test getting available models when API keys are present"""
-        with patch.dict(
-            "os.environ",
-            {"OPENAI_API_KEY": "test-key", "ANTHROPIC_API_KEY": "test-key"},
-        ):
-            registry = ModelRegistry(config_path=temp_config_file)
-            available = registry.get_available_models()
-
-            assert len(available) == 2
-            assert "gpt-4" in available
-            assert "claude-3-sonnet" in available
-            assert available["gpt-4"] == "OpenAI GPT-4"
-
-    def test_get_available_models_without_api_keys(self, temp_config_file):
-        """Test getting available models when API keys are missing"""
-        with patch.dict("os.environ", {}, clear=True):
-            registry = ModelRegistry(config_path=temp_config_file)
-            available = registry.get_available_models()
+        registry = ModelRegistry(config_path=str(config_file))
+        assert len(registry.models) == 0
 
-            assert len(available) == 0
+    def test_config_parse_reused_until_file_changes(self, sample_config, tmp_path):
+        """Test an unchanged config file is parsed once and an edited one is parsed again"""
+        config_file = tmp_path / "cached_config.yaml"
+        config_file.write_bytes(SAMPLE_CONFIG_YAML)
 
-    def test_is_model_available_with_api_key(self, temp_config_file):
-        """Test model availability check when API key exists"""
-        with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}):
-            registry = ModelRegistry(config_path=temp_config_file)
-            assert registry._is_model_available("gpt-4") is True
+        with patch("yaml.load", wraps=yaml.load) as yaml_load:
+            ModelRegistry(config_path=str(config_file))
+            registry = ModelRegistry(config_path=str(config_file))
+            assert yaml_load.call_count == 1
 
-    def test_is_model_available_without_api_key(self, temp_config_file):
-        """Test model availability check when API key is missing"""
-        with patch.dict("os.environ", {}, clear=True):
-            registry = ModelRegistry(config_path=temp_config_file)
-            assert registry._is_model_available("gpt-4") is False
+            registry.models.clear()
+            registry.providers.clear()
+            assert len(ModelRegistry(config_path=str(config_file)).providers) == 2
 
-    def test_is_model_available_nonexistent_model(self, temp_config_file):
-        """Test model availability check for non-existent model"""
-        registry = ModelRegistry(config_path=temp_config_file)
-        assert registry._is_model_available("nonexistent-model") is False
+            config = copy.deepcopy(sample_config)
+            del config["models"]["claude-3-sonnet"]
+            config_file.write_text(yaml.dump(config, Dumper=YAML_DUMPER))
+            assert list(ModelRegistry(config_path=str(config_file)).models) == ["gpt-4"]
+            assert yaml_load.call_count == 2
 
-    @patch("requests.get")
-    def test_is_ollama_model_available_success(self, mock_get, temp_config_file):
-        """Test Ollama model availability check - success case"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"models": [{"name": "llama2:latest"}]}
-        mock_get.return_value = mock_response
+    def test_get_available_models_with_api_keys(self, base_registry, monkeypatch):
+        """Test getting available models when API keys are present"""
+        for env_var in API_KEY_VARS:
+            monkeypatch.setenv(env_var, "test-key")
+        available = base_registry.get_available_models()
 
-        registry = ModelRegistry(config_path=temp_config_file)
-        assert registry._is_ollama_model_available("llama2:latest") is True
+        assert len(available) == 2
+        assert "gpt-4" in available
+        assert "claude-3-sonnet" in available
+        assert available["gpt-4"] == "OpenAI GPT-4"
 
-    @patch("requests.get")
-    def test_is_ollama_model_available_not_found(self, mock_get, temp_config_file):
-        """Test Ollama model availability check - model not found"""
-        mock_response = Mock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {"models": [{"name": "other-model:latest"}]}
-        mock_get.return_value = mock_response
+    def test_get_available_models_without_api_keys(self, base_registry, no_api_keys):
+        """Test getting available models when API keys are missing"""
+        available = base_registry.get_available_models()
 
-        registry = ModelRegistry(config_path=temp_config_file)
-        assert registry._is_ollama_model_available("llama2:latest") is False
+        assert len(available) == 0
 
-    @patch("requests.get")
-    def test_is_ollama_model_available_connection_error(self, mock_get, temp_config_file):
-        """Test Ollama model availability check - connection error"""
-        import requests
+    def test_is_model_available_with_api_key(self, base_registry, monkeypatch):
+        """Test model availability check when API key exists"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        assert base_registry._is_model_available("gpt-4") is True
 
-        mock_get.side_effect = requests.exceptions.ConnectionError("Connection error")
+    def test_is_model_available_without_api_key(self, base_registry, no_api_keys):
+        """Test model availability check when API key is missing"""
+        assert base_registry._is_model_available("gpt-4") is False
 
-        registry = ModelRegistry(config_path=temp_config_file)
-        assert registry._is_ollama_model_available("llama2:latest") is False
-
-    def test_create_model_openai(self, temp_config_file):
-        """Test creating OpenAI model"""
-        with patch.dict("os.environ", {"OPENAI_API_KEY": "test-key"}):
-            with patch("providers.model_registry.ChatOpenAI") as mock_chat_openai:
-                registry = ModelRegistry(config_path=temp_config_file)
-                model = registry.create_model("gpt-4")
-
-                mock_chat_openai.assert_called_once_with(model="gpt-4", temperature=0.7, max_tokens=2048, api_key="test-key")
-
-    def test_create_model_anthropic(self, temp_config_file):
-        """Test creating Anthropic model"""
-        with patch.dict("os.environ", {"ANTHROPIC_API_KEY": "test-key"}):
-            with patch("providers.model_registry.ChatAnthropic") as mock_chat_anthropic:
-                registry = ModelRegistry(config_path=temp_config_file)
-                model = registry.create_model("claude-3-sonnet")
-
-                mock_chat_anthropic.assert_called_once_with(
-                    model="claude-3-sonnet-20240229",
-                    temperature=0.7,
-                    max_tokens=4096,
-                    api_key="test-key",
-                )
-
-    def test_create_model_nonexistent(self, temp_config_file):
+    def test_api_key_exported_later_is_picked_up(self, base_registry, no_api_keys, monkeypatch):
+        """Test API keys are read from the environment at use time, not when the registry was built"""
+        assert base_registry._is_model_available("gpt-4") is False
+
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        assert base_registry._is_model_available("gpt-4") is True
+
+    def test_is_model_available_nonexistent_model(self, base_registry):
+        """Test model availability check for non-existent model"""
+        assert base_registry._is_model_available("nonexistent-model") is False
+
+    @pytest.mark.parametrize(
+        "listed_models, error, expected",
+        [
+            pytest.param(["llama2:latest"], None, True, id="success"),
+            pytest.param(["other-model:latest"], None, False, id="not-found"),
+            pytest.param(None, requests.exceptions.ConnectionError("Connection error"), False, id="connection-error"),
+        ],
+    )
+    def test_is_ollama_model_available(self, sample_config, listed_models, error, expected):
+        """Test Ollama model availability check against the local /api/tags listing"""
+        with patch("requests.Session.get", return_value=_tags_response(*(listed_models or [])), side_effect=error):
+            registry = ModelRegistry.from_dict(sample_config)
+            assert registry._is_ollama_model_available("llama2:latest") is expected
+
+    @patch("requests.Session.get")
+    def test_ollama_tags_fetched_once_per_sweep(self, mock_get, sample_config):
+        """Test repeated Ollama checks reuse the cached /api/tags listing"""
+        mock_get.return_value = _tags_response("llama2:latest", "mistral:latest")
+
+        registry = ModelRegistry.from_dict(sample_config)
+        assert registry._is_ollama_model_available("llama2:latest") is True
+        assert registry._is_ollama_model_available("mistral:latest") is True
+        assert registry._is_ollama_model_available("codellama:latest") is False
+        mock_get.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "model_id, env_var, provider_class, expected_kwargs",
+        [
+            pytest.param(
+                "gpt-4",
+                "OPENAI_API_KEY",
+                "ChatOpenAI",
+                {"model": "gpt-4", "temperature": 0.7, "max_tokens": 2048},
+                id="openai",
+            ),
+            pytest.param(
+                "claude-3-sonnet",
+                "ANTHROPIC_API_KEY",
+                "ChatAnthropic",
+                {"model": "claude-3-sonnet-20240229", "temperature": 0.7, "max_tokens": 4096},
+                id="anthropic",
+            ),
+        ],
+    )
+    def test_create_model(
+        self, sample_config, provider_mocks, monkeypatch, model_id, env_var, provider_class, expected_kwargs
+    ):
+        """Test creating a model passes its config and API key to the provider class"""
+        monkeypatch.setenv(env_var, "test-key")
+        registry = ModelRegistry.from_dict(sample_config)
+        registry.create_model(model_id)
+
+        provider_mocks[provider_class].assert_called_once_with(**expected_kwargs, api_key="test-key")
+
+    def test_get_or_create_reuses_model_instance(self, sample_config, provider_mocks, monkeypatch):
+        """Test get_or_create builds each model once and rebuilds it when its API key changes"""
+        monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+        registry = ModelRegistry.from_dict(sample_config)
+        first = registry.get_or_create("gpt-4")
+        assert registry.get_or_create("gpt-4") is first
+        assert provider_mocks["ChatOpenAI"].call_count == 1
+
+        monkeypatch.setenv("OPENAI_API_KEY", "rotated-key")
+        registry.get_or_create("gpt-4")
+        assert provider_mocks["ChatOpenAI"].call_count == 2
+        provider_mocks["ChatOpenAI"].assert_called_with(model="gpt-4", temperature=0.7, max_tokens=2048, api_key="rotated-key")
+
+    def test_create_model_nonexistent(self, sample_config):
         """Test creating non-existent model raises error"""
-        registry = ModelRegistry(config_path=temp_config_file)
+        registry = ModelRegistry.from_dict(sample_config)
 
         with pytest.raises(ValueError, match="Model nonexistent not found"):
             registry.create_model("nonexistent")
 
-    def test_create_model_missing_api_key(self, temp_config_file):
+    def test_create_model_missing_api_key(self, sample_config, no_api_keys):
         """Test creating model without API key raises error"""
-        with patch.dict("os.environ", {}, clear=True):
-            registry = ModelRegistry(config_path=temp_config_file)
+        registry = ModelRegistry.from_dict(sample_config)
 
-            with pytest.raises(ValueError, match="API key.*not found"):
-                registry.create_model("gpt-4")
+        with pytest.raises(MissingApiKeyError):
+            registry.create_model("gpt-4")
 
-    def test_create_model_unsupported_provider(self, temp_config_file, sample_config):
+    def test_create_model_unsupported_provider(self, sample_config):
         """Test creating model with unsupported provider"""
-        # Add unsupported provider to config
-        sample_config["models"]["test-model"] = {
+        # Add unsupported provider to a copy of the shared config
+        config = copy.deepcopy(sample_config)
+        config["models"]["test-model"] = {
             "provider": "unsupported",
             "model_name": "test",
             "description": "Test model",
@@ -195,13 +274,9 @@ class TestModelRegistry:
             "max_tokens": 1000,
         }
 
-        config_file = temp_config_file
-        with open(config_file, "w") as f:
-            yaml.dump(sample_config, f)
-
-        registry = ModelRegistry(config_path=config_file)
+        registry = ModelRegistry.from_dict(config)
 
-        with pytest.raises(ValueError, match="Unsupported provider: unsupported"):
+        with pytest.raises(UnsupportedProviderError):
             registry.create_model("test-model")
 
 
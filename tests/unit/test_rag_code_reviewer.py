@@ -0,0 +1,63 @@
+"""
+Unit tests for RAGCodeReviewer
+"""
+
+import asyncio
+
+import pytest
+
+from models.data_models import ReviewResult
+from reviewers.rag_code_reviewer import RAGCodeReviewer
+
+
+@pytest.fixture
+def rag_reviewer(monkeypatch):
+    monkeypatch.setenv("RAG_REVIEW_CACHE_TTL", "0")
+    return RAGCodeReviewer()
+
+
+@pytest.mark.unit
+class TestTraditionalReview:
+    """Test suite for memoized zero-shot reviews"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_review(self, rag_reviewer, monkeypatch):
+        """Test concurrent and later calls for the same code reuse a single LLM review"""
+        calls = []
+
+        async def review_code_async(code, language, technique, model_id):
+            calls.append(code)
+            await asyncio.sleep(0.01)
+            return ReviewResult(
+                issues=["Missing docstring"],
+                suggestions=["Add a module docstring"],
+                rating=4,
+                reasoning="Small, readable module",
+                model_used=model_id,
+                technique_used=technique,
+                timestamp="2023-01-01T00:00:00Z",
+            )
+
+        monkeypatch.setattr(rag_reviewer, "review_code_async", review_code_async)
+
+        first, second = await asyncio.gather(
+            rag_reviewer._traditional_review("x = 1", "python", None),
+            rag_reviewer._traditional_review("x = 1", "python", None),
+        )
+        third = await rag_reviewer._traditional_review("x = 1", "python", None)
+
+        assert calls == ["x = 1"]
+        assert first == second == third
+        assert first.issues is not second.issues
+
+
+@pytest.mark.unit
+class TestParseRagReviewResult:
+    """Test suite for parsing RAG review responses"""
+
+    def test_unparseable_response_is_rated_error(self, rag_reviewer):
+        """Test a response without valid JSON yields an "Error" review, which the caches skip"""
+        result = rag_reviewer._parse_rag_review_result('{"rating": "Good", "issues": [', "gpt-4", [])
+
+        assert result.rating == "Error"
+        assert result.technique_used == "rag"
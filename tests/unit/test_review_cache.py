@@ -0,0 +1,50 @@
+"""
+Unit tests for ReviewCache
+"""
+
+import pytest
+
+from models.data_models import ReviewResult
+from reviewers.review_cache import ReviewCache
+
+
+def _review() -> ReviewResult:
+    return ReviewResult(
+        issues=[{"description": "Hardcoded password", "severity": "high"}],
+        suggestions=[{"description": "Use environment variables"}],
+        rating="Poor",
+        reasoning="Security issues",
+        model_used="gpt-4",
+        technique_used="rag",
+        timestamp="2023-01-01T00:00:00Z",
+        guidelines_used=["Never hardcode secrets"],
+        num_guidelines=3,
+    )
+
+
+@pytest.mark.unit
+class TestReviewCache:
+    """Test suite for the persistent review cache"""
+
+    def test_round_trip_survives_reopen(self, tmp_path):
+        """Test a stored review is returned by a fresh cache on the same file"""
+        key = ReviewCache.make_key("code", "gpt-4", "python", 3, "rag")
+        cache = ReviewCache(tmp_path / "reviews.db")
+        cache.put(key, _review())
+        cache.close()
+
+        reopened = ReviewCache(tmp_path / "reviews.db")
+        assert reopened.get(key) == _review()
+        assert reopened.get(ReviewCache.make_key("other code", "gpt-4", "python", 3, "rag")) is None
+
+    def test_expired_and_cleared_entries_miss(self, tmp_path):
+        """Test entries older than the TTL or removed by clear() are not returned"""
+        key = ReviewCache.make_key("code")
+        expired = ReviewCache(tmp_path / "reviews.db", ttl=-1)
+        expired.put(key, _review())
+        assert expired.get(key) is None
+
+        cache = ReviewCache(tmp_path / "reviews.db")
+        assert cache.get(key) is not None
+        cache.clear()
+        assert cache.get(key) is None
@@ -0,0 +1,76 @@
+"""
+Unit tests for SemanticCache
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import rag.semantic_cache
+from rag.semantic_cache import SemanticCache
+
+
+@pytest.mark.unit
+class TestSemanticCache:
+    """Test suite for the similarity-keyed LRU cache"""
+
+    def test_lookup_hits_similar_embedding(self):
+        """Test a near-identical embedding under the same key is a hit"""
+        cache = SemanticCache(max_size=4, threshold=0.95)
+        cache.store(("gpt-4", 3), [1.0, 0.0, 0.0], "review")
+
+        assert cache.lookup(("gpt-4", 3), [0.99, 0.05, 0.0]) == "review"
+
+    def test_lookup_misses_dissimilar_embedding_or_other_key(self):
+        """Test dissimilar embeddings and different exact keys never match"""
+        cache = SemanticCache(max_size=4, threshold=0.95)
+        cache.store(("gpt-4", 3), [1.0, 0.0, 0.0], "review")
+
+        assert cache.lookup(("gpt-4", 3), [0.0, 1.0, 0.0]) is None
+        assert cache.lookup(("claude-3-sonnet", 3), [1.0, 0.0, 0.0]) is None
+
+    def test_evicts_least_recently_used(self):
+        """Test the least recently used entry is evicted when full"""
+        cache = SemanticCache(max_size=2, threshold=0.99)
+        cache.store("k", [1.0, 0.0], "first")
+        cache.store("k", [0.0, 1.0], "second")
+        cache.lookup("k", [1.0, 0.0])  # touch "first"
+        cache.store("k", [-1.0, 0.0], "third")
+
+        assert len(cache) == 2
+        assert cache.lookup("k", [1.0, 0.0]) == "first"
+        assert cache.lookup("k", [0.0, 1.0]) is None
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        """Test entries older than the TTL are no longer returned"""
+        now = [1000.0]
+        monkeypatch.setattr(rag.semantic_cache.time, "monotonic", lambda: now[0])
+        cache = SemanticCache(max_size=4, threshold=0.95, ttl=60)
+        cache.store("k", [1.0, 0.0], "review")
+
+        now[0] += 59
+        assert cache.lookup("k", [1.0, 0.0]) == "review"
+
+        now[0] += 2
+        assert cache.lookup("k", [1.0, 0.0]) is None
+        assert len(cache) == 0
+
+    def test_concurrent_use_keeps_entries_and_rows_in_step(self):
+        """Test threads storing, looking up and evicting at once leave a consistent cache"""
+        cache = SemanticCache(max_size=8, threshold=0.99)
+        rng = np.random.default_rng(0)
+        vectors = rng.normal(size=(64, 4))
+
+        def worker(offset):
+            for i in range(500):
+                vector = vectors[(offset + i) % len(vectors)]
+                cache.store(i % 3, vector, i)
+                cache.lookup(i % 3, vector)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            list(executor.map(worker, range(4)))
+
+        assert len(cache) == 8
+        assert sum(len(bucket.entry_ids) for bucket in cache._buckets.values()) == 8
+        assert all(entry_id in cache._buckets[key].rows for entry_id, (key, _, _) in cache._entries.items())
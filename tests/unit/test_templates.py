@@ -0,0 +1,36 @@
+"""
+Unit tests for prompt templates
+"""
+
+import pytest
+
+from prompts.templates import CompiledPrompt, EnhancedPromptTemplates
+
+SAMPLE_CODE = 'def greet(name):\n    return {"message": f"Hello {name}"}\n'
+
+
+@pytest.mark.unit
+class TestCompiledPrompt:
+    """Test suite for precompiled prompt templates"""
+
+    @pytest.mark.parametrize(
+        "raw, compiled",
+        [
+            (EnhancedPromptTemplates.ZERO_SHOT_REVIEW, EnhancedPromptTemplates.ZERO_SHOT_PROMPT),
+            (EnhancedPromptTemplates.FEW_SHOT_REVIEW, EnhancedPromptTemplates.FEW_SHOT_PROMPT),
+            (EnhancedPromptTemplates.COT_REVIEW, EnhancedPromptTemplates.COT_PROMPT),
+        ],
+    )
+    def test_render_matches_str_format(self, raw, compiled):
+        """Test compiled templates render exactly like str.format"""
+        assert compiled.render(language="python", code=SAMPLE_CODE) == raw.format(language="python", code=SAMPLE_CODE)
+
+    def test_render_does_not_interpret_braces_in_values(self):
+        """Test braces inside substituted code are left untouched"""
+        prompt = CompiledPrompt("```{language}\n{code}\n```")
+        assert prompt.render(language="js", code="{a}{{b}}") == "```js\n{a}{{b}}\n```"
+
+    def test_format_spec_rejected(self):
+        """Test templates using format specs are rejected at compile time"""
+        with pytest.raises(ValueError, match="Unsupported format spec"):
+            CompiledPrompt("{code:>10}")
@@ -0,0 +1,101 @@
+"""
+Unit tests for VectorStore indexing
+"""
+
+import hashlib
+import threading
+import time
+from typing import List
+
+import pytest
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+
+from rag.vector_store import EMBED_BATCH_SIZE, EMBED_MAX_CONCURRENCY, VectorStore
+
+
+class RecordingEmbeddings(Embeddings):
+    """Deterministic embeddings that record the size of every provider request"""
+
+    def __init__(self):
+        self.batch_sizes: List[int] = []
+
+    @staticmethod
+    def _vector(text: str) -> List[float]:
+        return [byte / 255 for byte in hashlib.md5(text.encode("utf-8")).digest()]
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.batch_sizes.append(len(texts))
+        return [self._vector(text) for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._vector(text)
+
+
+class SlowEmbeddings(RecordingEmbeddings):
+    """RecordingEmbeddings that also track how many requests run at once"""
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._active = 0
+        self.peak = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        with self._lock:
+            self._active += 1
+            self.peak = max(self.peak, self._active)
+        time.sleep(0.01)
+        with self._lock:
+            self._active -= 1
+        return super().embed_documents(texts)
+
+
+def _documents(count: int, prefix: str = "guideline") -> List[Document]:
+    return [Document(page_content=f"{prefix} {i}", metadata={"category": "python"}) for i in range(count)]
+
+
+@pytest.fixture
+def vector_store(tmp_path, monkeypatch):
+    monkeypatch.setenv("RAG_USE_EMBED_CACHE", "false")
+    store = VectorStore(persist_directory=str(tmp_path / "chroma"), collection_name="unit_tests", embedding_dimensions=16)
+    store.embeddings = RecordingEmbeddings()
+    return store
+
+
+@pytest.mark.unit
+class TestVectorStoreIndexing:
+    """Test suite for batched embedding during indexing"""
+
+    @pytest.mark.asyncio
+    async def test_create_embeds_in_batches(self, vector_store):
+        """Test indexing sends one embedding request per EMBED_BATCH_SIZE chunks"""
+        count = 2 * EMBED_BATCH_SIZE + 10
+
+        assert await vector_store.create_vectorstore(_documents(count))
+
+        assert sorted(vector_store.embeddings.batch_sizes) == [10, EMBED_BATCH_SIZE, EMBED_BATCH_SIZE]
+        assert vector_store.get_collection_stats()["total_documents"] == count
+
+    @pytest.mark.asyncio
+    async def test_update_embeds_only_new_chunks(self, vector_store):
+        """Test a refresh embeds just the chunks not already indexed, in one request"""
+        await vector_store.create_vectorstore(_documents(20))
+        vector_store.embeddings.batch_sizes.clear()
+
+        assert await vector_store.update_vectorstore(_documents(20) + _documents(5, prefix="new guideline"))
+
+        assert vector_store.embeddings.batch_sizes == [5]
+        assert vector_store.get_collection_stats()["total_documents"] == 25
+
+    @pytest.mark.asyncio
+    async def test_embedding_requests_are_bounded(self, vector_store, monkeypatch):
+        """Test at most EMBED_MAX_CONCURRENCY embedding requests are in flight at once"""
+        monkeypatch.setattr("rag.vector_store.EMBED_BATCH_SIZE", 1)
+        vector_store.embeddings = SlowEmbeddings()
+        texts = [f"guideline {i}" for i in range(3 * EMBED_MAX_CONCURRENCY)]
+
+        vectors = await vector_store._embed_documents(texts)
+
+        assert vectors.shape == (len(texts), 16)
+        assert vector_store.embeddings.peak <= EMBED_MAX_CONCURRENCY